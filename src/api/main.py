@@ -2,15 +2,29 @@ from src.detection.presidio_service import PresidioService
 from src.common.models import Document, AnonymizedDocument
 
 # Aktualizace API endpointu pro anonymizaci
+import asyncio
 import logging
-from typing import Dict, Optional
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
 
-from src.common.models import Document, AnonymizedDocument
+from src.api.micro_batcher import MicroBatcher
+from src.api.serialization import get_response_mode, payload_stats, serialize_document, serialize_documents
+from src.api.worker_pool import AnonymizationPool, QueueFullError, PoolUnavailableError
+from src.batch.job_runner import JobRunner
+from src.batch.job_store import JobStore
+from src.common.memory import get_memory_usage
+from src.common.metrics import metrics
+from src.common.models import Document, AnonymizedDocument, BatchProcessingConfig
 from src.detection.presidio_service import PresidioService
+from src.detection.result_cache import ResultCache
 
 # Nastavení loggeru
 logging.basicConfig(
@@ -19,11 +33,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Konfigurace poolu pracovníků (0 pracovníků = zpracování ve vlákně hlavního procesu)
+POOL_WORKERS = int(os.environ.get("ANONYMIZER_POOL_WORKERS", "2"))
+MAX_QUEUE_DEPTH = int(os.environ.get("ANONYMIZER_MAX_QUEUE_DEPTH", "32"))
+MAX_BATCH_DOCUMENTS = int(os.environ.get("ANONYMIZER_MAX_BATCH_DOCUMENTS", "500"))
+
+# Konfigurace slučování souběžných požadavků (velikost 1 = bez slučování)
+MICROBATCH_MAX_SIZE = int(os.environ.get("ANONYMIZER_MICROBATCH_MAX_SIZE", "16"))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get("ANONYMIZER_MICROBATCH_MAX_WAIT_MS", "5"))
+
+# Konfigurace cache výsledků (0 bajtů = cache vypnuta)
+CACHE_MAX_BYTES = int(os.environ.get("ANONYMIZER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_TTL_SECONDS = float(os.environ.get("ANONYMIZER_CACHE_TTL_SECONDS", "3600"))
+
+# Konfigurace asynchronních úloh (úložiště a povolený kořen vstupních adresářů)
+JOBS_DIR = os.environ.get("ANONYMIZER_JOBS_DIR", "./data/jobs")
+JOBS_INPUT_ROOT = os.environ.get("ANONYMIZER_JOBS_INPUT_ROOT", "./data/input")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Jednorázové vytvoření a zahřátí PresidioService při startu aplikace.
+    
+    Služba je sdílená všemi požadavky procesu, takže se spaCy model,
+    registr rozpoznávačů a anonymizer načítají jen jednou. Anonymizace
+    samotná běží v poolu pracovníků, kteří službu převezmou.
+    """
+    app.state.presidio_service = None
+    app.state.presidio_error = None
+    app.state.anonymization_pool = None
+    app.state.micro_batcher = None
+    app.state.job_runner = None
+    app.state.result_cache = None
+    
+    try:
+        # Při spuštění přes src.api.server je služba načtena v hlavním procesu
+        # a pracovník ji sdílí copy-on-write
+        presidio_service = getattr(app.state, "preloaded_presidio_service", None)
+        if presidio_service is None:
+            presidio_service = PresidioService()
+        if not presidio_service.is_ready:
+            presidio_service.warm_up()
+        app.state.presidio_service = presidio_service
+        
+        if CACHE_MAX_BYTES > 0:
+            app.state.result_cache = ResultCache(
+                max_bytes=CACHE_MAX_BYTES,
+                ttl_seconds=CACHE_TTL_SECONDS,
+                engine_version=presidio_service.engine_version,
+            )
+        
+        # Pod víceprocesovým serverem (src.api.server) analyzuje každý
+        # pracovník serveru sám, vnořený pool by násobil počet enginů
+        anonymization_pool = AnonymizationPool(
+            max_workers=getattr(app.state, "pool_workers", POOL_WORKERS),
+            max_queue_depth=MAX_QUEUE_DEPTH,
+            presidio_service=presidio_service,
+        )
+        anonymization_pool.start()
+        app.state.anonymization_pool = anonymization_pool
+        
+        app.state.micro_batcher = MicroBatcher(
+            anonymization_pool,
+            max_batch_size=MICROBATCH_MAX_SIZE,
+            max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+        )
+        
+        # Úlohy na pozadí anonymizují přes stejný omezený pool jako požadavky
+        job_runner = JobRunner(
+            presidio_service,
+            JobStore(os.path.join(JOBS_DIR, "jobs.sqlite3")),
+            JOBS_DIR,
+            anonymization_pool=anonymization_pool,
+            loop=asyncio.get_running_loop(),
+        )
+        # Nedokončené úlohy obnovuje jen první pracovník serveru
+        job_runner.start(resume=os.environ.get("ANONYMIZER_SERVER_WORKER_INDEX", "0") == "0")
+        app.state.job_runner = job_runner
+        
+        # Pracovníci serveru sdílejí metriky přes společný adresář
+        metrics_dir = os.environ.get("ANONYMIZER_METRICS_DIR")
+        if metrics_dir:
+            metrics.enable_multiprocess(metrics_dir, os.environ.get("ANONYMIZER_SERVER_WORKER_INDEX", "0"))
+            metrics.start_export(refresh=lambda: _update_gauges(app))
+        
+        logger.info(f"Worker {os.getpid()} ready, memory: {get_memory_usage()}")
+    except Exception as e:
+        logger.error(f"Presidio service initialization failed: {str(e)}", exc_info=True)
+        app.state.presidio_error = str(e)
+    
+    yield
+    
+    metrics.stop_export()
+    if app.state.job_runner:
+        app.state.job_runner.stop()
+    app.state.job_runner = None
+    if app.state.micro_batcher:
+        app.state.micro_batcher.close()
+    app.state.micro_batcher = None
+    if app.state.anonymization_pool:
+        app.state.anonymization_pool.shutdown()
+    app.state.anonymization_pool = None
+    app.state.presidio_service = None
+
 # Vytvoření FastAPI aplikace
 app = FastAPI(
     title="MedDocAI Anonymizer",
     description="API pro anonymizaci zdravotnické dokumentace",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Nastavení CORS
@@ -40,47 +158,453 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     components: Dict[str, str]
+    presidio_warmup_ms: Optional[float] = None
+    queue_depth: Optional[int] = None
+    payload_stats: Optional[Dict[str, Dict[str, float]]] = None
+    cache_stats: Optional[Dict] = None
+    pid: Optional[int] = None
+    memory: Optional[Dict[str, int]] = None
 
 class AnonymizeRequest(BaseModel):
     document: Document
     configuration_id: Optional[str] = None
     options: Optional[Dict] = None
 
-# Dependency pro získání instance PresidioService
-def get_presidio_service():
-    return PresidioService()
+class BatchAnonymizeRequest(BaseModel):
+    documents: List[Document]
+    configuration_id: Optional[str] = None
+    options: Optional[Dict] = None
+
+class BatchAnonymizeResponse(BaseModel):
+    documents: List[AnonymizedDocument]
+    statistics: Dict
+
+class JobRequest(BaseModel):
+    documents: Optional[List[Document]] = None
+    input_dir: Optional[str] = None
+    batch_config: Optional[BatchProcessingConfig] = None
+    configuration_id: Optional[str] = None
+    options: Optional[Dict] = None
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    source: str
+    total: int
+    processed: int
+    failed: int
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+class JobResult(BaseModel):
+    seq: int
+    document_id: Optional[str] = None
+    success: bool
+    document: Optional[AnonymizedDocument] = None
+    error: Optional[str] = None
+
+class JobResultsResponse(BaseModel):
+    job_id: str
+    offset: int
+    limit: int
+    total: int
+    results: List[JobResult]
+
+# Dependency pro získání sdílené instance PresidioService
+def get_presidio_service(request: Request) -> PresidioService:
+    presidio_service = getattr(request.app.state, "presidio_service", None)
+    if presidio_service is None or not presidio_service.is_ready:
+        raise HTTPException(status_code=503, detail="Presidio service is not ready")
+    return presidio_service
+
+# Dependency pro získání poolu pracovníků
+def get_anonymization_pool(request: Request) -> AnonymizationPool:
+    anonymization_pool = getattr(request.app.state, "anonymization_pool", None)
+    if anonymization_pool is None or not anonymization_pool.is_ready:
+        raise HTTPException(status_code=503, detail="Anonymization pool is not ready")
+    return anonymization_pool
+
+# Dependency pro získání slučovače požadavků
+def get_micro_batcher(request: Request) -> MicroBatcher:
+    get_anonymization_pool(request)
+    return request.app.state.micro_batcher
+
+# Dependency pro získání cache výsledků (None, pokud je cache vypnuta)
+def get_result_cache(request: Request) -> Optional[ResultCache]:
+    return getattr(request.app.state, "result_cache", None)
+
+# Dependency pro získání runneru asynchronních úloh
+def get_job_runner(request: Request) -> JobRunner:
+    job_runner = getattr(request.app.state, "job_runner", None)
+    if job_runner is None:
+        raise HTTPException(status_code=503, detail="Job runner is not ready")
+    return job_runner
+
+def _get_deadline(options: Optional[Dict], start_time: float) -> Optional[float]:
+    """
+    Převede options.deadline_ms na termín (time.monotonic) měřený od přijetí požadavku.
+    """
+    deadline_ms = (options or {}).get("deadline_ms")
+    if deadline_ms is None:
+        return None
+    if isinstance(deadline_ms, bool) or not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0:
+        raise HTTPException(status_code=400, detail="deadline_ms must be a positive number")
+    return start_time + deadline_ms / 1000
+
+def _get_entities(options: Optional[Dict], presidio_service: PresidioService) -> Optional[List[str]]:
+    """
+    Ověří options.entities - seznam požadovaných typů entit.
+    """
+    entities = (options or {}).get("entities")
+    return _validate_entities(entities, presidio_service)
+
+def _validate_entities(entities, presidio_service: PresidioService) -> Optional[List[str]]:
+    """
+    Ověří seznam typů entit proti entitám podporovaným službou (400 při chybě).
+    """
+    if entities is None:
+        return None
+    if not isinstance(entities, list) or not entities or not all(isinstance(entity, str) for entity in entities):
+        raise HTTPException(status_code=400, detail="entities must be a non-empty list of entity types")
+    
+    unknown = sorted(set(entities) - set(presidio_service.get_supported_entities()))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported entity types: {', '.join(unknown)}")
+    return entities
+
+def _get_nlp_profile(options: Optional[Dict], presidio_service: PresidioService) -> Optional[str]:
+    """
+    Ověří options.nlp_profile - profil spaCy pipeline požadavku (400 při chybě).
+    """
+    nlp_profile = (options or {}).get("nlp_profile")
+    if nlp_profile is None:
+        return None
+    if not isinstance(nlp_profile, str):
+        raise HTTPException(status_code=400, detail="nlp_profile must be a string")
+    try:
+        return presidio_service.nlp_profiles.resolve(nlp_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _job_response(job: Dict) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        source=job["source"],
+        total=job["total"],
+        processed=job["processed"],
+        failed=job["failed"],
+        error=job["error"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+    )
 
 # Endpointy
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(request: Request):
     """
     Kontrola zdraví API a jeho komponent.
+    
+    Vrací 503, dokud není PresidioService vytvořena a zahřátá.
     """
     logger.info("Health check requested")
-    return HealthResponse(
-        status="ok",
+    presidio_service = getattr(request.app.state, "presidio_service", None)
+    presidio_error = getattr(request.app.state, "presidio_error", None)
+    anonymization_pool = getattr(request.app.state, "anonymization_pool", None)
+    result_cache = getattr(request.app.state, "result_cache", None)
+    
+    if presidio_service is not None and presidio_service.is_ready:
+        presidio_status = "ok"
+    elif presidio_error:
+        presidio_status = "error"
+    else:
+        presidio_status = "starting"
+    
+    pool_status = "ok" if anonymization_pool is not None and anonymization_pool.is_ready else "unavailable"
+    is_ready = presidio_status == "ok" and pool_status == "ok"
+    
+    health = HealthResponse(
+        status="ok" if is_ready else "unavailable",
         version="0.1.0",
         components={
             "api": "ok",
-            "presidio": "ok",  # Toto by mělo být dynamicky ověřeno
-        }
+            "presidio": presidio_status,
+            "worker_pool": pool_status,
+        },
+        presidio_warmup_ms=presidio_service.warmup_ms if presidio_service else None,
+        queue_depth=anonymization_pool.queue_depth if anonymization_pool else None,
+        payload_stats=payload_stats.get_stats(),
+        cache_stats=result_cache.get_stats() if result_cache else None,
+        pid=os.getpid(),
+        memory=get_memory_usage(),
     )
+    
+    if not is_ready:
+        return JSONResponse(status_code=503, content=jsonable_encoder(health))
+    return health
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(request: Request):
+    """
+    Metriky zpracování ve formátu Prometheus.
+    
+    Obsahuje histogramy doby jednotlivých fází (spaCy NLP, české
+    rozpoznávače, analýza, anonymizace, serializace), počty zpracovaných
+    dokumentů a bajtů, entity podle typu a hloubku fronty.
+    """
+    _update_gauges(request.app)
+    
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def _update_gauges(app: FastAPI) -> None:
+    """
+    Aktualizuje okamžité hodnoty metrik (fronta, cache, paměť procesu).
+    
+    Args:
+        app: Aplikace se stavem poolu a cache
+    """
+    anonymization_pool = getattr(app.state, "anonymization_pool", None)
+    result_cache = getattr(app.state, "result_cache", None)
+    
+    metrics.set_gauge(
+        "anonymizer_queue_depth",
+        anonymization_pool.queue_depth if anonymization_pool else 0,
+        "Requests currently queued or running in the worker pool",
+    )
+    if result_cache:
+        cache_stats = result_cache.get_stats()
+        metrics.set_total("anonymizer_cache_hits_total", cache_stats["hits"], "Result cache hits")
+        metrics.set_total("anonymizer_cache_misses_total", cache_stats["misses"], "Result cache misses")
+        metrics.set_gauge("anonymizer_cache_bytes", cache_stats["bytes"], "Estimated size of cached results")
+    
+    for name, value in get_memory_usage().items():
+        metrics.set_gauge(f"anonymizer_process_{name}", value, f"Worker process memory ({name})")
 
 @app.post("/api/v1/anonymize", response_model=AnonymizedDocument)
-async def anonymize(request: AnonymizeRequest, presidio_service: PresidioService = Depends(get_presidio_service)):
+async def anonymize(
+    request: AnonymizeRequest,
+    micro_batcher: MicroBatcher = Depends(get_micro_batcher),
+    result_cache: Optional[ResultCache] = Depends(get_result_cache),
+    presidio_service: PresidioService = Depends(get_presidio_service),
+):
     """
     Anonymizuje dokument podle zadané konfigurace.
+    
+    Souběžné požadavky se slučují do malých dávek, které běží v poolu
+    pracovníků mimo event loop. Při plné frontě vrací 429, při nedostupném
+    poolu 503.
+    
+    Volba options.response_mode určuje rozsah odpovědi: "text" (pouze
+    anonymizovaný text), "spans" (rozsahy entit bez kontextu) nebo "full"
+    (výchozí, plný detail). Velikost odpovědi je v hlavičce X-Payload-Bytes.
+    
+    Opakovaně zaslaný stejný obsah se stejnou konfigurací se vrací z cache.
+    
+    Volba options.deadline_ms nastavuje časový rozpočet požadavku. Drahé
+    fáze (spaCy NER, hledání zdravotnických zařízení a adres podle tokenů),
+    které by se do rozpočtu nevešly, se vynechají; jejich seznam je
+    v statistics.degraded_stages a v hlavičce X-Degraded-Stages.
+    
+    Volba options.entities omezuje detekci na vybrané typy entit. Pokud
+    je žádný z nich nepotřebuje (např. rodná čísla, čísla pojištěnců,
+    kódy diagnóz), spaCy se vůbec nespouští.
+    
+    Volba options.nlp_profile vybírá profil spaCy pipeline ("full", "ner",
+    "tokens", "blank") místo výchozího profilu nasazení.
     """
     logger.info(f"Anonymization requested for document type: {request.document.document_type}")
     
+    deadline = _get_deadline(request.options, time.monotonic())
+    entities = _get_entities(request.options, presidio_service)
+    nlp_profile = _get_nlp_profile(request.options, presidio_service)
+    try:
+        response_mode = get_response_mode(request.options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        # Použití Presidio service pro anonymizaci dokumentu
-        anonymized_document = presidio_service.process_document(request.document)
-        return anonymized_document
+        cache_key = None
+        anonymized_document = None
+        if result_cache:
+            cache_key = result_cache.make_key(request.document, request.configuration_id, request.options)
+            anonymized_document = result_cache.get(cache_key, request.document)
+        
+        if anonymized_document is None:
+            # Anonymizace dokumentu v dávce s ostatními souběžnými požadavky
+            anonymized_document = await micro_batcher.submit(request.document, deadline, entities, nlp_profile)
+            metrics.observe_document(request.document.content, anonymized_document.statistics)
+            if result_cache and not anonymized_document.statistics.get("degraded_stages"):
+                result_cache.put(cache_key, anonymized_document)
+        
+        payload = serialize_document(anonymized_document, response_mode)
+        headers = {"X-Response-Mode": response_mode, "X-Payload-Bytes": str(len(payload))}
+        degraded_stages = anonymized_document.statistics.get("degraded_stages")
+        if degraded_stages:
+            headers["X-Degraded-Stages"] = ",".join(degraded_stages)
+        return Response(content=payload, media_type="application/json", headers=headers)
+    except QueueFullError as e:
+        logger.warning(f"Anonymization rejected: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except PoolUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error during anonymization: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Anonymization failed: {str(e)}")
 
+@app.post("/api/v1/anonymize/batch", response_model=BatchAnonymizeResponse)
+async def anonymize_batch(
+    request: BatchAnonymizeRequest,
+    anonymization_pool: AnonymizationPool = Depends(get_anonymization_pool),
+    result_cache: Optional[ResultCache] = Depends(get_result_cache),
+    presidio_service: PresidioService = Depends(get_presidio_service),
+):
+    """
+    Anonymizuje dávku dokumentů v jednom průchodu spaCy (nlp.pipe).
+    
+    Časový rozpočet options.deadline_ms, výběr entit options.entities
+    i profil spaCy pipeline options.nlp_profile platí pro celou dávku.
+    """
+    logger.info(f"Batch anonymization requested for {len(request.documents)} documents")
+    
+    if len(request.documents) > MAX_BATCH_DOCUMENTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.documents)} documents (max {MAX_BATCH_DOCUMENTS})"
+        )
+    
+    deadline = _get_deadline(request.options, time.monotonic())
+    entities = _get_entities(request.options, presidio_service)
+    nlp_profile = _get_nlp_profile(request.options, presidio_service)
+    try:
+        response_mode = get_response_mode(request.options)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    start_time = time.time()
+    try:
+        anonymized_documents = [None] * len(request.documents)
+        cache_keys = [None] * len(request.documents)
+        if result_cache:
+            for i, document in enumerate(request.documents):
+                cache_keys[i] = result_cache.make_key(document, request.configuration_id, request.options)
+                anonymized_documents[i] = result_cache.get(cache_keys[i], document)
+        
+        # Anonymizace dokumentů, které nejsou v cache, v jednom pracovním procesu
+        missing = [i for i, document in enumerate(anonymized_documents) if document is None]
+        if missing:
+            results = await anonymization_pool.process_documents(
+                [request.documents[i] for i in missing],
+                [deadline] * len(missing),
+                [entities] * len(missing),
+                [nlp_profile] * len(missing),
+            )
+            for i, result in zip(missing, results):
+                anonymized_documents[i] = result
+                metrics.observe_document(request.documents[i].content, result.statistics)
+                if result_cache and not result.statistics.get("degraded_stages"):
+                    result_cache.put(cache_keys[i], result)
+    except QueueFullError as e:
+        logger.warning(f"Batch anonymization rejected: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except PoolUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error during batch anonymization: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch anonymization failed: {str(e)}")
+    
+    statistics = {
+        "total_documents": len(anonymized_documents),
+        "total_entities_detected": sum(len(document.entities) for document in anonymized_documents),
+        "processing_time_ms": int((time.time() - start_time) * 1000),
+        "degraded_documents": sum(
+            1 for document in anonymized_documents if document.statistics.get("degraded_stages")
+        ),
+    }
+    payload = serialize_documents(anonymized_documents, response_mode, statistics)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"X-Response-Mode": response_mode, "X-Payload-Bytes": str(len(payload))},
+    )
+
+@app.post("/api/v1/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(
+    request: JobRequest,
+    job_runner: JobRunner = Depends(get_job_runner),
+    presidio_service: PresidioService = Depends(get_presidio_service),
+):
+    """
+    Založí asynchronní úlohu nad dokumenty z požadavku nebo nad adresářem na serveru.
+    
+    Úloha se zpracuje na pozadí, průběh a výsledky jsou dostupné přes
+    /api/v1/jobs/{job_id} a /api/v1/jobs/{job_id}/results. Typy entit lze
+    omezit přes options.entities nebo batch_config.entities, profil spaCy
+    pipeline přes options.nlp_profile (jen pro dokumenty z požadavku,
+    adresářové úlohy používají výchozí profil nasazení).
+    """
+    if bool(request.documents) == bool(request.input_dir):
+        raise HTTPException(status_code=400, detail="Exactly one of 'documents' or 'input_dir' must be provided")
+    
+    _get_entities(request.options, presidio_service)
+    _get_nlp_profile(request.options, presidio_service)
+    if request.batch_config:
+        _validate_entities(request.batch_config.entities, presidio_service)
+    
+    input_dir = None
+    if request.input_dir:
+        # Povoleny jsou pouze adresáře pod nakonfigurovaným kořenem
+        input_root = os.path.realpath(JOBS_INPUT_ROOT)
+        input_dir = os.path.realpath(os.path.join(input_root, request.input_dir))
+        if os.path.commonpath([input_root, input_dir]) != input_root or not os.path.isdir(input_dir):
+            raise HTTPException(status_code=400, detail=f"Invalid input directory: {request.input_dir}")
+    
+    config = {
+        "configuration_id": request.configuration_id,
+        "options": request.options,
+        "batch": request.batch_config.dict() if request.batch_config else {},
+    }
+    
+    job_store = job_runner.job_store
+    job_id = job_store.create_job(documents=request.documents, input_dir=input_dir, config=config)
+    job_runner.submit(job_id)
+    
+    logger.info(f"Job {job_id} submitted")
+    return _job_response(job_store.get_job(job_id))
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, job_runner: JobRunner = Depends(get_job_runner)):
+    """
+    Vrátí stav a průběh asynchronní úlohy.
+    """
+    job = job_runner.job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_response(job)
+
+@app.get("/api/v1/jobs/{job_id}/results", response_model=JobResultsResponse)
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    job_runner: JobRunner = Depends(get_job_runner),
+):
+    """
+    Vrátí stránku výsledků asynchronní úlohy.
+    """
+    job = job_runner.job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    results = job_runner.job_store.get_results(job_id, offset=offset, limit=limit)
+    return JobResultsResponse(
+        job_id=job_id,
+        offset=offset,
+        limit=limit,
+        total=job["processed"],
+        results=[JobResult(**result) for result in results],
+    )
+
 # Pokud je tento soubor spuštěn přímo
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from typing import List, NamedTuple, Optional
+
+from src.api.worker_pool import PoolUnavailableError
+from src.common.models import Document, AnonymizedDocument
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class PendingDocument(NamedTuple):
+    """Dokument čekající na zařazení do dávky."""
+    document: Document
+    deadline: Optional[float]
+    entities: Optional[List[str]]
+    nlp_profile: Optional[str]
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """
+    Slučování souběžných požadavků na jeden dokument do dávek.
+
+    Požadavky, které dorazí během krátkého časového okna, se zpracují
+    společně dávkovou cestou PresidioService (nlp.pipe) a výsledky se
+    vrátí jednotlivým čekajícím požadavkům. Klienti se nemusí měnit.
+
+    Každý požadavek si při zařazení zarezervuje místo ve frontě poolu,
+    takže maximální hloubka fronty dál omezuje počet rozpracovaných
+    požadavků. Selže-li dávka, dokumenty se zpracují znovu jednotlivě,
+    aby chyba jednoho dokumentu nepostihla ostatní požadavky.
+    """
+
+    def __init__(self, anonymization_pool, max_batch_size: int = 16, max_wait_ms: float = 5.0):
+        """
+        Inicializace slučovače.
+
+        Args:
+            anonymization_pool: Pool pracovníků s metodou process_documents
+            max_batch_size: Maximální počet dokumentů v jedné dávce
+            max_wait_ms: Maximální doba čekání na další požadavky (latenční rozpočet)
+        """
+        self.anonymization_pool = anonymization_pool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[PendingDocument] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+
+    async def submit(
+        self,
+        document: Document,
+        deadline: Optional[float] = None,
+        entities: Optional[List[str]] = None,
+        nlp_profile: Optional[str] = None,
+    ) -> AnonymizedDocument:
+        """
+        Zařadí dokument do příští dávky a počká na jeho výsledek.
+
+        Args:
+            document: Dokument ke zpracování
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+
+        Returns:
+            Anonymizovaný dokument
+
+        Raises:
+            QueueFullError: Pokud je fronta poolu plná
+        """
+        self.anonymization_pool.reserve()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(PendingDocument(document, deadline, entities, nlp_profile, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await future
+
+    def close(self) -> None:
+        """Zruší čekající požadavky (při ukončení aplikace)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        for pending in self._pending:
+            if not pending.future.done():
+                pending.future.cancel()
+        self.anonymization_pool.release(len(self._pending))
+        self._pending = []
+
+    def _flush(self) -> None:
+        """Odešle nashromážděné požadavky jako jednu dávku."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+
+        # Zbytek (při náporu požadavků) čeká na další okno
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[PendingDocument]) -> None:
+        """
+        Zpracuje dávku a rozdělí výsledky čekajícím požadavkům.
+
+        Args:
+            batch: Čekající dokumenty
+        """
+        try:
+            results = await self._process(batch)
+        except PoolUnavailableError as e:
+            # Chyba poolu se týká všech požadavků
+            self._set_exception(batch, e)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                self._set_exception(batch, e)
+                return
+            logger.warning(f"Micro-batch of {len(batch)} documents failed, retrying documents one by one: {str(e)}")
+            await asyncio.gather(*(self._run_single(pending) for pending in batch))
+            return
+        finally:
+            self.anonymization_pool.release(len(batch))
+
+        logger.debug(f"Micro-batch of {len(batch)} documents processed")
+        for pending, result in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    async def _run_single(self, pending: PendingDocument) -> None:
+        """
+        Zpracuje samostatně dokument ze selhané dávky.
+
+        Args:
+            pending: Čekající dokument
+        """
+        try:
+            result = (await self._process([pending]))[0]
+        except Exception as e:
+            self._set_exception([pending], e)
+            return
+        if not pending.future.done():
+            pending.future.set_result(result)
+
+    async def _process(self, batch: List[PendingDocument]) -> List[AnonymizedDocument]:
+        """
+        Odešle dokumenty do poolu na místa zarezervovaná v submit.
+
+        Args:
+            batch: Čekající dokumenty
+
+        Returns:
+            Anonymizované dokumenty v pořadí vstupu
+        """
+        return await self.anonymization_pool.process_documents(
+            [pending.document for pending in batch],
+            [pending.deadline for pending in batch],
+            [pending.entities for pending in batch],
+            [pending.nlp_profile for pending in batch],
+            reserved=True,
+        )
+
+    @staticmethod
+    def _set_exception(batch: List[PendingDocument], error: Exception) -> None:
+        """Předá chybu čekajícím požadavkům."""
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(error)
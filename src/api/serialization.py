@@ -0,0 +1,184 @@
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.common.metrics import metrics
+from src.common.models import AnonymizedDocument
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson je volitelná závislost
+    orjson = None
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Režimy odpovědi: pouze text, rozsahy entit bez kontextu, nebo plný detail
+RESPONSE_MODES = ("text", "spans", "full")
+DEFAULT_RESPONSE_MODE = "full"
+
+# Pole dokumentu společná všem režimům
+_DOCUMENT_FIELDS = ("id", "original_document_id", "content", "content_type", "metadata", "statistics")
+
+
+class PayloadStats:
+    """
+    Souhrnné velikosti odpovědí podle režimu.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.responses: Dict[str, int] = {mode: 0 for mode in RESPONSE_MODES}
+        self.bytes: Dict[str, int] = {mode: 0 for mode in RESPONSE_MODES}
+
+    def record(self, mode: str, size: int) -> None:
+        """
+        Zaznamená velikost odeslané odpovědi.
+
+        Args:
+            mode: Režim odpovědi
+            size: Velikost odpovědi v bajtech
+        """
+        with self.lock:
+            self.responses[mode] += 1
+            self.bytes[mode] += size
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Vrátí počet odpovědí, celkovou a průměrnou velikost pro každý režim.
+
+        Returns:
+            Slovník statistik podle režimu
+        """
+        with self.lock:
+            return {
+                mode: {
+                    "responses": self.responses[mode],
+                    "bytes": self.bytes[mode],
+                    "avg_bytes": self.bytes[mode] / self.responses[mode] if self.responses[mode] else 0,
+                }
+                for mode in RESPONSE_MODES
+            }
+
+
+payload_stats = PayloadStats()
+
+
+def get_response_mode(options: Optional[Dict] = None) -> str:
+    """
+    Zjistí režim odpovědi z options požadavku.
+
+    Args:
+        options: Options požadavku
+
+    Returns:
+        Režim odpovědi
+
+    Raises:
+        ValueError: Pokud režim není podporován
+    """
+    mode = (options or {}).get("response_mode", DEFAULT_RESPONSE_MODE)
+    if mode not in RESPONSE_MODES:
+        raise ValueError(f"Unsupported response_mode '{mode}', expected one of {', '.join(RESPONSE_MODES)}")
+    return mode
+
+
+def shape_document(document: AnonymizedDocument, mode: str) -> Dict:
+    """
+    Převede anonymizovaný dokument na slovník odpovídající režimu.
+
+    Args:
+        document: Anonymizovaný dokument
+        mode: Režim odpovědi (text, spans, full)
+
+    Returns:
+        Slovník pro serializaci
+    """
+    if mode == "full":
+        return document.dict()
+
+    shaped = {field: getattr(document, field) for field in _DOCUMENT_FIELDS}
+
+    if mode == "spans":
+        shaped["entities"] = [
+            {
+                "entity_type": entity.original_entity.entity_type,
+                "start": entity.original_entity.start,
+                "end": entity.original_entity.end,
+                "score": entity.original_entity.score,
+                "anonymized_text": entity.anonymized_text,
+                "operator_name": entity.operator_name,
+            }
+            for entity in document.entities
+        ]
+
+    return shaped
+
+
+def dumps(data) -> bytes:
+    """
+    Serializuje data do JSON - přes orjson, pokud je k dispozici.
+
+    Args:
+        data: Data k serializaci
+
+    Returns:
+        JSON v UTF-8
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def serialize_document(document: AnonymizedDocument, mode: str) -> bytes:
+    """
+    Serializuje anonymizovaný dokument v daném režimu.
+
+    Plný režim používá model_dump_json z pydantic-core, pokud je k dispozici,
+    a vyhne se tak mezikroku přes Python slovník.
+
+    Args:
+        document: Anonymizovaný dokument
+        mode: Režim odpovědi
+
+    Returns:
+        JSON v UTF-8
+    """
+    start_time = time.perf_counter()
+    if mode == "full" and hasattr(document, "model_dump_json"):
+        payload = document.model_dump_json().encode("utf-8")
+    else:
+        payload = dumps(shape_document(document, mode))
+
+    metrics.observe_stage("serialization", (time.perf_counter() - start_time) * 1000)
+    payload_stats.record(mode, len(payload))
+    return payload
+
+
+def serialize_documents(documents: List[AnonymizedDocument], mode: str, statistics: Dict) -> bytes:
+    """
+    Serializuje odpověď dávkového endpointu v daném režimu.
+
+    Args:
+        documents: Anonymizované dokumenty
+        mode: Režim odpovědi
+        statistics: Souhrnné statistiky dávky
+
+    Returns:
+        JSON v UTF-8
+    """
+    start_time = time.perf_counter()
+    payload = dumps({
+        "documents": [shape_document(document, mode) for document in documents],
+        "statistics": statistics,
+    })
+
+    metrics.observe_stage("serialization", (time.perf_counter() - start_time) * 1000)
+    payload_stats.record(mode, len(payload))
+    return payload
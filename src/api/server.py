@@ -0,0 +1,172 @@
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from src.api.main import app
+from src.common.memory import get_memory_usage
+from src.detection.presidio_service import PresidioService
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Konfigurace serveru
+SERVER_HOST = os.environ.get("ANONYMIZER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.environ.get("ANONYMIZER_PORT", "8000"))
+SERVER_WORKERS = int(os.environ.get("ANONYMIZER_SERVER_WORKERS", "2"))
+SERVER_BACKLOG = int(os.environ.get("ANONYMIZER_SERVER_BACKLOG", "2048"))
+
+
+def _run_worker(sock: socket.socket, worker_index: int) -> None:
+    """
+    Spustí uvicorn nad sdíleným socketem v pracovním procesu.
+
+    Args:
+        sock: Naslouchající socket vytvořený hlavním procesem
+        worker_index: Pořadí pracovníka (pro logování)
+    """
+    import uvicorn
+
+    # Obsluhu signálů nastaví uvicorn, zděděná obsluha hlavního procesu se ruší
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    logger.info(f"Server worker {worker_index} started (pid {os.getpid()})")
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[sock])
+
+
+def _fork_worker(sock: socket.socket, worker_index: int) -> int:
+    """
+    Vytvoří pracovní proces.
+
+    Args:
+        sock: Naslouchající socket
+        worker_index: Pořadí pracovníka
+
+    Returns:
+        PID pracovního procesu
+    """
+    pid = os.fork()
+    if pid == 0:
+        os.environ["ANONYMIZER_SERVER_WORKER_INDEX"] = str(worker_index)
+        exit_code = 0
+        try:
+            _run_worker(sock, worker_index)
+        except Exception as e:
+            logger.error(f"Server worker {worker_index} failed: {str(e)}", exc_info=True)
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    return pid
+
+
+def serve(host: str = SERVER_HOST, port: int = SERVER_PORT, workers: int = SERVER_WORKERS) -> None:
+    """
+    Spustí server s více pracovními procesy, které sdílejí jeden načtený engine.
+
+    Hlavní proces vytvoří a zahřeje PresidioService (spaCy model, registr
+    rozpoznávačů, anonymizer), zmrazí garbage collector a teprve poté
+    vytvoří pracovníky forkem. Stránky s modelem tak zůstávají sdílené
+    (copy-on-write) a paměť neroste s každým dalším pracovníkem.
+
+    Pracovníci analyzují ve vlastním procesu (bez vnořeného poolu), takže
+    enginů běží právě tolik, kolik je pracovníků. Metriky pracovníků se
+    sdílejí přes adresář ANONYMIZER_METRICS_DIR (výchozí: dočasný adresář).
+
+    Args:
+        host: Adresa pro naslouchání
+        port: Port pro naslouchání
+        workers: Počet pracovních procesů
+    """
+    start_time = time.time()
+    presidio_service = PresidioService()
+    presidio_service.warm_up()
+    app.state.preloaded_presidio_service = presidio_service
+    app.state.pool_workers = 0
+
+    # Adresář pro metriky pracovníků (zápisy z předchozího běhu se zahodí)
+    metrics_dir = os.environ.get("ANONYMIZER_METRICS_DIR")
+    owns_metrics_dir = not metrics_dir
+    if owns_metrics_dir:
+        metrics_dir = tempfile.mkdtemp(prefix="anonymizer-metrics-")
+        os.environ["ANONYMIZER_METRICS_DIR"] = metrics_dir
+    else:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            if name.startswith("worker-"):
+                os.remove(os.path.join(metrics_dir, name))
+
+    # Objekty vytvořené při načtení se přesunou do permanentní generace,
+    # aby je garbage collector v pracovnících neprocházel a nezapisoval
+    # do jejich hlaviček (což by stránky zkopírovalo)
+    gc.collect()
+    gc.freeze()
+
+    logger.info(
+        f"Engine loaded in master (pid {os.getpid()}) in {(time.time() - start_time) * 1000:.1f} ms, "
+        f"memory: {get_memory_usage()}"
+    )
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(SERVER_BACKLOG)
+    sock.set_inheritable(True)
+
+    children: Dict[int, int] = {}
+    for worker_index in range(workers):
+        children[_fork_worker(sock, worker_index)] = worker_index
+
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    logger.info(f"Listening on {host}:{port} with {workers} workers")
+
+    # Dohled nad pracovníky - ukončený pracovník se nahradí novým
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        worker_index = children.pop(pid, None)
+        if worker_index is None:
+            continue
+
+        if not stopping:
+            logger.warning(f"Server worker {worker_index} (pid {pid}) exited with status {status}, restarting")
+            children[_fork_worker(sock, worker_index)] = worker_index
+
+    sock.close()
+    if owns_metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    logger.info("Server stopped")
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else SERVER_WORKERS
+    serve(workers=workers)
@@ -0,0 +1,252 @@
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+from src.common.models import Document, AnonymizedDocument
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Instance PresidioService v pracovním procesu
+# (při startu metodou fork ji pracovník zdědí od hlavního procesu)
+_worker_service = None
+
+
+def _init_worker() -> None:
+    """
+    Inicializace pracovního procesu - načtení a zahřátí vlastního enginu.
+    """
+    global _worker_service
+
+    if _worker_service is None:
+        from src.detection.presidio_service import PresidioService
+        _worker_service = PresidioService()
+
+    if not _worker_service.is_ready:
+        _worker_service.warm_up()
+
+    logger.info(f"Anonymization worker {os.getpid()} ready")
+
+
+def _ping() -> int:
+    """Prázdná úloha pro ověření, že pracovník běží."""
+    return os.getpid()
+
+
+def _process_document(
+    document: Document,
+    deadline: Optional[float] = None,
+    entities: Optional[List[str]] = None,
+    nlp_profile: Optional[str] = None,
+) -> AnonymizedDocument:
+    """Zpracuje dokument v pracovním procesu."""
+    return _worker_service.process_document(document, deadline=deadline, entities=entities, nlp_profile=nlp_profile)
+
+
+def _process_documents(
+    documents: List[Document],
+    deadlines: Optional[List[Optional[float]]] = None,
+    requested_entities: Optional[List[Optional[List[str]]]] = None,
+    requested_nlp_profiles: Optional[List[Optional[str]]] = None,
+) -> List[AnonymizedDocument]:
+    """Zpracuje dávku dokumentů v pracovním procesu."""
+    return _worker_service.process_documents(
+        documents,
+        deadlines=deadlines,
+        requested_entities=requested_entities,
+        requested_nlp_profiles=requested_nlp_profiles,
+    )
+
+
+class QueueFullError(Exception):
+    """Fronta požadavků dosáhla maximální hloubky."""
+
+
+class PoolUnavailableError(Exception):
+    """Pool pracovníků není spuštěn nebo je nefunkční."""
+
+
+class AnonymizationPool:
+    """
+    Omezený pool procesů pro CPU náročnou anonymizaci mimo event loop.
+
+    Každý pracovník má vlastní předem načtený PresidioService. Počet
+    rozpracovaných požadavků je omezen, aby latence zůstala předvídatelná
+    i při souběžné zátěži.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue_depth: int = 32,
+        presidio_service=None,
+    ):
+        """
+        Inicializace poolu.
+
+        Args:
+            max_workers: Počet pracovních procesů (0 = zpracování ve vlákně
+                hlavního procesu se sdílenou instancí služby)
+            max_queue_depth: Maximální počet rozpracovaných požadavků
+            presidio_service: Již načtená služba, kterou pracovníci převezmou
+                (při startu metodou fork bez nového načítání modelu)
+        """
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.presidio_service = presidio_service
+        self.executor: Optional[concurrent.futures.Executor] = None
+        self.is_ready = False
+        self.queue_depth = 0
+
+    def start(self) -> None:
+        """
+        Spustí pracovníky a počká, až každý načte svůj engine.
+        """
+        global _worker_service
+        _worker_service = self.presidio_service
+
+        if self.max_workers == 0:
+            if _worker_service is None:
+                _init_worker()
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            logger.info("Anonymization pool running in-process")
+        else:
+            # Fork umožňuje sdílet již načtený model s pracovníky
+            mp_context = None
+            if "fork" in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context("fork")
+
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+            )
+
+            # Předběžné spuštění všech pracovníků
+            pings = [self.executor.submit(_ping) for _ in range(self.max_workers)]
+            worker_pids = {ping.result() for ping in pings}
+            logger.info(f"Anonymization pool started with {len(worker_pids)} workers")
+
+        self.is_ready = True
+
+    def shutdown(self) -> None:
+        """Zruší čekající úlohy a počká na ukončení pracovníků (dokončí rozpracované)."""
+        self.is_ready = False
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def reserve(self, count: int = 1) -> None:
+        """
+        Zarezervuje místa ve frontě pro požadavky, které se zpracují později.
+
+        Args:
+            count: Počet požadavků
+
+        Raises:
+            QueueFullError: Pokud by fronta překročila maximální hloubku
+        """
+        if self.queue_depth + count > self.max_queue_depth:
+            raise QueueFullError(f"Queue depth limit reached ({self.max_queue_depth})")
+        self.queue_depth += count
+
+    def release(self, count: int = 1) -> None:
+        """
+        Uvolní místa ve frontě zarezervovaná metodou reserve.
+
+        Args:
+            count: Počet požadavků
+        """
+        self.queue_depth -= count
+
+    async def run(self, fn: Callable, *args, reserved: bool = False):
+        """
+        Spustí funkci v poolu s ohledem na maximální hloubku fronty.
+
+        Args:
+            fn: Funkce na úrovni modulu (musí být serializovatelná)
+            *args: Argumenty funkce
+            reserved: Volající už drží místo ve frontě (reserve), úloha další nezabírá
+
+        Returns:
+            Výsledek funkce
+
+        Raises:
+            QueueFullError: Pokud je fronta plná
+            PoolUnavailableError: Pokud pool neběží nebo selhal pracovník
+        """
+        if not self.is_ready or self.executor is None:
+            raise PoolUnavailableError("Anonymization pool is not running")
+
+        if not reserved:
+            self.reserve()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        except BrokenProcessPool as e:
+            self.is_ready = False
+            logger.error(f"Anonymization pool is broken: {str(e)}")
+            raise PoolUnavailableError("Anonymization pool is broken") from e
+        finally:
+            if not reserved:
+                self.release()
+
+    async def process_document(
+        self,
+        document: Document,
+        deadline: Optional[float] = None,
+        entities: Optional[List[str]] = None,
+        nlp_profile: Optional[str] = None,
+    ) -> AnonymizedDocument:
+        """
+        Anonymizuje dokument v pracovním procesu.
+
+        Args:
+            document: Dokument ke zpracování
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+
+        Returns:
+            Anonymizovaný dokument
+        """
+        return await self.run(_process_document, document, deadline, entities, nlp_profile)
+
+    async def process_documents(
+        self,
+        documents: List[Document],
+        deadlines: Optional[List[Optional[float]]] = None,
+        requested_entities: Optional[List[Optional[List[str]]]] = None,
+        requested_nlp_profiles: Optional[List[Optional[str]]] = None,
+        reserved: bool = False,
+    ) -> List[AnonymizedDocument]:
+        """
+        Anonymizuje dávku dokumentů v jednom pracovním procesu.
+
+        Dávka jednoho požadavku zabírá ve frontě jedno místo, dávka sloučená
+        z více požadavků (MicroBatcher) má místa zarezervovaná předem.
+        spaCy ji zpracuje přes nlp.pipe.
+        Termíny se předávají jako time.monotonic, které je na Linuxu
+        společné všem procesům stroje.
+
+        Args:
+            documents: Dokumenty ke zpracování
+            deadlines: Termíny jednotlivých dokumentů, None = bez omezení
+            requested_entities: Požadované typy entit jednotlivých dokumentů, None = všechny
+            requested_nlp_profiles: Profily spaCy pipeline jednotlivých dokumentů, None = výchozí
+            reserved: Místa ve frontě už zarezervoval volající (reserve)
+
+        Returns:
+            Anonymizované dokumenty
+        """
+        return await self.run(
+            _process_documents, documents, deadlines, requested_entities, requested_nlp_profiles, reserved=reserved
+        )
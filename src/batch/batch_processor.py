@@ -107,7 +107,7 @@ class BatchProcessor:
                 document = self._load_document(file_path)
                 
                 # Anonymizace dokumentu
-                anonymized_document = self._process_document_with_retry(document)
+                anonymized_document = self._process_document_with_retry(document, config.entities)
                 
                 # Uložení anonymizovaného dokumentu
                 output_path = self._save_anonymized_document(anonymized_document)
@@ -204,12 +204,17 @@ class BatchProcessor:
         
         return document
     
-    def _process_document_with_retry(self, document: Document) -> AnonymizedDocument:
+    def _process_document_with_retry(
+        self,
+        document: Document,
+        entities: Optional[List[str]] = None
+    ) -> AnonymizedDocument:
         """
         Zpracuje dokument s možností opakování při chybě.
         
         Args:
             document: Dokument ke zpracování
+            entities: Požadované typy entit, None = všechny podporované
             
         Returns:
             Anonymizovaný dokument
@@ -221,7 +226,7 @@ class BatchProcessor:
         
         for attempt in range(self.max_retries):
             try:
-                return self.presidio_service.process_document(document)
+                return self.presidio_service.process_document(document, entities=entities)
             except Exception as e:
                 last_exception = e
                 logger.warning(f"Attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
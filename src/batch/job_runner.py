@@ -0,0 +1,318 @@
+import asyncio
+import itertools
+import logging
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from src.batch.job_store import JobStore
+from src.batch.parallel_batch_processor import ParallelBatchProcessor
+from src.common.metrics import metrics
+from src.common.models import AnonymizedDocument, BatchProcessingConfig, Document, ProcessingStatus
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class PooledAnonymizationService:
+    """
+    Rozhraní PresidioService pro vlákno úloh, které anonymizuje přes AnonymizationPool.
+
+    Části úloh tak běží v pracovních procesech poolu (bez GIL hlavního
+    procesu) a zabírají místa v jeho omezené frontě. Při plné frontě se
+    čeká, úloha se kvůli souběžným požadavkům API neodmítá.
+    """
+
+    def __init__(
+        self,
+        anonymization_pool,
+        loop: asyncio.AbstractEventLoop,
+        stop_event: threading.Event,
+        retry_interval_seconds: float = 0.2,
+    ):
+        """
+        Inicializace adaptéru.
+
+        Args:
+            anonymization_pool: Spuštěný AnonymizationPool
+            loop: Event loop aplikace, ve kterém pool běží
+            stop_event: Událost ukončení runneru (přeruší čekání na frontu)
+            retry_interval_seconds: Interval opakování při plné frontě
+        """
+        self.anonymization_pool = anonymization_pool
+        self.loop = loop
+        self.stop_event = stop_event
+        self.retry_interval_seconds = retry_interval_seconds
+
+    def process_documents(
+        self,
+        documents: List[Document],
+        deadlines: Optional[List[Optional[float]]] = None,
+        requested_entities: Optional[List[Optional[List[str]]]] = None,
+        requested_nlp_profiles: Optional[List[Optional[str]]] = None,
+    ) -> List[AnonymizedDocument]:
+        """
+        Anonymizuje dávku dokumentů v poolu (volá se z vlákna mimo event loop).
+
+        Args:
+            documents: Dokumenty ke zpracování
+            deadlines: Termíny jednotlivých dokumentů, None = bez omezení
+            requested_entities: Požadované typy entit jednotlivých dokumentů
+            requested_nlp_profiles: Profily spaCy pipeline jednotlivých dokumentů
+
+        Returns:
+            Anonymizované dokumenty
+
+        Raises:
+            QueueFullError: Pokud se runner ukončuje a fronta je stále plná
+        """
+        from src.api.worker_pool import QueueFullError
+
+        while True:
+            future = asyncio.run_coroutine_threadsafe(
+                self.anonymization_pool.process_documents(
+                    documents, deadlines, requested_entities, requested_nlp_profiles
+                ),
+                self.loop,
+            )
+            try:
+                return future.result()
+            except QueueFullError:
+                if self.stop_event.wait(self.retry_interval_seconds):
+                    raise
+
+    def process_document(
+        self,
+        document: Document,
+        deadline: Optional[float] = None,
+        entities: Optional[List[str]] = None,
+        nlp_profile: Optional[str] = None,
+    ) -> AnonymizedDocument:
+        """
+        Anonymizuje jeden dokument v poolu.
+
+        Args:
+            document: Dokument ke zpracování
+            deadline: Termín dokončení analýzy, None = bez omezení
+            entities: Požadované typy entit, None = všechny
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+
+        Returns:
+            Anonymizovaný dokument
+        """
+        return self.process_documents([document], [deadline], [entities], [nlp_profile])[0]
+
+
+class JobRunner:
+    """
+    Zpracování asynchronních úloh na pozadí.
+
+    Úlohy se zpracovávají postupně v jednom vlákně na pozadí, průběh
+    a výsledky se průběžně ukládají do JobStore. Po restartu aplikace
+    runner pokračuje v nedokončených úlohách. S poolem pracovníků API
+    se dokumenty anonymizují v něm, jinak přímo službou v tomto vlákně.
+    """
+
+    def __init__(
+        self,
+        presidio_service,
+        job_store: JobStore,
+        jobs_dir: str,
+        chunk_size: int = 50,
+        max_workers: int = 4,
+        anonymization_pool=None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
+        """
+        Inicializace runneru.
+
+        Args:
+            presidio_service: Instance PresidioService pro anonymizaci
+            job_store: Úložiště úloh
+            jobs_dir: Adresář pro výstupy adresářových úloh
+            chunk_size: Počet dokumentů zpracovaných najednou (nlp.pipe)
+            max_workers: Počet vláken ParallelBatchProcessoru
+            anonymization_pool: Pool pracovníků API (None = anonymizace v tomto vlákně)
+            loop: Event loop, ve kterém pool běží (povinný s poolem)
+        """
+        self.presidio_service = presidio_service
+        self.job_store = job_store
+        self.jobs_dir = jobs_dir
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.job_queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+
+        # Služba, přes kterou se dokumenty úloh anonymizují
+        if anonymization_pool is not None:
+            self.anonymization_service = PooledAnonymizationService(
+                anonymization_pool, loop, self.stop_event
+            )
+        else:
+            self.anonymization_service = presidio_service
+
+    def start(self, resume: bool = True) -> None:
+        """
+        Spustí vlákno na pozadí a zařadí nedokončené úlohy.
+
+        Args:
+            resume: Zda obnovit nedokončené úlohy (při více procesech
+                nad stejným úložištěm je obnovuje jen jeden z nich)
+        """
+        if resume:
+            for job_id in self.job_store.get_unfinished_jobs():
+                logger.info(f"Resuming unfinished job {job_id}")
+                self.job_queue.put(job_id)
+
+        self.thread = threading.Thread(target=self._run, name="job-runner", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Zastaví vlákno po dokončení právě zpracovávané části."""
+        self.stop_event.set()
+        self.job_queue.put(None)
+
+    def submit(self, job_id: str) -> None:
+        """
+        Zařadí úlohu ke zpracování.
+
+        Args:
+            job_id: ID úlohy
+        """
+        self.job_queue.put(job_id)
+
+    def _run(self) -> None:
+        """Hlavní smyčka vlákna na pozadí."""
+        while not self.stop_event.is_set():
+            job_id = self.job_queue.get()
+            if job_id is None:
+                break
+
+            try:
+                self._process_job(job_id)
+            except Exception as e:
+                if self.stop_event.is_set():
+                    # Přerušeno ukončením aplikace, úloha se po restartu obnoví
+                    logger.info(f"Job {job_id} interrupted by shutdown")
+                    break
+                logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+                self.job_store.update_job(job_id, status=ProcessingStatus.FAILED, error=str(e))
+
+    def _process_job(self, job_id: str) -> None:
+        """
+        Zpracuje jednu úlohu.
+
+        Args:
+            job_id: ID úlohy
+        """
+        job = self.job_store.get_job(job_id)
+        if job is None:
+            return
+
+        self.job_store.update_job(job_id, status=ProcessingStatus.PROCESSING)
+
+        if job["source"] == "directory":
+            self._process_directory_job(job)
+        else:
+            self._process_inline_job(job)
+
+        if self.stop_event.is_set():
+            # Úloha zůstává rozpracovaná a po restartu se obnoví
+            return
+
+        self.job_store.update_job(job_id, status=ProcessingStatus.COMPLETED)
+        logger.info(f"Job {job_id} completed")
+
+    def _process_inline_job(self, job: Dict) -> None:
+        """
+        Zpracuje dokumenty předané v požadavku, po částech přes dávkovou cestu.
+
+        Args:
+            job: Stav úlohy
+        """
+        pending = self.job_store.get_pending_documents(job["id"])
+        options = job["config"].get("options") or {}
+        entities = options.get("entities")
+        nlp_profile = options.get("nlp_profile")
+
+        for chunk_start in range(0, len(pending), self.chunk_size):
+            if self.stop_event.is_set():
+                return
+
+            chunk = pending[chunk_start:chunk_start + self.chunk_size]
+            documents = [document for _, document in chunk]
+
+            try:
+                results = self.anonymization_service.process_documents(
+                    documents,
+                    requested_entities=[entities] * len(documents),
+                    requested_nlp_profiles=[nlp_profile] * len(documents),
+                )
+            except Exception as e:
+                if self.stop_event.is_set():
+                    return
+                # Selhání dávky - zpracování po jednotlivých dokumentech izoluje chybný dokument
+                logger.warning(f"Job {job['id']}: batch failed ({str(e)}), retrying documents one by one")
+                results = [None] * len(documents)
+
+            for (seq, document), anonymized_document in zip(chunk, results):
+                error = None
+                if anonymized_document is None:
+                    try:
+                        anonymized_document = self.anonymization_service.process_document(
+                            document, entities=entities, nlp_profile=nlp_profile
+                        )
+                    except Exception as e:
+                        error = str(e)
+                if anonymized_document is not None:
+                    metrics.observe_document(document.content, anonymized_document.statistics)
+
+                self.job_store.add_result(job["id"], seq, document.id, anonymized_document, error)
+
+    def _process_directory_job(self, job: Dict) -> None:
+        """
+        Zpracuje adresář na serveru pomocí ParallelBatchProcessoru.
+
+        Adresářová úloha se po restartu spouští znovu od začátku.
+
+        Args:
+            job: Stav úlohy
+        """
+        job_dir = os.path.join(self.jobs_dir, job["id"])
+        batch_processor = ParallelBatchProcessor(
+            presidio_service=self.anonymization_service,
+            input_dir=job["input_dir"],
+            output_dir=os.path.join(job_dir, "output"),
+            error_dir=os.path.join(job_dir, "error"),
+            audit_dir=os.path.join(job_dir, "audit"),
+            max_workers=self.max_workers,
+        )
+        config = BatchProcessingConfig(**job["config"].get("batch", {}))
+        if config.entities is None:
+            config.entities = (job["config"].get("options") or {}).get("entities")
+
+        input_files = batch_processor._get_input_files(config.file_pattern)
+        if config.max_files and config.max_files > 0:
+            input_files = input_files[:config.max_files]
+
+        self.job_store.reset_results(job["id"])
+        self.job_store.update_job(job["id"], total=len(input_files))
+
+        seq_counter = itertools.count()
+
+        def on_file_processed(file_path: str, result: Dict) -> None:
+            self.job_store.add_result(
+                job["id"],
+                next(seq_counter),
+                os.path.basename(file_path),
+                result.get("anonymized_document"),
+                result.get("error"),
+            )
+
+        batch_processor.process_batch(config, on_file_processed=on_file_processed)
@@ -0,0 +1,287 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.common.models import Document, AnonymizedDocument, ProcessingStatus
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    source TEXT NOT NULL,
+    input_dir TEXT,
+    config TEXT,
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_documents (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    document_id TEXT,
+    success INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+
+class JobStore:
+    """
+    Perzistentní úložiště asynchronních úloh v lokální SQLite databázi.
+
+    Úlohy, jejich vstupní dokumenty i výsledky přežijí restart aplikace.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inicializace úložiště.
+
+        Args:
+            db_path: Cesta k souboru SQLite databáze
+        """
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+        logger.info(f"Job store initialized at {db_path}")
+
+    @contextmanager
+    def _connect(self):
+        """Otevře spojení pro jednu operaci (bezpečné napříč vlákny)."""
+        with self.lock:
+            connection = sqlite3.connect(self.db_path)
+            connection.row_factory = sqlite3.Row
+            try:
+                with connection:
+                    yield connection
+            finally:
+                connection.close()
+
+    def create_job(
+        self,
+        documents: Optional[List[Document]] = None,
+        input_dir: Optional[str] = None,
+        config: Optional[Dict] = None,
+    ) -> str:
+        """
+        Založí novou úlohu.
+
+        Args:
+            documents: Dokumenty předané přímo v požadavku
+            input_dir: Adresář na serveru zpracovaný ParallelBatchProcessorem
+            config: Konfigurace úlohy
+
+        Returns:
+            ID úlohy
+        """
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        source = "directory" if input_dir else "inline"
+
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, source, input_dir, config, total, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    ProcessingStatus.PENDING.value,
+                    source,
+                    input_dir,
+                    json.dumps(config or {}),
+                    len(documents) if documents else 0,
+                    now,
+                    now,
+                ),
+            )
+            if documents:
+                connection.executemany(
+                    "INSERT INTO job_documents (job_id, seq, document) VALUES (?, ?, ?)",
+                    [(job_id, seq, document.model_dump_json()) for seq, document in enumerate(documents)],
+                )
+
+        logger.info(f"Created {source} job {job_id}")
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Vrátí stav úlohy.
+
+        Args:
+            job_id: ID úlohy
+
+        Returns:
+            Slovník se stavem úlohy, nebo None, pokud úloha neexistuje
+        """
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["config"] = json.loads(job["config"]) if job["config"] else {}
+        return job
+
+    def get_unfinished_jobs(self) -> List[str]:
+        """
+        Vrátí ID úloh, které nebyly dokončeny (např. kvůli restartu).
+
+        Returns:
+            Seznam ID úloh v pořadí založení
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (ProcessingStatus.PENDING.value, ProcessingStatus.PROCESSING.value),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def get_pending_documents(self, job_id: str) -> List[tuple]:
+        """
+        Vrátí vstupní dokumenty úlohy, které ještě nemají výsledek.
+
+        Args:
+            job_id: ID úlohy
+
+        Returns:
+            Seznam dvojic (pořadí, dokument)
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT d.seq, d.document FROM job_documents d "
+                "LEFT JOIN job_results r ON r.job_id = d.job_id AND r.seq = d.seq "
+                "WHERE d.job_id = ? AND r.seq IS NULL ORDER BY d.seq",
+                (job_id,),
+            ).fetchall()
+        return [(row["seq"], Document.model_validate_json(row["document"])) for row in rows]
+
+    def update_job(self, job_id: str, **fields) -> None:
+        """
+        Aktualizuje stav úlohy.
+
+        Args:
+            job_id: ID úlohy
+            **fields: Sloupce k aktualizaci (status, total, error)
+        """
+        if "status" in fields and isinstance(fields["status"], ProcessingStatus):
+            fields["status"] = fields["status"].value
+        fields["updated_at"] = datetime.now().isoformat()
+
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._connect() as connection:
+            connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def add_result(
+        self,
+        job_id: str,
+        seq: int,
+        document_id: Optional[str],
+        anonymized_document: Optional[AnonymizedDocument] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Uloží výsledek jednoho dokumentu a posune průběh úlohy.
+
+        Args:
+            job_id: ID úlohy
+            seq: Pořadí dokumentu v úloze
+            document_id: ID dokumentu
+            anonymized_document: Anonymizovaný dokument (při úspěchu)
+            error: Chybová zpráva (při neúspěchu)
+        """
+        success = anonymized_document is not None
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, seq, document_id, success, result, error) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    seq,
+                    document_id,
+                    int(success),
+                    anonymized_document.model_dump_json() if success else None,
+                    error,
+                ),
+            )
+            connection.execute(
+                "UPDATE jobs SET processed = processed + 1, failed = failed + ?, updated_at = ? WHERE id = ?",
+                (0 if success else 1, datetime.now().isoformat(), job_id),
+            )
+
+    def reset_results(self, job_id: str) -> None:
+        """
+        Smaže výsledky úlohy a vynuluje její průběh (pro opakované spuštění).
+
+        Args:
+            job_id: ID úlohy
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+            connection.execute(
+                "UPDATE jobs SET processed = 0, failed = 0, updated_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), job_id),
+            )
+
+    def get_results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """
+        Vrátí stránku výsledků úlohy.
+
+        Args:
+            job_id: ID úlohy
+            offset: Počet přeskočených výsledků
+            limit: Maximální počet vrácených výsledků
+
+        Returns:
+            Seznam výsledků v pořadí dokumentů
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT seq, document_id, success, result, error FROM job_results "
+                "WHERE job_id = ? ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, limit, offset),
+            ).fetchall()
+
+        return [
+            {
+                "seq": row["seq"],
+                "document_id": row["document_id"],
+                "success": bool(row["success"]),
+                "document": AnonymizedDocument.model_validate_json(row["result"]) if row["result"] else None,
+                "error": row["error"],
+            }
+            for row in rows
+        ]
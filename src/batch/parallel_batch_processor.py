@@ -2,7 +2,7 @@ import logging
 import os
 import json
 import time
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 from datetime import datetime
 from pathlib import Path
 import concurrent.futures
@@ -137,12 +137,18 @@ class ParallelBatchProcessor:
         
         logger.info(f"Parallel batch processor initialized with {max_workers} workers and batch size {batch_size}")
     
-    def process_batch(self, config: Optional[BatchProcessingConfig] = None) -> Dict:
+    def process_batch(
+        self,
+        config: Optional[BatchProcessingConfig] = None,
+        on_file_processed: Optional[Callable[[str, Dict], None]] = None,
+    ) -> Dict:
         """
         Zpracuje dávku dokumentů paralelně.
         
         Args:
             config: Konfigurace dávkového zpracování
+            on_file_processed: Volitelná funkce volaná po zpracování každého souboru
+                s cestou k souboru a výsledkem zpracování
             
         Returns:
             Statistiky o zpracování dávky
@@ -178,7 +184,7 @@ class ParallelBatchProcessor:
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Odeslání úloh ke zpracování
             future_to_file = {
-                executor.submit(self._process_file, file_path): file_path
+                executor.submit(self._process_file, file_path, config.entities): file_path
                 for file_path in input_files
             }
             
@@ -202,6 +208,13 @@ class ParallelBatchProcessor:
                                     stats["entities_by_type"][entity_type] += count
                                 else:
                                     stats["entities_by_type"][entity_type] = count
+                            
+                            # Zásahy a výpadky cache odstavců (jen se zapnutou cache)
+                            paragraph_cache = result.get("paragraph_cache")
+                            if paragraph_cache:
+                                totals = stats.setdefault("paragraph_cache", {"hits": 0, "misses": 0})
+                                totals["hits"] += paragraph_cache["hits"]
+                                totals["misses"] += paragraph_cache["misses"]
                         else:
                             stats["failed_files"] += 1
                     
@@ -209,11 +222,16 @@ class ParallelBatchProcessor:
                     
                 except Exception as e:
                     logger.error(f"Error processing file {file_path}: {str(e)}")
+                    result = {"success": False, "error": str(e), "anonymized_document": None}
                     
                     # Aktualizace statistik
                     with self.file_lock:
                         stats["processed_files"] += 1
                         stats["failed_files"] += 1
+                
+                # Oznámení průběhu volajícímu
+                if on_file_processed:
+                    on_file_processed(file_path, result)
         
         # Ukončení monitorování výkonu
         self.performance_monitor.stop()
@@ -223,18 +241,26 @@ class ParallelBatchProcessor:
         stats["processing_time_ms"] = self.performance_monitor.get_stats()["total_time_ms"]
         stats["performance"] = self.performance_monitor.get_stats()
         
+        # Úspěšnost cache odstavců (opakované hlavičky a patičky) sečtená z dokumentů,
+        # pracovní procesy poolu mají každý vlastní cache
+        paragraph_cache = stats.get("paragraph_cache")
+        if paragraph_cache is not None:
+            lookups = paragraph_cache["hits"] + paragraph_cache["misses"]
+            paragraph_cache["hit_rate"] = paragraph_cache["hits"] / lookups if lookups else 0.0
+        
         # Uložení souhrnných statistik
         self._save_batch_stats(stats)
         
         logger.info(f"Batch processing completed: {stats['successful_files']} successful, {stats['failed_files']} failed")
         return stats
     
-    def _process_file(self, file_path: str) -> Dict:
+    def _process_file(self, file_path: str, entities: Optional[List[str]] = None) -> Dict:
         """
         Zpracuje jeden soubor.
         
         Args:
             file_path: Cesta k souboru
+            entities: Požadované typy entit, None = všechny podporované
             
         Returns:
             Výsledek zpracování
@@ -246,6 +272,8 @@ class ParallelBatchProcessor:
             "entities_by_type": {},
             "processing_time_ms": 0,
             "error": None,
+            "anonymized_document": None,
+            "paragraph_cache": None,
         }
         
         try:
@@ -253,7 +281,7 @@ class ParallelBatchProcessor:
             document = self._load_document(file_path)
             
             # Anonymizace dokumentu
-            anonymized_document = self._process_document_with_retry(document)
+            anonymized_document = self._process_document_with_retry(document, entities)
             
             # Uložení anonymizovaného dokumentu
             output_path = self._save_anonymized_document(anonymized_document)
@@ -262,6 +290,8 @@ class ParallelBatchProcessor:
             result["success"] = True
             result["entity_count"] = len(anonymized_document.entities)
             result["entities_by_type"] = anonymized_document.statistics.get("entities_by_type", {})
+            result["anonymized_document"] = anonymized_document
+            result["paragraph_cache"] = anonymized_document.statistics.get("paragraph_cache")
             
             # Vytvoření auditního záznamu
             self._create_audit_record(document, anonymized_document, True)
@@ -341,12 +371,17 @@ class ParallelBatchProcessor:
         
         return document
     
-    def _process_document_with_retry(self, document: Document) -> AnonymizedDocument:
+    def _process_document_with_retry(
+        self,
+        document: Document,
+        entities: Optional[List[str]] = None
+    ) -> AnonymizedDocument:
         """
         Zpracuje dokument s možností opakování při chybě.
         
         Args:
             document: Dokument ke zpracování
+            entities: Požadované typy entit, None = všechny podporované
             
         Returns:
             Anonymizovaný dokument
@@ -358,7 +393,7 @@ class ParallelBatchProcessor:
         
         for attempt in range(self.max_retries):
             try:
-                return self.presidio_service.process_document(document)
+                return self.presidio_service.process_document(document, entities=entities)
             except Exception as e:
                 last_exception = e
                 logger.warning(f"Attempt {attempt+1}/{self.max_retries} failed: {str(e)}")
@@ -0,0 +1,50 @@
+import logging
+import os
+from typing import Dict
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Položky /proc/<pid>/smaps_rollup, ze kterých se skládá využití paměti (v kB)
+_SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_bytes",
+    "Shared_Dirty": "shared_bytes",
+    "Private_Clean": "private_bytes",
+    "Private_Dirty": "private_bytes",
+}
+
+
+def get_memory_usage(pid: int = None) -> Dict[str, int]:
+    """
+    Zjistí využití paměti procesu z /proc (pouze Linux).
+
+    Sdílená paměť zahrnuje stránky zděděné od hlavního procesu při forku
+    (copy-on-write), které zatím žádný proces nezměnil.
+
+    Args:
+        pid: ID procesu (výchozí: aktuální proces)
+
+    Returns:
+        Slovník s rss_bytes, pss_bytes, shared_bytes a private_bytes,
+        nebo prázdný slovník, pokud /proc není k dispozici
+    """
+    pid = pid or os.getpid()
+    usage = {name: 0 for name in set(_SMAPS_FIELDS.values())}
+
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            for line in smaps:
+                field, _, value = line.partition(":")
+                if field in _SMAPS_FIELDS:
+                    usage[_SMAPS_FIELDS[field]] += int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        logger.debug(f"Memory usage of process {pid} is not available")
+        return {}
+
+    return usage
@@ -0,0 +1,399 @@
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Hranice histogramu doby trvání v sekundách
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Interval zápisu metrik pracovníka do sdíleného adresáře (víceprocesový server)
+DEFAULT_EXPORT_INTERVAL_SECONDS = 5.0
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Převede štítky na zápis ve formátu Prometheus.
+
+    Args:
+        labels: Dvojice (název, hodnota)
+
+    Returns:
+        Řetězec štítků včetně složených závorek, nebo prázdný řetězec
+    """
+    if not labels:
+        return ""
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class Histogram:
+    """
+    Histogram hodnot se štítky (kumulativní koše ve stylu Prometheus).
+    """
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        """
+        Inicializace histogramu.
+
+        Args:
+            name: Název metriky
+            description: Popis metriky
+            label_names: Názvy štítků
+            buckets: Horní hranice košů
+        """
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self.series: Dict[Tuple, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Zaznamená hodnotu (volající drží zámek registru).
+
+        Args:
+            value: Naměřená hodnota
+            **labels: Hodnoty štítků
+        """
+        key = tuple((name, labels[name]) for name in self.label_names)
+        counts, totals = self.series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+
+    def render(self, extra_labels: Tuple[Tuple[str, str], ...] = ()) -> List[str]:
+        """
+        Vrátí řádky metriky ve formátu Prometheus.
+
+        Args:
+            extra_labels: Štítky přidané ke všem řadám (např. pracovník serveru)
+
+        Returns:
+            Seznam řádků
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for key, (counts, totals) in sorted(self.series.items()):
+            key = extra_labels + key
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {totals[0]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Monotónně rostoucí čítač se štítky.
+    """
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()):
+        """
+        Inicializace čítače.
+
+        Args:
+            name: Název metriky
+            description: Popis metriky
+            label_names: Názvy štítků
+        """
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.series: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Zvýší čítač (volající drží zámek registru).
+
+        Args:
+            amount: Přírůstek
+            **labels: Hodnoty štítků
+        """
+        key = tuple((name, labels[name]) for name in self.label_names)
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def render(self, extra_labels: Tuple[Tuple[str, str], ...] = ()) -> List[str]:
+        """
+        Vrátí řádky metriky ve formátu Prometheus.
+
+        Args:
+            extra_labels: Štítky přidané ke všem řadám (např. pracovník serveru)
+
+        Returns:
+            Seznam řádků
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.series.items()):
+            lines.append(f"{self.name}{_format_labels(extra_labels + key)} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metriky zpracování dokumentů ve formátu Prometheus.
+
+    Doby jednotlivých fází zpracování se měří v PresidioService (i v
+    pracovních procesech) a vrací se v statistics["stage_timings_ms"];
+    registr je zaznamená v procesu, který dokument převezme.
+
+    Na víceprocesovém serveru (src.api.server) každý pracovník průběžně
+    zapisuje své metriky se štítkem worker do sdíleného adresáře a
+    /metrics vrátí řady všech pracovníků, ať požadavek obslouží kterýkoli.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.worker: Optional[str] = None
+        self.export_dir: Optional[str] = None
+        self._export_stop = threading.Event()
+        self._export_thread: Optional[threading.Thread] = None
+        self.stage_duration = Histogram(
+            "anonymizer_stage_duration_seconds",
+            "Duration of document processing stages",
+            ("stage",),
+        )
+        self.document_duration = Histogram(
+            "anonymizer_document_duration_seconds",
+            "Total processing time per document",
+        )
+        self.documents = Counter(
+            "anonymizer_documents_processed_total",
+            "Documents processed by the anonymization engine",
+        )
+        self.bytes = Counter(
+            "anonymizer_bytes_processed_total",
+            "UTF-8 bytes of document content processed by the anonymization engine",
+        )
+        self.entities = Counter(
+            "anonymizer_entities_detected_total",
+            "Detected entities by type",
+            ("entity_type",),
+        )
+        self.degraded = Counter(
+            "anonymizer_degraded_stages_total",
+            "Stages skipped to meet a request deadline",
+            ("stage",),
+        )
+        self.skipped_recognizers = Counter(
+            "anonymizer_skipped_recognizers_total",
+            "Recognizer invocations skipped by the document prefilter",
+            ("recognizer",),
+        )
+        self.paragraph_cache = Counter(
+            "anonymizer_paragraph_cache_lookups_total",
+            "Paragraph cache lookups by result",
+            ("result",),
+        )
+        self.gauges: Dict[str, Tuple[str, float]] = {}
+        self.totals: Dict[str, Tuple[str, float]] = {}
+
+    def observe_stage(self, stage: str, duration_ms: float) -> None:
+        """
+        Zaznamená dobu trvání jedné fáze.
+
+        Args:
+            stage: Název fáze
+            duration_ms: Doba trvání v ms
+        """
+        with self.lock:
+            self.stage_duration.observe(duration_ms / 1000, stage=stage)
+
+    def observe_document(self, content: str, statistics: Optional[Dict]) -> None:
+        """
+        Zaznamená zpracovaný dokument podle jeho statistik.
+
+        Args:
+            content: Původní obsah dokumentu
+            statistics: Statistiky z PresidioService.process_document
+        """
+        statistics = statistics or {}
+        with self.lock:
+            self.documents.inc()
+            self.bytes.inc(len(content.encode("utf-8")))
+            self.document_duration.observe(statistics.get("processing_time_ms", 0) / 1000)
+            for stage, duration_ms in statistics.get("stage_timings_ms", {}).items():
+                self.stage_duration.observe(duration_ms / 1000, stage=stage)
+            for entity_type, count in statistics.get("entities_by_type", {}).items():
+                self.entities.inc(count, entity_type=entity_type)
+            for stage in statistics.get("degraded_stages", []):
+                self.degraded.inc(stage=stage)
+            for recognizer, count in statistics.get("skipped_recognizers", {}).items():
+                self.skipped_recognizers.inc(count, recognizer=recognizer)
+            paragraph_cache = statistics.get("paragraph_cache") or {}
+            for result in ("hits", "misses"):
+                if paragraph_cache.get(result):
+                    self.paragraph_cache.inc(paragraph_cache[result], result=result)
+
+    def set_gauge(self, name: str, value: float, description: str) -> None:
+        """
+        Nastaví okamžitou hodnotu (např. hloubku fronty).
+
+        Args:
+            name: Název metriky
+            value: Hodnota
+            description: Popis metriky
+        """
+        with self.lock:
+            self.gauges[name] = (description, value)
+
+    def set_total(self, name: str, value: float, description: str) -> None:
+        """
+        Nastaví hodnotu čítače, který počítá jiná komponenta (např. zásahy cache).
+
+        Args:
+            name: Název metriky (s příponou _total)
+            value: Dosavadní celkový počet
+            description: Popis metriky
+        """
+        with self.lock:
+            self.totals[name] = (description, value)
+
+    def enable_multiprocess(self, export_dir: str, worker: str) -> None:
+        """
+        Zapne sdílení metrik mezi pracovníky víceprocesového serveru.
+
+        Args:
+            export_dir: Adresář sdílený pracovníky
+            worker: Označení pracovníka (štítek worker)
+        """
+        os.makedirs(export_dir, exist_ok=True)
+        self.export_dir = export_dir
+        self.worker = worker
+
+    def start_export(
+        self,
+        refresh: Optional[Callable[[], None]] = None,
+        interval_seconds: float = DEFAULT_EXPORT_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Spustí vlákno, které periodicky zapisuje metriky pracovníka.
+
+        Args:
+            refresh: Funkce volaná před zápisem (např. aktualizace okamžitých hodnot)
+            interval_seconds: Interval zápisu
+        """
+        if self.export_dir is None or self._export_thread is not None:
+            return
+
+        def export_loop():
+            while not self._export_stop.wait(interval_seconds):
+                try:
+                    if refresh is not None:
+                        refresh()
+                    self._write_export(self._render_families())
+                except Exception as e:
+                    logger.warning(f"Metrics export failed: {str(e)}")
+
+        self._export_stop.clear()
+        self._export_thread = threading.Thread(target=export_loop, name="metrics-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_export(self) -> None:
+        """Zastaví vlákno zápisu metrik."""
+        if self._export_thread is not None:
+            self._export_stop.set()
+            self._export_thread.join()
+            self._export_thread = None
+
+    def render(self) -> str:
+        """
+        Vrátí všechny metriky v textovém formátu Prometheus.
+
+        Na víceprocesovém serveru vrátí řady všech pracovníků (ostatní
+        pracovníci podle posledního zápisu).
+
+        Returns:
+            Text pro endpoint /metrics
+        """
+        families = self._render_families()
+        if self.export_dir is not None:
+            self._write_export(families)
+            families = self._read_exports()
+
+        lines = []
+        for _, family_lines in families:
+            lines.extend(family_lines)
+        return "\n".join(lines) + "\n"
+
+    def _render_families(self) -> List[Tuple[str, List[str]]]:
+        """
+        Vrátí metriky tohoto procesu po rodinách (název, řádky včetně HELP a TYPE).
+
+        Returns:
+            Seznam rodin metrik
+        """
+        extra_labels = (("worker", self.worker),) if self.worker is not None else ()
+        with self.lock:
+            families = [
+                (metric.name, metric.render(extra_labels))
+                for metric in (
+                    self.stage_duration,
+                    self.document_duration,
+                    self.documents,
+                    self.bytes,
+                    self.entities,
+                    self.degraded,
+                    self.skipped_recognizers,
+                    self.paragraph_cache,
+                )
+            ]
+            for metric_type, values in (("counter", self.totals), ("gauge", self.gauges)):
+                for name, (description, value) in sorted(values.items()):
+                    families.append((name, [
+                        f"# HELP {name} {description}",
+                        f"# TYPE {name} {metric_type}",
+                        f"{name}{_format_labels(extra_labels)} {value}",
+                    ]))
+        return families
+
+    def _write_export(self, families: List[Tuple[str, List[str]]]) -> None:
+        """
+        Zapíše metriky pracovníka do sdíleného adresáře (atomicky).
+
+        Args:
+            families: Rodiny metrik z _render_families
+        """
+        path = os.path.join(self.export_dir, f"worker-{self.worker}.json")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(families, f)
+        os.replace(temp_path, path)
+
+    def _read_exports(self) -> List[Tuple[str, List[str]]]:
+        """
+        Sloučí metriky všech pracovníků ze sdíleného adresáře.
+
+        Returns:
+            Rodiny metrik s řadami všech pracovníků (HELP a TYPE jednou)
+        """
+        merged: Dict[str, List[str]] = {}
+        for path in sorted(glob.glob(os.path.join(self.export_dir, "worker-*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    families = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Cannot read metrics export {path}: {str(e)}")
+                continue
+            for name, family_lines in families:
+                if name in merged:
+                    merged[name].extend(family_lines[2:])
+                else:
+                    merged[name] = list(family_lines)
+        return list(merged.items())
+
+
+metrics = MetricsRegistry()
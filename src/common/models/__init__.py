@@ -6,6 +6,7 @@ from src.common.models.document import (
     DocumentType,
     ProcessingStatus
 )
+from src.common.models.batch import BatchProcessingConfig
 
 __all__ = [
     "Document",
@@ -13,5 +14,6 @@ __all__ = [
     "DetectedEntity",
     "AnonymizedEntity",
     "DocumentType",
-    "ProcessingStatus"
+    "ProcessingStatus",
+    "BatchProcessingConfig"
 ]
@@ -0,0 +1,10 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchProcessingConfig(BaseModel):
+    """Konfigurace dávkového zpracování dokumentů."""
+    file_pattern: str = Field("*.txt", description="Vzor pro výběr vstupních souborů")
+    max_files: int = Field(0, description="Maximální počet zpracovaných souborů (0 = všechny)")
+    entities: Optional[List[str]] = Field(None, description="Požadované typy entit (None = všechny podporované)")
@@ -0,0 +1,139 @@
+import argparse
+import collections
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from src.detection.recognizers.czech_diagnosis_code_recognizer import CzechMedicalDiagnosisCodeRecognizer
+from src.detection.recognizers.diagnosis_codes import DiagnosisCodeTable, load_diagnosis_table
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Šablony syntetického laboratorního korpusu (kódy diagnóz jen za "Dg.")
+_LAB_LINES = [
+    "Dg. {diagnosis}, kontrola za 3 měsíce.",
+    "Vitamin B12 {value} pmol/l, folát {value} nmol/l.",
+    "Vzorek zpracován na analyzátoru typ {device}, šarže {device}.",
+    "Ref. č. žádanky {device}/{value}, odběr 7:30.",
+    "Dg. {diagnosis}, {diagnosis}; terapie beze změny.",
+    "Krevní obraz: WBC {value}, RBC {value}, PLT {value}, kód metody {device}.",
+]
+_DIAGNOSES = ["J45.0", "E10.5", "I10", "K29.7", "M54.4", "C50.1", "F20.0", "N18.3"]
+_DEVICES = ["B12", "D54", "X11", "K10", "T99", "E95", "Q47", "G18", "H07", "R24"]
+
+
+def generate_lab_corpus(documents: int = 500, seed: int = 7) -> List[str]:
+    """
+    Vytvoří syntetický laboratorní korpus.
+
+    Args:
+        documents: Počet dokumentů
+        seed: Semínko generátoru
+
+    Returns:
+        Texty dokumentů
+    """
+    generator = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        lines = []
+        for template in generator.choices(_LAB_LINES, k=12):
+            line = template
+            while "{" in line:
+                line = line.replace("{diagnosis}", generator.choice(_DIAGNOSES), 1)
+                line = line.replace("{device}", generator.choice(_DEVICES), 1)
+                line = line.replace("{value}", f"{generator.uniform(1, 400):.1f}", 1)
+            lines.append(line)
+        corpus.append("\n".join(lines))
+    return corpus
+
+
+def benchmark_tables(corpus: List[str], tables: Dict[str, DiagnosisCodeTable], runs: int = 5) -> List[Dict]:
+    """
+    Změří počty hlášených a odmítnutých kandidátů a propustnost rozpoznávače.
+
+    Args:
+        corpus: Texty dokumentů
+        tables: Měřené tabulky kódů podle názvu
+        runs: Počet opakování měření času (bere se medián)
+
+    Returns:
+        Výsledky měření pro jednotlivé tabulky
+    """
+    total_chars = sum(len(text) for text in corpus)
+    all_codes = DiagnosisCodeTable.from_category_ranges(["A00-Z99"])
+    candidates = collections.Counter(
+        text[result.start:result.end]
+        for text in corpus
+        for result in CzechMedicalDiagnosisCodeRecognizer(code_table=all_codes).analyze(
+            text, ["CZECH_DIAGNOSIS_CODE"], None
+        )
+    )
+
+    results = []
+    for name, table in tables.items():
+        recognizer = CzechMedicalDiagnosisCodeRecognizer(code_table=table)
+        timings = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            reported = collections.Counter(
+                text[result.start:result.end]
+                for text in corpus
+                for result in recognizer.analyze(text, ["CZECH_DIAGNOSIS_CODE"], None)
+            )
+            timings.append(time.perf_counter() - start_time)
+        elapsed = sorted(timings)[len(timings) // 2]
+
+        rejected = candidates - reported
+        results.append({
+            "table": name,
+            "reported": sum(reported.values()),
+            "rejected": sum(rejected.values()),
+            "top_rejected": ", ".join(code for code, _ in rejected.most_common(5)),
+            "chars_per_second": total_chars / elapsed,
+        })
+    return results
+
+
+def main() -> None:
+    """Spustí měření a vypíše tabulku ve formátu Markdown."""
+    parser = argparse.ArgumentParser(description="Measure false-positive reduction and throughput of MKN-10 validation")
+    parser.add_argument("--corpus", help="Directory with .txt documents (default: synthetic lab corpus)")
+    parser.add_argument("--table", help="Compiled code table from build_diagnosis_table")
+    parser.add_argument("--documents", type=int, default=500, help="Synthetic corpus size")
+    parser.add_argument("--runs", type=int, default=5, help="Timing runs per table")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = [path.read_text(encoding="utf-8") for path in sorted(Path(args.corpus).glob("*.txt"))]
+    else:
+        corpus = generate_lab_corpus(args.documents)
+
+    tables: Dict[str, DiagnosisCodeTable] = {
+        "format only": DiagnosisCodeTable.from_category_ranges(["A00-Z99"]),
+        "built-in categories": load_diagnosis_table(None),
+    }
+    if args.table:
+        tables["compiled table"] = load_diagnosis_table(args.table)
+
+    results = benchmark_tables(corpus, tables, args.runs)
+
+    print(f"Corpus: {len(corpus)} documents, {sum(len(text) for text in corpus)} chars")
+    print("| Table | Reported | Rejected | Most rejected | Chars/s |")
+    print("|---|---:|---:|---|---:|")
+    for result in results:
+        print(
+            f"| {result['table']} | {result['reported']} | {result['rejected']} "
+            f"| {result['top_rejected']} | {result['chars_per_second']:.0f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
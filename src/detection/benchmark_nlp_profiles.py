@@ -0,0 +1,128 @@
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+from src.common.models import Document
+from src.detection.nlp_profiles import NLP_PROFILES, SENTENCIZER
+from src.detection.presidio_service import WARMUP_CORPUS, PresidioService
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def get_missing_components(presidio_service: PresidioService, profile: str) -> List[str]:
+    """
+    Vrátí natrénované komponenty profilu, které načtený model nemá.
+
+    Bez nich by měření profilu odpovídalo menšímu profilu (např. prázdná
+    pipeline místo en_core_web_sm) a výsledek by do tabulky nepatřil.
+
+    Args:
+        presidio_service: Služba s načteným modelem
+        profile: Profil ke kontrole
+
+    Returns:
+        Chybějící komponenty (prázdný seznam = profil lze měřit)
+    """
+    components = NLP_PROFILES[profile]
+    required = ["ner"] if components is None else [name for name in components if name != SENTENCIZER]
+    missing = []
+    for nlp in presidio_service.nlp_engine.nlp.values():
+        missing.extend(name for name in required if name not in nlp.pipe_names and name not in missing)
+    return missing
+
+
+def benchmark_profiles(
+    presidio_service: PresidioService,
+    profiles: List[str],
+    documents: int = 300,
+    batch_size: int = 50
+) -> List[Dict]:
+    """
+    Změří propustnost zpracování pro jednotlivé profily spaCy pipeline.
+
+    Args:
+        presidio_service: Služba se všemi měřenými profily povolenými
+        profiles: Měřené profily
+        documents: Počet dokumentů na profil (vestavěný korpus se opakuje)
+        batch_size: Velikost dávky pro process_documents
+
+    Returns:
+        Výsledky měření pro jednotlivé profily (u profilu, který načtený
+        model neumí spustit, jsou hodnoty None)
+    """
+    corpus = [
+        Document(id=f"benchmark-{i}", content=WARMUP_CORPUS[i % len(WARMUP_CORPUS)])
+        for i in range(documents)
+    ]
+    total_chars = sum(len(document.content) for document in corpus)
+
+    results = []
+    for profile in profiles:
+        missing = get_missing_components(presidio_service, profile)
+        if missing:
+            logger.warning(f"Profile {profile} not measured, model lacks components: {', '.join(missing)}")
+            results.append({
+                "profile": profile,
+                "documents_per_second": None,
+                "chars_per_second": None,
+                "nlp_ms_per_document": None,
+                "entities": None,
+            })
+            continue
+
+        # Zahřátí profilu mimo měření
+        presidio_service.process_documents(corpus[:len(WARMUP_CORPUS)], requested_nlp_profiles=[profile] * len(WARMUP_CORPUS))
+
+        start_time = time.perf_counter()
+        anonymized_documents = []
+        for batch_start in range(0, len(corpus), batch_size):
+            batch = corpus[batch_start:batch_start + batch_size]
+            anonymized_documents.extend(
+                presidio_service.process_documents(batch, requested_nlp_profiles=[profile] * len(batch))
+            )
+        elapsed = time.perf_counter() - start_time
+
+        nlp_ms = sum(document.statistics["stage_timings_ms"].get("nlp", 0.0) for document in anonymized_documents)
+        results.append({
+            "profile": profile,
+            "documents_per_second": len(corpus) / elapsed,
+            "chars_per_second": total_chars / elapsed,
+            "nlp_ms_per_document": nlp_ms / len(corpus),
+            "entities": sum(len(document.entities) for document in anonymized_documents),
+        })
+    return results
+
+
+def main() -> None:
+    """Spustí měření a vypíše tabulku ve formátu Markdown."""
+    parser = argparse.ArgumentParser(description="Measure throughput of spaCy pipeline profiles")
+    parser.add_argument("--documents", type=int, default=300, help="Documents per profile")
+    parser.add_argument("--batch-size", type=int, default=50, help="Documents per process_documents call")
+    parser.add_argument("--profiles", default=",".join(NLP_PROFILES), help="Comma-separated profiles")
+    args = parser.parse_args()
+
+    profiles = [profile.strip() for profile in args.profiles.split(",") if profile.strip()]
+    presidio_service = PresidioService(nlp_profiles=profiles, default_nlp_profile=profiles[0])
+    results = benchmark_profiles(presidio_service, profiles, args.documents, args.batch_size)
+
+    print(f"Engine: {presidio_service.engine_version}")
+    print("| Profile | Documents/s | Chars/s | NLP ms/document | Entities |")
+    print("|---|---:|---:|---:|---:|")
+    for result in results:
+        if result["entities"] is None:
+            print(f"| {result['profile']} | not measured | not measured | not measured | not measured |")
+            continue
+        print(
+            f"| {result['profile']} | {result['documents_per_second']:.1f} | {result['chars_per_second']:.0f} "
+            f"| {result['nlp_ms_per_document']:.2f} | {result['entities']} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+# Modul záměrně importuje jen standardní knihovnu: doby importu se měří
+# v samostatném procesu, kde ještě nic z Presidia ani spaCy načteno není
+
+
+def measure_startup() -> Dict[str, float]:
+    """
+    Změří start služby v aktuálním (čerstvém) procesu.
+
+    Returns:
+        Doby v ms: import modulu služby, vytvoření služby, první anonymizovaný dokument
+    """
+    start_time = time.perf_counter()
+    from src.common.models import Document
+    from src.detection.presidio_service import WARMUP_CORPUS, PresidioService
+    imported = time.perf_counter()
+
+    presidio_service = PresidioService()
+    initialized = time.perf_counter()
+
+    presidio_service.process_document(Document(id="startup-benchmark", content=WARMUP_CORPUS[0]))
+    first_document = time.perf_counter()
+
+    return {
+        "import_ms": (imported - start_time) * 1000,
+        "init_ms": (initialized - imported) * 1000,
+        "first_document_ms": (first_document - initialized) * 1000,
+        "time_to_first_document_ms": (first_document - start_time) * 1000,
+    }
+
+
+def run_in_subprocess(snapshot_dir: Optional[str]) -> Dict[str, float]:
+    """
+    Změří start služby v novém procesu Pythonu.
+
+    Args:
+        snapshot_dir: Adresář snapshotu enginu, None = bez snapshotu
+
+    Returns:
+        Výsledek measure_startup z nového procesu
+    """
+    env = dict(os.environ)
+    env.pop("ANONYMIZER_SNAPSHOT_DIR", None)
+    if snapshot_dir:
+        env["ANONYMIZER_SNAPSHOT_DIR"] = snapshot_dir
+
+    completed = subprocess.run(
+        [sys.executable, "-m", "src.detection.benchmark_startup", "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Spustí měření studeného startu a vypíše tabulku ve formátu Markdown."""
+    parser = argparse.ArgumentParser(description="Measure import time and time to first anonymized document")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--snapshot-dir", help="Snapshot directory (default: temporary directory)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_startup()))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        snapshot_dir = args.snapshot_dir or temp_dir
+
+        # První běh se snapshotem ho teprve uloží
+        scenarios = [("no snapshot", None), ("snapshot (build)", snapshot_dir), ("snapshot (load)", snapshot_dir)]
+        results = []
+        for name, directory in scenarios:
+            runs = args.runs if name != "snapshot (build)" else 1
+            measurements = [run_in_subprocess(directory) for _ in range(runs)]
+            results.append((name, {
+                key: sorted(measurement[key] for measurement in measurements)[len(measurements) // 2]
+                for key in measurements[0]
+            }))
+
+    print("| Scenario | Import ms | Init ms | First document ms | Time to first document ms |")
+    print("|---|---:|---:|---:|---:|")
+    for name, result in results:
+        print(
+            f"| {name} | {result['import_ms']:.0f} | {result['init_ms']:.0f} "
+            f"| {result['first_document_ms']:.0f} | {result['time_to_first_document_ms']:.0f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import logging
+
+from src.detection.build_name_index import read_names
+from src.detection.recognizers.diagnosis_codes import build_diagnosis_table
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """Sestaví tabulku platných kódů MKN-10 z CSV číselníku."""
+    parser = argparse.ArgumentParser(description="Build a memory-mapped MKN-10 code table from a code list CSV")
+    parser.add_argument("csv_path", help="Input CSV file with a header row (e.g. the UZIS MKN-10 code list)")
+    parser.add_argument("output_path", help="Output table file")
+    parser.add_argument("--column", default="KOD", help="Column with codes")
+    parser.add_argument("--delimiter", help="Column delimiter (default: detected)")
+    parser.add_argument("--encoding", default="utf-8-sig", help="Input encoding")
+    args = parser.parse_args()
+
+    codes = read_names(args.csv_path, [args.column], args.delimiter, args.encoding)
+    count = build_diagnosis_table(codes, args.output_path)
+    print(f"{count} codes written to {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import csv
+import logging
+from typing import Iterator, List, Optional
+
+from src.detection.recognizers.name_index import DEFAULT_FILTER_BITS_LOG2, build_name_index
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def read_names(csv_path: str, columns: List[str], delimiter: Optional[str] = None, encoding: str = "utf-8-sig") -> Iterator[str]:
+    """
+    Načte jména ze sloupců CSV souboru (např. export NRPZS).
+
+    Args:
+        csv_path: Cesta k CSV souboru s hlavičkou
+        columns: Sloupce se jmény (každý neprázdný je samostatné jméno)
+        delimiter: Oddělovač sloupců, None = zjistit ze začátku souboru
+        encoding: Kódování souboru
+
+    Yields:
+        Jména v pořadí souboru
+
+    Raises:
+        ValueError: Pokud CSV neobsahuje některý ze sloupců
+    """
+    with open(csv_path, "r", encoding=encoding, newline="") as f:
+        if delimiter is None:
+            try:
+                delimiter = csv.Sniffer().sniff(f.read(64 * 1024), delimiters=",;\t|").delimiter
+            except csv.Error:
+                delimiter = ","  # Např. soubor s jediným sloupcem
+            f.seek(0)
+
+        reader = csv.DictReader(f, delimiter=delimiter)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"CSV {csv_path} has no column(s): {', '.join(missing)}")
+
+        for row in reader:
+            for column in columns:
+                value = (row.get(column) or "").strip()
+                if value:
+                    yield value
+
+
+def main() -> None:
+    """Sestaví index jmen z CSV souboru."""
+    parser = argparse.ArgumentParser(description="Build a memory-mapped name index (e.g. facility gazetteer) from CSV")
+    parser.add_argument("csv_path", help="Input CSV file with a header row")
+    parser.add_argument("output_path", help="Output index file")
+    parser.add_argument(
+        "--column", action="append", dest="columns",
+        help="Column with names, may be repeated (default: NazevCely)",
+    )
+    parser.add_argument("--delimiter", help="Column delimiter (default: detected)")
+    parser.add_argument("--encoding", default="utf-8-sig", help="Input encoding")
+    parser.add_argument("--filter-bits-log2", type=int, default=DEFAULT_FILTER_BITS_LOG2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    names = read_names(args.csv_path, args.columns or ["NazevCely"], args.delimiter, args.encoding)
+    count = build_name_index(names, args.output_path, args.filter_bits_log2)
+    print(f"{count} names written to {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import TYPE_CHECKING, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerResult
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Výchozí velikost části (ve znacích) - delší dokumenty se analyzují po částech
+DEFAULT_CHUNK_SIZE = int(os.environ.get("ANONYMIZER_CHUNK_CHARS", "100000"))
+
+# Výchozí překryv sousedních částí - musí pokrýt nejdelší entitu včetně
+# kontextového okna rozpoznávačů (adresa hledá až 100 znaků před PSČ)
+DEFAULT_CHUNK_OVERLAP = int(os.environ.get("ANONYMIZER_CHUNK_OVERLAP_CHARS", "400"))
+
+# Výchozí počet vláken pro souběžnou analýzu částí (1 = postupně)
+DEFAULT_CHUNK_WORKERS = int(os.environ.get("ANONYMIZER_CHUNK_WORKERS", "1"))
+
+# Preferované hranice části v pořadí priority: odstavec, řádek, konec věty, mezera
+_BOUNDARY_PATTERNS = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"[.!?]\s"),
+    re.compile(r"\s"),
+]
+
+# Mezera pro zarovnání začátku překryvu na hranici slova
+_WHITESPACE = re.compile(r"\s")
+
+# Hranici lze hledat jen ve druhé polovině části, aby části nebyly příliš krátké
+_MIN_CHUNK_FILL = 0.5
+
+
+class Chunk(NamedTuple):
+    """
+    Část textu analyzovaná samostatně.
+
+    start/end vymezují text části, owned_start/owned_end úsek, za jehož
+    entity část odpovídá (hranice vlastnictví leží uprostřed překryvu).
+    """
+    start: int
+    end: int
+    owned_start: int
+    owned_end: int
+
+
+def _find_boundary(text: str, start: int, end: int) -> int:
+    """
+    Najde nejlepší hranici části v úseku text[start:end].
+
+    Args:
+        text: Celý text
+        start: Začátek části
+        end: Nejzazší konec části
+
+    Returns:
+        Pozice konce části
+    """
+    search_start = start + int((end - start) * _MIN_CHUNK_FILL)
+    for pattern in _BOUNDARY_PATTERNS:
+        boundary = None
+        for match in pattern.finditer(text, search_start, end):
+            boundary = match.end()
+        if boundary is not None:
+            return boundary
+    return end
+
+
+def _snap_to_whitespace(text: str, position: int, limit: int) -> int:
+    """
+    Posune začátek překryvu za nejbližší mezeru, aby nezačínal uprostřed slova.
+
+    Args:
+        text: Celý text
+        position: Navržený začátek
+        limit: Nejzazší přípustná pozice
+
+    Returns:
+        Upravený začátek
+    """
+    match = _WHITESPACE.search(text, position, limit)
+    return match.end() if match else position
+
+
+def split_into_chunks(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_CHUNK_OVERLAP) -> List[Chunk]:
+    """
+    Rozdělí text na části na hranicích odstavců, vět nebo slov s překryvem.
+
+    Args:
+        text: Text k rozdělení
+        chunk_size: Maximální délka části ve znacích
+        overlap: Délka překryvu sousedních částí ve znacích
+
+    Returns:
+        Seznam částí pokrývajících celý text
+    """
+    if chunk_size <= 0 or len(text) <= chunk_size:
+        return [Chunk(0, len(text), 0, len(text))]
+
+    overlap = max(0, min(overlap, chunk_size // 2))
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    while True:
+        if len(text) - start <= chunk_size:
+            spans.append((start, len(text)))
+            break
+
+        end = _find_boundary(text, start, start + chunk_size)
+        spans.append((start, end))
+
+        next_start = max(end - overlap, start + 1)
+        start = _snap_to_whitespace(text, next_start, end)
+
+    chunks = []
+    for i, (start, end) in enumerate(spans):
+        owned_start = 0 if i == 0 else (start + spans[i - 1][1]) // 2
+        owned_end = len(text) if i == len(spans) - 1 else (spans[i + 1][0] + end) // 2
+        chunks.append(Chunk(start, end, owned_start, owned_end))
+
+    return chunks
+
+
+def merge_chunk_results(chunk_results: List[Tuple[Chunk, List[RecognizerResult]]]) -> List[RecognizerResult]:
+    """
+    Převede výsledky částí na globální pozice a odstraní duplicity z překryvů.
+
+    Entita se převezme z části, které patří její začátek; protože hranice
+    vlastnictví leží uprostřed překryvu, vidí tato část entitu celou.
+
+    Args:
+        chunk_results: Dvojice (část, výsledky analýzy textu části)
+
+    Returns:
+        Výsledky s pozicemi v celém textu
+    """
+    merged = []
+    for chunk, results in chunk_results:
+        for result in results:
+            start = result.start + chunk.start
+            if not chunk.owned_start <= start < chunk.owned_end:
+                continue
+            result.start = start
+            result.end = result.end + chunk.start
+            merged.append(result)
+
+    from presidio_analyzer import EntityRecognizer
+
+    return EntityRecognizer.remove_duplicates(merged)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import platform
+import shutil
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.detection.recognizers.diagnosis_codes import DEFAULT_DIAGNOSIS_TABLE
+from src.detection.recognizers.name_index import DEFAULT_ADDRESS_INDEX, DEFAULT_FACILITY_GAZETTEER, get_index_identity
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerRegistry
+    from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Adresář cache pro snapshot enginu (prázdný = bez snapshotu)
+DEFAULT_SNAPSHOT_DIR = os.environ.get("ANONYMIZER_SNAPSHOT_DIR") or None
+
+# Verze formátu snapshotu (zvýšit při změně obsahu snapshotu)
+SNAPSHOT_FORMAT = 1
+
+# Knihovny, jejichž verze snapshot zneplatní
+_FINGERPRINT_PACKAGES = ["presidio-analyzer", "presidio-anonymizer", "spacy"]
+
+# Zdrojové soubory a vestavěné definice rozpoznávačů, jejichž instance snapshot obsahuje
+_RECOGNIZERS_DIR = Path(__file__).parent / "recognizers"
+
+_METADATA_FILE = "snapshot.json"
+_REGISTRY_FILE = "registry.pkl"
+_SPACY_DIR = "spacy"
+
+
+class EngineSnapshot:
+    """
+    Předpřipravený analyzer uložený v adresáři cache.
+
+    Snapshot obsahuje spaCy modely uložené přes to_disk (před úpravou
+    pipeline podle profilů) a pickle registru rozpoznávačů včetně českých.
+    Každá kombinace verzí knihoven, modelů a zdrojů rozpoznávačů má vlastní
+    podadresář, takže změna kteréhokoli z nich snapshot nepoužije. Snapshot
+    se zapisuje do dočasného adresáře a přejmenuje se až celý, souběžně
+    startující procesy tedy nikdy nenačtou rozepsaný snapshot.
+
+    Pickle se načítá bez ověření, adresář cache proto musí být zapisovatelný
+    jen pro službu.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Inicializace snapshotu.
+
+        Args:
+            directory: Adresář cache
+        """
+        self.directory = Path(directory)
+
+    def get_fingerprint(self, models: List[Dict[str, str]], languages: List[str]) -> str:
+        """
+        Spočte otisk konfigurace, pro kterou snapshot platí.
+
+        Args:
+            models: Konfigurace spaCy modelů (lang_code, model_name)
+            languages: Jazyky registru rozpoznávačů
+
+        Returns:
+            Hex SHA-256 otisk
+        """
+        from src.detection.recognizers.declarative import DEFAULT_RECOGNIZER_DEFINITIONS
+
+        parts = {
+            "format": SNAPSHOT_FORMAT,
+            "python": platform.python_version(),
+            "models": models,
+            "languages": languages,
+            # Rozpoznávače v registru odkazují na nakonfigurované indexy a tabulky
+            "facility_gazetteer": get_index_identity(DEFAULT_FACILITY_GAZETTEER),
+            "address_index": get_index_identity(DEFAULT_ADDRESS_INDEX),
+            "diagnosis_table": get_index_identity(DEFAULT_DIAGNOSIS_TABLE),
+            "recognizer_definitions": get_index_identity(DEFAULT_RECOGNIZER_DEFINITIONS),
+        }
+        for package in _FINGERPRINT_PACKAGES:
+            try:
+                parts[package] = version(package)
+            except PackageNotFoundError:
+                parts[package] = "unknown"
+        # Nová verze modelu se stejným názvem musí snapshot zneplatnit
+        parts["model_versions"] = {model["model_name"]: _get_model_version(model["model_name"]) for model in models}
+
+        digest = hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8"))
+        sources = list(_RECOGNIZERS_DIR.glob("*.py")) + list(_RECOGNIZERS_DIR.glob("*.json"))
+        for source in sorted(sources):
+            digest.update(source.name.encode("utf-8"))
+            digest.update(source.read_bytes())
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str) -> Optional[Tuple[List[Dict[str, str]], RecognizerRegistry]]:
+        """
+        Načte snapshot pro daný otisk.
+
+        Args:
+            fingerprint: Otisk z get_fingerprint
+
+        Returns:
+            Dvojice (konfigurace modelů s cestami ke snapshotu, registr
+            rozpoznávačů), nebo None, pokud snapshot neexistuje či je poškozený
+        """
+        snapshot_dir = self.directory / fingerprint[:16]
+        metadata_path = snapshot_dir / _METADATA_FILE
+        if not metadata_path.exists():
+            return None
+
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            if metadata.get("fingerprint") != fingerprint:
+                return None
+
+            models = [
+                {"lang_code": lang_code, "model_name": str(snapshot_dir / _SPACY_DIR / lang_code)}
+                for lang_code in metadata["languages"]
+            ]
+            with open(snapshot_dir / _REGISTRY_FILE, "rb") as f:
+                registry = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Engine snapshot {snapshot_dir} could not be loaded: {str(e)}")
+            return None
+
+        logger.info(f"Loaded engine snapshot from {snapshot_dir}")
+        return models, registry
+
+    def save(self, fingerprint: str, nlp_engine: SpacyNlpEngine, registry: RecognizerRegistry) -> Optional[Path]:
+        """
+        Uloží snapshot (chyba zápisu start služby nepřeruší).
+
+        Args:
+            fingerprint: Otisk z get_fingerprint
+            nlp_engine: NLP engine s načtenými, dosud neupravenými modely
+            registry: Registr rozpoznávačů před obalením měřením
+
+        Returns:
+            Adresář snapshotu, nebo None, pokud se ho nepodařilo uložit
+        """
+        snapshot_dir = self.directory / fingerprint[:16]
+        if (snapshot_dir / _METADATA_FILE).exists():
+            return snapshot_dir
+
+        temp_dir = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_dir = Path(tempfile.mkdtemp(prefix=".snapshot-", dir=self.directory))
+
+            (temp_dir / _SPACY_DIR).mkdir()
+            for lang_code, nlp in nlp_engine.nlp.items():
+                nlp.to_disk(temp_dir / _SPACY_DIR / lang_code)
+            with open(temp_dir / _REGISTRY_FILE, "wb") as f:
+                pickle.dump(registry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(temp_dir / _METADATA_FILE, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": fingerprint, "languages": list(nlp_engine.nlp)}, f)
+
+            os.rename(temp_dir, snapshot_dir)
+            temp_dir = None
+        except OSError as e:
+            # Snapshot mezitím uložil jiný proces
+            if (snapshot_dir / _METADATA_FILE).exists():
+                return snapshot_dir
+            logger.warning(f"Engine snapshot could not be saved to {snapshot_dir}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.warning(f"Engine snapshot could not be saved to {snapshot_dir}: {str(e)}")
+            return None
+        finally:
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+        logger.info(f"Saved engine snapshot to {snapshot_dir}")
+        return snapshot_dir
+
+
+def _get_model_version(model_name: str) -> str:
+    """
+    Zjistí verzi spaCy modelu (balíčku nebo adresáře s meta.json).
+
+    Args:
+        model_name: Název balíčku modelu nebo cesta k modelu
+
+    Returns:
+        Verze modelu, nebo "unknown"
+    """
+    meta_path = Path(model_name) / "meta.json"
+    if meta_path.is_file():
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return str(json.load(f).get("version", "unknown"))
+        except (OSError, ValueError):
+            return "unknown"
+    try:
+        return version(model_name)
+    except PackageNotFoundError:
+        return "unknown"
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from presidio_analyzer.nlp_engine import NlpArtifacts, SpacyNlpEngine
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Komponenta doplněná do pipeline pro profily, které potřebují věty bez parseru
+SENTENCIZER = "sentencizer"
+
+# Profily spaCy pipeline (název -> komponenty, které se spouští; None = všechny
+# komponenty modelu). Tokenizer běží vždy, tok2vec se přidá automaticky,
+# pokud na něm spuštěná komponenta závisí.
+# - full: celý model (tagger, parser, lemmatizer, NER)
+# - ner: jen NER a věty z pravidlového sentencizeru (bez lemmat a slovních druhů,
+#   kontext standardních rozpoznávačů Presidia se pak hodnotí bez lemmat)
+# - tokens: tokeny a věty (bez entit - nehledají se jména, místa ani zařízení)
+# - blank: jen tokenizer
+NLP_PROFILES = {
+    "full": None,
+    "ner": ("ner", SENTENCIZER),
+    "tokens": (SENTENCIZER,),
+    "blank": (),
+}
+
+# Výchozí profil nasazení (lze změnit pro jednotlivý požadavek)
+DEFAULT_NLP_PROFILE = os.environ.get("ANONYMIZER_NLP_PROFILE", "full")
+
+# Profily povolené v nasazení; komponenty, které žádný z nich nepotřebuje,
+# se z pipeline odstraní (úspora paměti)
+ENABLED_NLP_PROFILES = [
+    profile.strip()
+    for profile in os.environ.get("ANONYMIZER_NLP_PROFILES", ",".join(NLP_PROFILES)).split(",")
+    if profile.strip()
+]
+
+
+class NlpProfiles:
+    """
+    Spouštění spaCy pipeline Presidia podle zvoleného profilu.
+
+    Komponenty mimo profil se při volání vypínají (nlp(text, disable=...)),
+    sdílený model se tedy nemění a profily lze střídat mezi požadavky
+    i souběžně z více vláken.
+    """
+
+    def __init__(
+        self,
+        nlp_engine: SpacyNlpEngine,
+        enabled_profiles: Optional[List[str]] = None,
+        default_profile: str = DEFAULT_NLP_PROFILE
+    ):
+        """
+        Inicializace profilů a úprava načtených pipeline.
+
+        Args:
+            nlp_engine: NLP engine Presidia s načtenými spaCy modely
+            enabled_profiles: Povolené profily (výchozí: ENABLED_NLP_PROFILES)
+            default_profile: Výchozí profil
+
+        Raises:
+            ValueError: Pokud profil neexistuje nebo výchozí profil není povolen
+        """
+        enabled_profiles = list(enabled_profiles if enabled_profiles is not None else ENABLED_NLP_PROFILES)
+        for profile in enabled_profiles + [default_profile]:
+            if profile not in NLP_PROFILES:
+                raise ValueError(f"Unknown NLP profile: {profile}")
+        if default_profile not in enabled_profiles:
+            raise ValueError(f"Default NLP profile {default_profile} is not enabled")
+
+        self.nlp_engine = nlp_engine
+        self.enabled_profiles = enabled_profiles
+        self.default_profile = default_profile
+
+        # Vypínané komponenty pro každý jazyk a profil
+        self._disabled: Dict[str, Dict[str, List[str]]] = {}
+        for language, nlp in nlp_engine.nlp.items():
+            self._disabled[language] = self._prepare_pipeline(nlp)
+            logger.info(
+                f"NLP pipeline for {language}: {nlp.pipe_names}, "
+                f"profiles: {self.enabled_profiles} (default: {self.default_profile})"
+            )
+
+    def resolve(self, profile: Optional[str] = None) -> str:
+        """
+        Ověří profil požadavku.
+
+        Args:
+            profile: Požadovaný profil, None = výchozí profil nasazení
+
+        Returns:
+            Název profilu
+
+        Raises:
+            ValueError: Pokud profil neexistuje nebo není v nasazení povolen
+        """
+        if profile is None:
+            return self.default_profile
+        if profile not in self.enabled_profiles:
+            raise ValueError(f"Unsupported NLP profile: {profile} (enabled: {', '.join(self.enabled_profiles)})")
+        return profile
+
+    def process_text(self, text: str, language: str, profile: Optional[str] = None) -> NlpArtifacts:
+        """
+        Zpracuje text pipeline zvoleného profilu.
+
+        Args:
+            text: Text ke zpracování
+            language: Jazyk textu
+            profile: Profil, None = výchozí
+
+        Returns:
+            NLP artefakty
+        """
+        disabled = self._disabled[language][self.resolve(profile)]
+        doc = self.nlp_engine.nlp[language](text, disable=disabled)
+        return self.nlp_engine._doc_to_nlp_artifact(doc, language)
+
+    def process_batch(
+        self,
+        texts: List[str],
+        language: str,
+        batch_size: int = 50,
+        profile: Optional[str] = None
+    ) -> List[NlpArtifacts]:
+        """
+        Zpracuje více textů jedním průchodem nlp.pipe.
+
+        Args:
+            texts: Texty ke zpracování
+            language: Jazyk textů
+            batch_size: Velikost dávky pro nlp.pipe
+            profile: Profil, None = výchozí
+
+        Returns:
+            NLP artefakty ve stejném pořadí jako texty
+        """
+        disabled = self._disabled[language][self.resolve(profile)]
+        docs = self.nlp_engine.nlp[language].pipe(texts, batch_size=batch_size, disable=disabled)
+        return [self.nlp_engine._doc_to_nlp_artifact(doc, language) for doc in docs]
+
+    def _prepare_pipeline(self, nlp) -> Dict[str, List[str]]:
+        """
+        Upraví pipeline pro povolené profily a spočte vypínané komponenty.
+
+        Komponenty, které žádný povolený profil nepoužívá, se odstraní;
+        pokud některý profil potřebuje věty bez parseru, přidá se sentencizer.
+
+        Args:
+            nlp: spaCy pipeline (Language)
+
+        Returns:
+            Slovník profil -> seznam vypínaných komponent
+        """
+        model_components = [name for name in nlp.pipe_names if name != SENTENCIZER]
+        model_has_sentencizer = SENTENCIZER in nlp.pipe_names
+
+        kept_by_profile = {}
+        for profile in self.enabled_profiles:
+            components = NLP_PROFILES[profile]
+            if components is None:
+                kept = set(nlp.pipe_names)
+            else:
+                kept = {name for name in components if name in model_components or name == SENTENCIZER}
+                # Sdílené tok2vec musí běžet, pokud na něm spuštěná komponenta závisí
+                for name in model_components:
+                    listeners = getattr(nlp.get_pipe(name), "listening_components", None) or []
+                    if kept.intersection(listeners):
+                        kept.add(name)
+            kept_by_profile[profile] = kept
+
+        used = set().union(*kept_by_profile.values())
+        for name in model_components:
+            if name not in used:
+                nlp.remove_pipe(name)
+        if SENTENCIZER in used and not model_has_sentencizer:
+            nlp.add_pipe(SENTENCIZER, last=True)
+
+        disabled = {}
+        for profile, kept in kept_by_profile.items():
+            # Doplněný sentencizer v plném profilu neběží (přepsal by věty z parseru)
+            disabled[profile] = [name for name in nlp.pipe_names if name not in kept]
+        return disabled
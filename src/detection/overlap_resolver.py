@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerResult
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Priorita typů entit při překryvu (vyšší vyhrává, při shodě rozhoduje skóre).
+# Validovaná rodná čísla mají přednost před číslem pojištěnce ve stejném
+# formátu, přesné identifikátory před širokými okny adres a zařízení.
+DEFAULT_ENTITY_PRIORITIES = {
+    "CZECH_BIRTH_NUMBER": 100,
+    "CZECH_HEALTH_INSURANCE_NUMBER": 90,
+    "CZECH_ICO": 85,
+    "CZECH_ICP": 85,
+    "EMAIL_ADDRESS": 80,
+    "PHONE_NUMBER": 80,
+    "CZECH_DIAGNOSIS_CODE": 70,
+    "PERSON": 60,
+    "CZECH_MEDICAL_FACILITY": 40,
+    "CZECH_ADDRESS": 30,
+    "LOCATION": 20,
+}
+
+# Priorita typů, které v tabulce nejsou
+DEFAULT_PRIORITY = 50
+
+# Klíč metadat výsledku s přesným rozsahem (např. shoda s gazetteerem)
+EXACT_MATCH_KEY = "exact_match"
+
+# Klíč metadat odhadnutého rozsahu s pozicí (start, end) textu, kolem kterého
+# okno vzniklo (např. klíčové slovo zařízení nebo PSČ)
+ANCHOR_KEY = "anchor"
+
+# Úprava tabulky pro nasazení - JSON objekt {"TYP_ENTITY": priorita}
+ENTITY_PRIORITIES = {
+    **DEFAULT_ENTITY_PRIORITIES,
+    **json.loads(os.environ.get("ANONYMIZER_ENTITY_PRIORITIES", "{}")),
+}
+
+
+class OverlapResolver:
+    """
+    Řešení překryvů výsledků rozpoznávačů nad seřazenými intervaly.
+
+    Překrývající se výsledky stejného typu se sloučí do jednoho rozsahu.
+    Mezi různými typy má přednost vyšší priorita (pak vyšší skóre a delší
+    rozsah); výsledek s nižší prioritou si ponechá jen části, které vyšší
+    výsledky nepokrývají. Sjednocení pokrytého textu se tím nemění, takže
+    se anonymizuje stejný text jako dříve, jen bez duplicitních rozsahů.
+    Přesné výsledky (metadata EXACT_MATCH_KEY) mají přednost před
+    odhadnutými rozsahy stejného typu a nesloučí se s nimi. Odhadnuté okno
+    se zahodí jen tehdy, když jeho kotva (ANCHOR_KEY) leží uvnitř přesného
+    rozsahu; jinak si ponechá části, které přesný rozsah nepokrývá.
+    Složitost je O(n log n): po seřazení se každý elementární úsek mezi
+    hranicemi výsledků přidělí jen jednou (union-find nad úseky).
+    """
+
+    def __init__(self, priorities: Optional[Dict[str, int]] = None, default_priority: int = DEFAULT_PRIORITY):
+        """
+        Inicializace resolveru.
+
+        Args:
+            priorities: Priority typů entit (výchozí: ENTITY_PRIORITIES)
+            default_priority: Priorita typů, které v tabulce nejsou
+        """
+        self.priorities = priorities if priorities is not None else ENTITY_PRIORITIES
+        self.default_priority = default_priority
+
+    def get_priority(self, entity_type: str) -> int:
+        """
+        Vrátí prioritu typu entity.
+
+        Args:
+            entity_type: Typ entity
+
+        Returns:
+            Priorita
+        """
+        return self.priorities.get(entity_type, self.default_priority)
+
+    def resolve(self, results: List[RecognizerResult], text: Optional[str] = None) -> List[RecognizerResult]:
+        """
+        Odstraní překryvy mezi výsledky.
+
+        Args:
+            results: Výsledky analyzeru
+            text: Analyzovaný text; pokud je zadán, zbytky zkrácených rozsahů
+                se oříznou o okrajové mezery a interpunkci (zbytek bez písmen
+                a číslic, např. samotná čárka mezi dvěma entitami, se zahodí)
+
+        Returns:
+            Výsledky bez překryvů seřazené podle pozice
+        """
+        if len(results) < 2:
+            return list(results)
+
+        merged = self._merge_same_type(self._drop_superseded(results))
+        ordered = sorted(
+            merged,
+            key=lambda result: (
+                -self.get_priority(result.entity_type),
+                not _is_exact(result),
+                -result.score,
+                result.start - result.end,
+                result.start,
+            ),
+        )
+
+        # Elementární úseky mezi hranicemi všech výsledků; next_free[i] vede
+        # na první úsek od i, který ještě nemá výsledek s vyšší prioritou
+        # (union-find s kompresí cest, každý úsek se přidělí jen jednou)
+        bounds = sorted({position for result in ordered for position in (result.start, result.end)})
+        bound_index = {position: i for i, position in enumerate(bounds)}
+        next_free = list(range(len(bounds)))
+
+        def find_free(i: int) -> int:
+            root = i
+            while next_free[root] != root:
+                root = next_free[root]
+            while next_free[i] != root:
+                next_free[i], i = root, next_free[i]
+            return root
+
+        resolved = []
+        for result in ordered:
+            last = bound_index[result.end]
+
+            # Volné úseky rozsahu výsledku, sousední se spojí do fragmentů
+            fragments = []
+            i = find_free(bound_index[result.start])
+            while i < last:
+                if fragments and fragments[-1][1] == bounds[i]:
+                    fragments[-1] = (fragments[-1][0], bounds[i + 1])
+                else:
+                    fragments.append((bounds[i], bounds[i + 1]))
+                next_free[i] = i + 1
+                i = find_free(i + 1)
+
+            for start, end in fragments:
+                if (start, end) == (result.start, result.end):
+                    resolved.append(result)
+                    continue
+                if text is not None:
+                    # Zbytek zkráceného rozsahu bez okrajových mezer a interpunkce
+                    while start < end and not text[start].isalnum():
+                        start += 1
+                    while end > start and not text[end - 1].isalnum():
+                        end -= 1
+                    if start == end:
+                        continue
+                resolved.append(self._copy_result(result, start, end))
+
+        resolved.sort(key=lambda result: (result.start, result.end))
+        return resolved
+
+    def _drop_superseded(self, results: List[RecognizerResult]) -> List[RecognizerResult]:
+        """
+        Zahodí odhadnuté výsledky, jejichž kotva leží v přesném výsledku stejného typu.
+
+        Okno bez kotvy nebo s kotvou mimo přesné rozsahy se nezahodí,
+        přesný rozsah z něj vykrojí až řazení podle priority.
+
+        Args:
+            results: Výsledky analyzeru
+
+        Returns:
+            Výsledky bez nahrazených odhadů
+        """
+        exact_spans: Dict[str, List[tuple]] = {}
+        for result in results:
+            if _is_exact(result):
+                exact_spans.setdefault(result.entity_type, []).append((result.start, result.end))
+        if not exact_spans:
+            return results
+
+        # Přesné rozsahy stejného typu se sloučí, aby konce zůstaly seřazené
+        merged_spans: Dict[str, tuple] = {}
+        for entity_type, spans in exact_spans.items():
+            starts: List[int] = []
+            ends: List[int] = []
+            for start, end in sorted(spans):
+                if ends and start < ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            merged_spans[entity_type] = (starts, ends)
+
+        kept = []
+        for result in results:
+            spans = merged_spans.get(result.entity_type)
+            anchor = (result.recognition_metadata or {}).get(ANCHOR_KEY)
+            if spans is not None and anchor is not None and not _is_exact(result):
+                starts, ends = spans
+                anchor_start, anchor_end = anchor
+                i = bisect.bisect_right(starts, anchor_start) - 1
+                if i >= 0 and anchor_end <= ends[i]:
+                    continue
+            kept.append(result)
+        return kept
+
+    def _merge_same_type(self, results: List[RecognizerResult]) -> List[RecognizerResult]:
+        """
+        Sloučí překrývající se výsledky stejného typu.
+
+        Přesné a odhadnuté výsledky se slučují zvlášť, aby přesný rozsah
+        neprodloužilo okno, které přesahuje.
+
+        Args:
+            results: Výsledky analyzeru
+
+        Returns:
+            Výsledky, ve kterých se rozsahy stejného typu nepřekrývají
+        """
+        merged = []
+        current = None
+        for result in sorted(
+            results, key=lambda result: (result.entity_type, _is_exact(result), result.start, -result.end)
+        ):
+            if (
+                current is not None
+                and result.entity_type == current.entity_type
+                and _is_exact(result) == _is_exact(current)
+                and result.start < current.end
+            ):
+                if result.end > current.end or result.score > current.score:
+                    best = result if result.score > current.score else current
+                    current = self._copy_result(best, current.start, max(current.end, result.end))
+                continue
+            if current is not None:
+                merged.append(current)
+            current = result
+        merged.append(current)
+        return merged
+
+    def _copy_result(self, result: RecognizerResult, start: int, end: int) -> RecognizerResult:
+        """
+        Vytvoří kopii výsledku s jiným rozsahem.
+
+        Args:
+            result: Původní výsledek
+            start: Nový začátek
+            end: Nový konec
+
+        Returns:
+            Nový výsledek
+        """
+        from presidio_analyzer import RecognizerResult
+
+        return RecognizerResult(
+            entity_type=result.entity_type,
+            start=start,
+            end=end,
+            score=result.score,
+            analysis_explanation=result.analysis_explanation,
+            recognition_metadata=result.recognition_metadata,
+        )
+
+
+def _is_exact(result: RecognizerResult) -> bool:
+    """Zjistí, zda má výsledek přesný rozsah (metadata EXACT_MATCH_KEY)."""
+    return bool((result.recognition_metadata or {}).get(EXACT_MATCH_KEY))
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerResult
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Velikost cache odstavců, pokud limit neurčí volající
+PARAGRAPH_CACHE_SIZE_BYTES = 32 * 1024 * 1024
+
+# Paměťový limit cache odstavců služby v bajtech. Analýza po odstavcích je
+# volitelná (výchozí 0 = vypnuta), protože mění detekci: kontext a okna
+# rozpoznávačů nepřekročí prázdný řádek.
+DEFAULT_PARAGRAPH_CACHE_BYTES = int(os.environ.get("ANONYMIZER_PARAGRAPH_CACHE_BYTES", "0"))
+
+# Hranice odstavce: prázdný řádek (případně s mezerami)
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t\r\f\v]*\n\s*")
+
+# Odhad paměti záznamu a jednoho výsledku (objekty, klíč, metadata)
+_ENTRY_OVERHEAD_BYTES = 256
+_RESULT_OVERHEAD_BYTES = 320
+
+
+class Paragraph(NamedTuple):
+    """
+    Odstavec textu s pozicí v celém dokumentu.
+    """
+    start: int
+    end: int
+
+
+def split_into_paragraphs(text: str) -> List[Paragraph]:
+    """
+    Rozdělí text na odstavce oddělené prázdnými řádky.
+
+    Bílé znaky mezi odstavci do žádného odstavce nepatří; text bez
+    prázdného řádku je jeden odstavec.
+
+    Args:
+        text: Text k rozdělení
+
+    Returns:
+        Seznam neprázdných odstavců
+    """
+    paragraphs = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        if text[start:match.start()].strip():
+            paragraphs.append(Paragraph(start, match.start()))
+        start = match.end()
+    if text[start:].strip():
+        paragraphs.append(Paragraph(start, len(text)))
+    return paragraphs
+
+
+class ParagraphCache:
+    """
+    LRU cache výsledků analyzeru pro jednotlivé odstavce.
+
+    Propouštěcí zprávy a laboratorní výsledky opakují doslova celé bloky
+    (hlavičky zařízení, právní patičky, standardní nálezy). Výsledky
+    odstavce se ukládají s pozicemi relativně k odstavci pod hashem jeho
+    textu a konfigurace analýzy; při zásahu se posunou na pozici odstavce
+    v novém dokumentu. Cache je omezena odhadovanou velikostí záznamů.
+    """
+
+    def __init__(self, max_bytes: int = PARAGRAPH_CACHE_SIZE_BYTES):
+        """
+        Inicializace cache.
+
+        Args:
+            max_bytes: Maximální odhadovaná velikost uložených výsledků v bajtech
+        """
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, Tuple[Tuple[RecognizerResult, ...], int]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(paragraph_text: str, language: str, entities: Optional[List[str]], nlp_profile: Optional[str]) -> str:
+        """
+        Vytvoří klíč z textu odstavce a konfigurace analýzy.
+
+        Args:
+            paragraph_text: Text odstavce
+            language: Jazyk analýzy
+            entities: Požadované typy entit, None = všechny
+            nlp_profile: Profil spaCy pipeline
+
+        Returns:
+            Hex SHA-256 klíč
+        """
+        config = f"{language}\0{nlp_profile}\0{','.join(sorted(entities)) if entities is not None else '*'}"
+        digest = hashlib.sha256()
+        digest.update(config.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(paragraph_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, offset: int) -> Optional[List[RecognizerResult]]:
+        """
+        Vrátí uložené výsledky odstavce posunuté na jeho pozici v dokumentu.
+
+        Args:
+            key: Klíč z make_key
+            offset: Pozice začátku odstavce v dokumentu
+
+        Returns:
+            Nové výsledky s pozicemi v dokumentu, nebo None při výpadku
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return [_rebase(result, offset) for result in entry[0]]
+
+    def put(self, key: str, results: List[RecognizerResult], offset: int) -> None:
+        """
+        Uloží výsledky odstavce a podle potřeby vyřadí nejstarší záznamy.
+
+        Args:
+            key: Klíč z make_key
+            results: Výsledky s pozicemi v dokumentu
+            offset: Pozice začátku odstavce v dokumentu
+        """
+        size = _ENTRY_OVERHEAD_BYTES + len(key) + _RESULT_OVERHEAD_BYTES * len(results)
+        if size > self.max_bytes:
+            return
+
+        # Výsledky se ukládají jako kopie, volající je může dál měnit
+        stored = tuple(_rebase(result, -offset) for result in results)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = (stored, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Vrátí statistiky cache.
+
+        Returns:
+            Slovník s počty zásahů, výpadků, vyřazení a velikostí cache
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Odstraní záznam (volající drží zámek)."""
+        _, size = self.entries.pop(key)
+        self.current_bytes -= size
+
+
+def _rebase(result: RecognizerResult, offset: int) -> RecognizerResult:
+    """
+    Vytvoří kopii výsledku posunutou o offset.
+
+    Args:
+        result: Výsledek analyzeru
+        offset: Posun pozic
+
+    Returns:
+        Nový výsledek
+    """
+    from presidio_analyzer import RecognizerResult
+
+    return RecognizerResult(
+        entity_type=result.entity_type,
+        start=result.start + offset,
+        end=result.end + offset,
+        score=result.score,
+        analysis_explanation=result.analysis_explanation,
+        recognition_metadata=result.recognition_metadata,
+    )
@@ -0,0 +1,116 @@
+import logging
+import re
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Znakové rysy dokumentu hledané jedním průchodem textu:
+# - digit_run: alespoň 6 číslic za sebou (rodné číslo, číslo pojištěnce)
+# - upper_digit: velké písmeno následované číslicí (kód MKN-10)
+# - digit: jakákoli číslice (PSČ, číslo popisné, telefon)
+# - at_sign: zavináč (e-mail)
+FEATURE_PATTERN = re.compile(r"(?P<digit_run>\d{6})|(?P<upper_digit>[A-Z]\d)|(?P<digit>\d+)|(?P<at_sign>@)")
+
+# Rysy, které nalezený rys zároveň implikuje
+IMPLIED_FEATURES = {
+    "digit_run": ("digit",),
+    "upper_digit": ("digit",),
+}
+
+CHARACTER_FEATURES = frozenset(FEATURE_PATTERN.groupindex)
+
+# Rysy potřebné standardními rozpoznávači Presidia (bez číslice nebo zavináče
+# nemohou nic najít); rozpoznávače, které tu nejsou, běží vždy
+PREDEFINED_RECOGNIZER_FEATURES = {
+    "CreditCardRecognizer": ("digit",),
+    "UsBankRecognizer": ("digit",),
+    "UsItinRecognizer": ("digit",),
+    "UsPassportRecognizer": ("digit",),
+    "UsSsnRecognizer": ("digit",),
+    "NhsRecognizer": ("digit",),
+    "IbanRecognizer": ("digit",),
+    "PhoneRecognizer": ("digit",),
+    "EmailRecognizer": ("at_sign",),
+}
+
+
+class DocumentPrefilter:
+    """
+    Levný předfiltr dokumentu před spuštěním rozpoznávačů.
+
+    Jedním průchodem textu zjistí znakové rysy (běhy číslic, velké písmeno
+    s číslicí, zavináč) a výskyty registrovaných klíčových slov. Rozpoznávač
+    deklaruje potřebné rysy atributem required_features a přeskočí se,
+    pokud v dokumentu některý z nich chybí. Rysy jsou jen nutnou podmínkou
+    shody, takže přeskočení nemění výsledky.
+    """
+
+    def __init__(self):
+        """Inicializace předfiltru."""
+        # Rys klíčového slova -> klíčová slova (malými písmeny)
+        self.keyword_features: Dict[str, Tuple[str, ...]] = {}
+
+    def register_keywords(self, feature: str, keywords: Iterable[str]) -> None:
+        """
+        Zaregistruje rys, který je přítomen, pokud text obsahuje některé z klíčových slov.
+
+        Args:
+            feature: Název rysu
+            keywords: Klíčová slova (porovnávají se bez ohledu na velikost písmen)
+        """
+        existing = self.keyword_features.get(feature, ())
+        self.keyword_features[feature] = tuple(dict.fromkeys(existing + tuple(keyword.lower() for keyword in keywords)))
+
+    def get_required_features(self, recognizer) -> Optional[FrozenSet[str]]:
+        """
+        Vrátí rysy, které rozpoznávač potřebuje.
+
+        Args:
+            recognizer: Rozpoznávač Presidia
+
+        Returns:
+            Potřebné rysy, nebo None, pokud rozpoznávač běží vždy
+        """
+        required = getattr(recognizer, "required_features", None)
+        if required is None:
+            required = PREDEFINED_RECOGNIZER_FEATURES.get(type(recognizer).__name__)
+        if not required:
+            return None
+
+        unknown = set(required) - CHARACTER_FEATURES - set(self.keyword_features)
+        if unknown:
+            logger.warning(f"Recognizer {type(recognizer).__name__} requires unknown features {sorted(unknown)}, prefilter disabled for it")
+            return None
+        return frozenset(required)
+
+    def compute_features(self, text: str) -> FrozenSet[str]:
+        """
+        Zjistí rysy dokumentu.
+
+        Args:
+            text: Text dokumentu
+
+        Returns:
+            Množina přítomných rysů
+        """
+        features = set()
+        for match in FEATURE_PATTERN.finditer(text):
+            feature = match.lastgroup
+            if feature not in features:
+                features.add(feature)
+                features.update(IMPLIED_FEATURES.get(feature, ()))
+                if len(features) == len(CHARACTER_FEATURES):
+                    break
+
+        if self.keyword_features:
+            lowered = text.lower()
+            for feature, keywords in self.keyword_features.items():
+                if any(keyword in lowered for keyword in keywords):
+                    features.add(feature)
+
+        return frozenset(features)
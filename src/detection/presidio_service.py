@@ -1,14 +1,37 @@
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Union
+import threading
+import time
+from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
-from presidio_analyzer.nlp_engine import NlpEngineProvider
-from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
-from presidio_analyzer.analyzer_engine import RecognizerResult
+# Presidio a spaCy se importují až při vytvoření služby, import modulu
+# (CLI, testy, start API před zahřátím) je tak levný
+if TYPE_CHECKING:
+    from presidio_analyzer.analyzer_engine import RecognizerResult
+    from presidio_analyzer.nlp_engine import NlpArtifacts
 
 from src.common.models import Document, AnonymizedDocument, DetectedEntity, AnonymizedEntity
-from src.detection.recognizers.czech_registry import CzechRecognizerRegistry
+from src.detection.chunking import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CHUNK_WORKERS,
+    Chunk,
+    merge_chunk_results,
+    split_into_chunks,
+)
+from src.detection.engine_snapshot import DEFAULT_SNAPSHOT_DIR, EngineSnapshot
+from src.detection.nlp_profiles import DEFAULT_NLP_PROFILE, NlpProfiles
+from src.detection.overlap_resolver import OverlapResolver
+from src.detection.paragraph_cache import DEFAULT_PARAGRAPH_CACHE_BYTES, ParagraphCache, split_into_paragraphs
+from src.detection.prefilter import DocumentPrefilter
+from src.detection.recognizers.diagnosis_codes import DEFAULT_DIAGNOSIS_TABLE
+from src.detection.recognizers.name_index import DEFAULT_ADDRESS_INDEX, DEFAULT_FACILITY_GAZETTEER, get_index_identity
 
 # Nastavení loggeru
 logging.basicConfig(
@@ -17,30 +40,129 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Drahé fáze, které lze při vyčerpaném časovém rozpočtu vynechat, a fáze,
+# ze kterých se odhaduje jejich cena
+DEGRADABLE_STAGES = {
+    "nlp": "nlp",
+    "facility_scan": "recognizer:CzechMedicalFacilityRecognizer",
+    "address_scan": "recognizer:CzechAddressRecognizer",
+}
+
+# Entity, které fáze prohledávání hledají (fáze bez požadované entity se neřeší)
+STAGE_ENTITIES = {
+    "facility_scan": "CZECH_MEDICAL_FACILITY",
+    "address_scan": "CZECH_ADDRESS",
+}
+
+# Fáze se vynechá, pokud zbývající rozpočet nepokryje násobek odhadované ceny
+DEADLINE_SAFETY_FACTOR = 1.5
+
+# Váha nového měření v klouzavém průměru ceny fáze
+STAGE_COST_SMOOTHING = 0.2
+
+# Malý vestavěný český korpus pro zahřátí enginu při startu
+WARMUP_CORPUS = [
+    "Pacient Jan Novák, rodné číslo 760506/1234, narozen 6.5.1976, bytem Dlouhá 123, Praha 1, 110 00, "
+    "byl přijat do Fakultní nemocnice v Motole s diagnózou J45.0 (Astma). "
+    "Číslo pojištěnce: 7605061234, pojišťovna: 111.",
+    "Pacientka Marie Svobodová, r.č. 895623/1234, bytem náměstí Míru 45, Brno, 602 00, "
+    "byla odeslána do Nemocnice Na Bulovce k vyšetření. "
+    "Diagnóza: C50.1, E11.9. Kontakt: svobodova@email.cz, tel: +420 777 888 999.",
+    "Výsledky laboratorního vyšetření pacienta Jiří Kučera (760812/5566), "
+    "bytem Lipová 789, Plzeň, 301 00. Diagnóza: E10.5. "
+    "Vyšetření provedeno v Centrální laboratoři FN Plzeň dne 5.4.2025.",
+]
+
 class PresidioService:
     """
     Služba pro anonymizaci dokumentů pomocí Microsoft Presidio.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        chunk_workers: int = DEFAULT_CHUNK_WORKERS,
+        nlp_profiles: Optional[List[str]] = None,
+        default_nlp_profile: str = DEFAULT_NLP_PROFILE,
+        paragraph_cache: Optional[ParagraphCache] = None,
+        paragraph_cache_bytes: int = DEFAULT_PARAGRAPH_CACHE_BYTES,
+        snapshot_dir: Optional[str] = DEFAULT_SNAPSHOT_DIR
+    ):
         """
         Inicializace služby Presidio.
+        
+        Args:
+            chunk_size: Délka textu ve znacích, od které se analyzuje po částech (0 = nikdy)
+            chunk_overlap: Překryv sousedních částí ve znacích
+            chunk_workers: Počet vláken pro souběžnou analýzu částí
+            nlp_profiles: Povolené profily spaCy pipeline (výchozí: ANONYMIZER_NLP_PROFILES)
+            default_nlp_profile: Výchozí profil spaCy pipeline
+            paragraph_cache: Sdílená cache výsledků odstavců (přednost před paragraph_cache_bytes)
+            paragraph_cache_bytes: Limit vlastní cache odstavců v bajtech (0 = analýza celých dokumentů)
+            snapshot_dir: Adresář cache pro snapshot enginu (spaCy modely a registr
+                rozpoznávačů); None = engine se vždy sestaví znovu
         """
-        # Inicializace NLP enginu (spaCy)
+        from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+        from presidio_analyzer.nlp_engine import NlpEngineProvider
+        from presidio_anonymizer import AnonymizerEngine
+        from src.detection.recognizers.czech_registry import CzechRecognizerRegistry
+        
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_workers = chunk_workers
+        
+        # Cache výsledků opakujících se odstavců (hlavičky, patičky, standardní nálezy)
+        if paragraph_cache is None and paragraph_cache_bytes > 0:
+            paragraph_cache = ParagraphCache(paragraph_cache_bytes)
+        self.paragraph_cache = paragraph_cache
+        
         # Použití pouze anglického modelu jako fallback, protože český model není dostupný pro spaCy 3.8.7
+        models = [{"lang_code": "en", "model_name": "en_core_web_sm"}]
+        
+        # Předpřipravený snapshot (spaCy modely a registr rozpoznávačů) z adresáře cache
+        snapshot = EngineSnapshot(snapshot_dir) if snapshot_dir else None
+        fingerprint = snapshot.get_fingerprint(models, ["en"]) if snapshot else None
+        snapshot_content = snapshot.load(fingerprint) if snapshot else None
+        if snapshot_content is not None:
+            models, self.registry = snapshot_content
+        
+        # Inicializace NLP enginu (spaCy)
         nlp_configuration = {
             "nlp_engine_name": "spacy",
-            "models": [
-                {"lang_code": "en", "model_name": "en_core_web_sm"}
-            ]
+            "models": models
         }
         self.nlp_engine = NlpEngineProvider(nlp_configuration=nlp_configuration).create_engine()
         
-        # Inicializace registru rozpoznávačů
-        self.registry = RecognizerRegistry()
+        if snapshot_content is None:
+            # Inicializace registru rozpoznávačů (standardní rozpoznávače Presidia)
+            self.registry = RecognizerRegistry()
+            self.registry.load_predefined_recognizers(nlp_engine=self.nlp_engine, languages=["en"])
+            
+            # Registrace specializovaných českých rozpoznávačů pod jazykem NLP enginu,
+            # jinak by je analyzer při analýze v angličtině vůbec nespustil
+            CzechRecognizerRegistry.register_czech_recognizers(self.registry, supported_language="en")
+            
+            # Uložení snapshotu (před úpravou pipeline profily a obalením rozpoznávačů)
+            if snapshot is not None:
+                snapshot.save(fingerprint, self.nlp_engine, self.registry)
+        
+        # Profily pipeline (nepoužívané komponenty se vypínají nebo odstraňují)
+        self.nlp_profiles = NlpProfiles(self.nlp_engine, nlp_profiles, default_nlp_profile)
         
-        # Registrace specializovaných českých rozpoznávačů
-        CzechRecognizerRegistry.register_czech_recognizers(self.registry)
+        # Předfiltr dokumentu (rozpoznávače bez potřebných rysů se přeskočí)
+        self.prefilter = DocumentPrefilter()
+        
+        # Stav právě zpracovávaného dokumentu (doby fází, vynechané fáze,
+        # přeskočené rozpoznávače) zvlášť pro každé vlákno
+        self._document_state = threading.local()
+        self._instrument_recognizers()
+        
+        # Průběžný odhad ceny drahých fází v ms na znak (pro časové rozpočty)
+        self._stage_costs: Dict[str, float] = {}
+        
+        # Plán analýzy podle požadovaných entit (zda je potřeba spaCy)
+        self._nlp_plans: Dict[Optional[tuple], bool] = {}
         
         # Inicializace analyzeru
         self.analyzer = AnalyzerEngine(
@@ -51,32 +173,93 @@ class PresidioService:
         # Inicializace anonymizeru
         self.anonymizer = AnonymizerEngine()
         
+        # Řešení překryvů výsledků před anonymizací (tabulka priorit typů entit)
+        self.overlap_resolver = OverlapResolver()
+        
+        # Verze enginu (mění se s verzí knihoven a modelu, slouží např. jako součást klíče cache)
+        self.engine_version = self._get_engine_version()
+        
+        # Stav připravenosti (nastavuje se po zahřátí)
+        self.is_ready = False
+        self.warmup_ms: Optional[float] = None
+        
         logger.info("Presidio service initialized with English model (fallback) and Czech recognizers")
     
-    def analyze_text(self, text: str, language: str = "en") -> List[DetectedEntity]:
+    def warm_up(self, corpus: Optional[List[str]] = None) -> float:
+        """
+        Zahřeje engine zpracováním malého korpusu.
+        
+        První průchod načítá líně inicializované části spaCy a rozpoznávačů,
+        takže první skutečný požadavek už neplatí za jejich načtení.
+        
+        Args:
+            corpus: Texty pro zahřátí (výchozí: vestavěný český korpus)
+            
+        Returns:
+            Doba zahřátí v ms
+        """
+        corpus = corpus if corpus is not None else WARMUP_CORPUS
+        
+        start_time = time.time()
+        for i, text in enumerate(corpus):
+            self.process_document(Document(id=f"warmup-{i}", content=text))
+        self.warmup_ms = (time.time() - start_time) * 1000
+        self.is_ready = True
+        
+        logger.info(f"Presidio service warmed up on {len(corpus)} documents in {self.warmup_ms:.1f} ms")
+        return self.warmup_ms
+    
+    def analyze_text(
+        self,
+        text: str,
+        language: str = "en",
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+        deadline: Optional[float] = None,
+        entities: Optional[List[str]] = None,
+        nlp_profile: Optional[str] = None
+    ) -> List[DetectedEntity]:
         """
         Analyzuje text a detekuje entity.
         
+        Pokud žádný z rozpoznávačů požadovaných entit nepotřebuje výstup NLP
+        (např. jen rodná čísla, čísla pojištěnců a kódy diagnóz), spaCy se
+        vůbec nespouští.
+        
+        Se zapnutou cache odstavců se text analyzuje po odstavcích a NLP
+        i rozpoznávače běží jen nad odstavci, které v cache nejsou.
+        
+        Při zadaném termínu se drahé fáze (spaCy NER, prohledávání vět kvůli
+        zdravotnickým zařízením, prohledávání tokenů kvůli adresám) vynechají,
+        pokud by se do zbývajícího času nevešly. Vzorové rozpoznávače běží vždy.
+        
         Args:
             text: Text k analýze
             language: Jazyk textu (výchozí: angličtina jako fallback)
+            nlp_artifacts: Předem spočtené NLP artefakty (např. z nlp.pipe);
+                pokud chybí, spaCy se spustí nad textem
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí profil nasazení
             
         Returns:
             Seznam detekovaných entit
         """
         logger.info(f"Analyzing text (length: {len(text)}) using language: {language}")
         
-        # Seznam entit k detekci (standardní + české specializované)
-        entities = None  # Všechny podporované entity
+        # Dlouhé texty se analyzují po částech, aby paměť ani limit spaCy
+        # (max_length) nezávisely na délce dokumentu
+        if nlp_artifacts is None and self.paragraph_cache is not None:
+            results = self._analyze_paragraphs(text, language, deadline, entities, nlp_profile)
+        elif nlp_artifacts is None and 0 < self.chunk_size < len(text):
+            results = self._analyze_chunked(text, language, deadline, entities, nlp_profile)
+        else:
+            results = self._analyze(text, language, nlp_artifacts, deadline, entities, nlp_profile)
         
-        # Analýza textu pomocí Presidio Analyzer
-        results = self.analyzer.analyze(
-            text=text,
-            language=language,
-            entities=entities,
-            allow_list=None,
-            score_threshold=0.3  # Nižší práh pro vyšší recall
-        )
+        # Překrývající se výsledky (stejná čísla jako rodné číslo i číslo
+        # pojištěnce, okna adres) se sloučí nebo zkrátí podle priorit
+        start_time = time.perf_counter()
+        results = self.overlap_resolver.resolve(results, text)
+        self._record_stage("overlap_resolution", start_time)
         
         # Konverze výsledků na DetectedEntity
         detected_entities = []
@@ -94,6 +277,232 @@ class PresidioService:
         logger.info(f"Detected {len(detected_entities)} entities")
         return detected_entities, results  # Vracíme i původní výsledky pro anonymizaci
     
+    def _analyze(
+        self,
+        text: str,
+        language: str,
+        nlp_artifacts: Optional[NlpArtifacts],
+        deadline: Optional[float],
+        entities: Optional[List[str]],
+        nlp_profile: Optional[str] = None
+    ) -> List[RecognizerResult]:
+        """
+        Spustí NLP a rozpoznávače nad jedním textem (celým dokumentem nebo jeho částí).
+        
+        Args:
+            text: Text k analýze
+            language: Jazyk textu
+            nlp_artifacts: Předem spočtené NLP artefakty, nebo None
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+            
+        Returns:
+            Výsledky analyzeru
+        """
+        # NLP zpracování (spaCy) jako samostatně měřená fáze
+        if nlp_artifacts is None:
+            if not self.requires_nlp(entities, language):
+                nlp_artifacts = self._get_empty_nlp_artifacts(language)
+            elif self._is_over_budget("nlp", len(text), deadline):
+                nlp_artifacts = self._get_degraded_nlp_artifacts(language)
+            else:
+                start_time = time.perf_counter()
+                nlp_artifacts = self.nlp_profiles.process_text(text, language, nlp_profile)
+                self._record_stage("nlp", start_time)
+        
+        # Rozhodnutí o drahých prohledáváních až po NLP, se zbývajícím rozpočtem
+        skipped_stages = getattr(nlp_artifacts, "skipped_stages", set())
+        for stage, entity_type in STAGE_ENTITIES.items():
+            if entities is not None and entity_type not in entities:
+                continue
+            if stage not in skipped_stages and self._is_over_budget(stage, len(text), deadline):
+                skipped_stages.add(stage)
+        nlp_artifacts.skipped_stages = skipped_stages
+        
+        # Rysy textu pro předfiltr rozpoznávačů (jeden průchod textem)
+        start_time = time.perf_counter()
+        nlp_artifacts.document_features = self.prefilter.compute_features(text)
+        self._record_stage("prefilter", start_time)
+        
+        # Jako omezené se hlásí jen vynechané fáze, které se týkají požadovaných entit
+        degraded_stages = getattr(self._document_state, "degraded", None)
+        if degraded_stages is not None:
+            degraded_stages.update(
+                stage for stage in skipped_stages
+                if entities is None or STAGE_ENTITIES.get(stage) in (None, *entities)
+            )
+        
+        # Analýza textu pomocí Presidio Analyzer
+        start_time = time.perf_counter()
+        results = self.analyzer.analyze(
+            text=text,
+            language=language,
+            entities=entities,
+            allow_list=None,
+            score_threshold=0.3,  # Nižší práh pro vyšší recall
+            nlp_artifacts=nlp_artifacts
+        )
+        self._record_stage("analysis", start_time)
+        
+        return results
+
+    def _analyze_paragraphs(
+        self,
+        text: str,
+        language: str,
+        deadline: Optional[float],
+        entities: Optional[List[str]],
+        nlp_profile: Optional[str] = None
+    ) -> List[RecognizerResult]:
+        """
+        Analyzuje text po odstavcích s využitím cache odstavců.
+        
+        Odstavce nalezené v cache se převezmou s posunutými pozicemi, ostatní
+        se analyzují samostatně (dlouhé po částech) a uloží se, pokud jejich
+        analýza nebyla kvůli termínu omezena.
+        
+        Args:
+            text: Text k analýze
+            language: Jazyk textu
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+            
+        Returns:
+            Výsledky analyzeru s pozicemi v celém textu
+        """
+        nlp_profile = self.nlp_profiles.resolve(nlp_profile)
+        usage = getattr(self._document_state, "paragraph_cache", None)
+        
+        results = []
+        for paragraph in split_into_paragraphs(text):
+            paragraph_text = text[paragraph.start:paragraph.end]
+            key = self.paragraph_cache.make_key(paragraph_text, language, entities, nlp_profile)
+            cached_results = self.paragraph_cache.get(key, paragraph.start)
+            if cached_results is not None:
+                results.extend(cached_results)
+                if usage is not None:
+                    usage["hits"] += 1
+                continue
+            
+            if usage is not None:
+                usage["misses"] += 1
+            
+            # Vynechané fáze odstavce se sledují zvlášť, omezené výsledky se neukládají
+            outer_degraded = getattr(self._document_state, "degraded", None)
+            self._document_state.degraded = set()
+            try:
+                if 0 < self.chunk_size < len(paragraph_text):
+                    paragraph_results = self._analyze_chunked(paragraph_text, language, deadline, entities, nlp_profile)
+                else:
+                    paragraph_results = self._analyze(paragraph_text, language, None, deadline, entities, nlp_profile)
+                paragraph_degraded = self._document_state.degraded
+            finally:
+                self._document_state.degraded = outer_degraded
+            if outer_degraded is not None:
+                outer_degraded.update(paragraph_degraded)
+            
+            for result in paragraph_results:
+                result.start += paragraph.start
+                result.end += paragraph.start
+            if not paragraph_degraded:
+                self.paragraph_cache.put(key, paragraph_results, paragraph.start)
+            results.extend(paragraph_results)
+        
+        return results
+    
+    def _analyze_chunked(
+        self,
+        text: str,
+        language: str,
+        deadline: Optional[float],
+        entities: Optional[List[str]],
+        nlp_profile: Optional[str] = None
+    ) -> List[RecognizerResult]:
+        """
+        Analyzuje dlouhý text po částech s překryvem a sloučí výsledky.
+        
+        Args:
+            text: Text k analýze
+            language: Jazyk textu
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+            
+        Returns:
+            Výsledky analyzeru s pozicemi v celém textu
+        """
+        chunks = split_into_chunks(text, self.chunk_size, self.chunk_overlap)
+        logger.info(f"Analyzing text in {len(chunks)} chunks")
+        
+        def analyze_chunk(chunk: Chunk):
+            return chunk, self._analyze_chunk(text[chunk.start:chunk.end], language, deadline, entities, nlp_profile)
+        
+        if self.chunk_workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.chunk_workers) as executor:
+                analyzed_chunks = list(executor.map(analyze_chunk, chunks))
+        else:
+            analyzed_chunks = [analyze_chunk(chunk) for chunk in chunks]
+        
+        # Doby a vynechané fáze jednotlivých částí se přičtou k dokumentu
+        chunk_results = []
+        stages = getattr(self._document_state, "stages", None)
+        degraded_stages = getattr(self._document_state, "degraded", None)
+        skipped_recognizers = getattr(self._document_state, "skipped_recognizers", None)
+        for chunk, (results, chunk_stages, chunk_degraded, chunk_skipped) in analyzed_chunks:
+            chunk_results.append((chunk, results))
+            if stages is not None:
+                for stage, duration_ms in chunk_stages.items():
+                    stages[stage] = stages.get(stage, 0.0) + duration_ms
+            if degraded_stages is not None:
+                degraded_stages.update(chunk_degraded)
+            if skipped_recognizers is not None:
+                for recognizer, count in chunk_skipped.items():
+                    skipped_recognizers[recognizer] = skipped_recognizers.get(recognizer, 0) + count
+        
+        return merge_chunk_results(chunk_results)
+    
+    def _analyze_chunk(
+        self,
+        text: str,
+        language: str,
+        deadline: Optional[float],
+        entities: Optional[List[str]],
+        nlp_profile: Optional[str] = None
+    ) -> tuple:
+        """
+        Analyzuje jednu část textu s vlastním stavem měření (i v jiném vlákně).
+        
+        Args:
+            text: Text části
+            language: Jazyk textu
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí
+            
+        Returns:
+            Čtveřice (výsledky analyzeru, doby fází, vynechané fáze, přeskočené rozpoznávače)
+        """
+        outer_stages = getattr(self._document_state, "stages", None)
+        outer_degraded = getattr(self._document_state, "degraded", None)
+        outer_skipped = getattr(self._document_state, "skipped_recognizers", None)
+        self._document_state.stages = {}
+        self._document_state.degraded = set()
+        self._document_state.skipped_recognizers = {}
+        try:
+            results = self._analyze(text, language, None, deadline, entities, nlp_profile)
+            return (
+                results,
+                self._document_state.stages,
+                self._document_state.degraded,
+                self._document_state.skipped_recognizers,
+            )
+        finally:
+            self._document_state.stages = outer_stages
+            self._document_state.degraded = outer_degraded
+            self._document_state.skipped_recognizers = outer_skipped
+    
     def anonymize_text(
         self, 
         text: str, 
@@ -114,10 +523,12 @@ class PresidioService:
         logger.info(f"Anonymizing text with {len(entities)} entities")
         
         # Anonymizace textu s použitím původních výsledků analyzeru
+        start_time = time.perf_counter()
         anonymized_result = self.anonymizer.anonymize(
             text=text,
             analyzer_results=analyzer_results
         )
+        self._record_stage("anonymization", start_time)
         
         # Vytvoření seznamu anonymizovaných entit
         anonymized_entities = []
@@ -134,20 +545,50 @@ class PresidioService:
         logger.info(f"Text anonymized successfully")
         return anonymized_result.text, anonymized_entities
     
-    def process_document(self, document: Document) -> AnonymizedDocument:
+    def process_document(
+        self,
+        document: Document,
+        nlp_artifacts: Optional[NlpArtifacts] = None,
+        deadline: Optional[float] = None,
+        entities: Optional[List[str]] = None,
+        nlp_profile: Optional[str] = None
+    ) -> AnonymizedDocument:
         """
         Zpracuje dokument - detekuje entity a anonymizuje text.
         
         Args:
             document: Dokument ke zpracování
+            nlp_artifacts: Předem spočtené NLP artefakty dokumentu
+            deadline: Termín dokončení analýzy (time.monotonic), None = bez omezení
+            entities: Požadované typy entit, None = všechny podporované
+            nlp_profile: Profil spaCy pipeline, None = výchozí profil nasazení
             
         Returns:
-            Anonymizovaný dokument
+            Anonymizovaný dokument (vynechané fáze jsou ve statistics["degraded_stages"],
+            počty rozpoznávačů přeskočených předfiltrem ve statistics["skipped_recognizers"],
+            zásahy a výpadky cache odstavců ve statistics["paragraph_cache"])
+            
+        Raises:
+            ValueError: Pokud profil spaCy pipeline není povolen
         """
         logger.info(f"Processing document: {document.id}")
+        nlp_profile = self.nlp_profiles.resolve(nlp_profile)
+        
+        start_time = time.perf_counter()
+        self._document_state.stages = {}
+        self._document_state.degraded = set()
+        self._document_state.skipped_recognizers = {}
+        self._document_state.paragraph_cache = {"hits": 0, "misses": 0}
         
         # Detekce entit - použití angličtiny jako fallback
-        detected_entities, analyzer_results = self.analyze_text(document.content, language="en")
+        detected_entities, analyzer_results = self.analyze_text(
+            document.content,
+            language="en",
+            nlp_artifacts=nlp_artifacts,
+            deadline=deadline,
+            entities=entities,
+            nlp_profile=nlp_profile
+        )
         
         # Anonymizace textu
         anonymized_text, anonymized_entities = self.anonymize_text(
@@ -156,6 +597,16 @@ class PresidioService:
             analyzer_results
         )
         
+        stage_timings = self._document_state.stages
+        degraded_stages = sorted(self._document_state.degraded)
+        skipped_recognizers = self._document_state.skipped_recognizers
+        paragraph_cache_usage = self._document_state.paragraph_cache
+        self._document_state.stages = None
+        self._document_state.degraded = None
+        self._document_state.skipped_recognizers = None
+        self._document_state.paragraph_cache = None
+        self._update_stage_costs(stage_timings, len(document.content), skipped_stages=degraded_stages)
+        
         # Vytvoření anonymizovaného dokumentu
         anonymized_document = AnonymizedDocument(
             content=anonymized_text,
@@ -166,13 +617,341 @@ class PresidioService:
             statistics={
                 "total_entities_detected": len(detected_entities),
                 "entities_by_type": self._count_entities_by_type(detected_entities),
-                "processing_time_ms": 0  # Toto by mělo být měřeno
+                "processing_time_ms": (time.perf_counter() - start_time) * 1000,
+                "stage_timings_ms": stage_timings,
+                "degraded_stages": degraded_stages,
+                "skipped_recognizers": skipped_recognizers,
+                "paragraph_cache": paragraph_cache_usage,
+                "nlp_profile": nlp_profile,
             }
         )
         
         logger.info(f"Document processed successfully")
         return anonymized_document
     
+    def process_documents(
+        self,
+        documents: List[Document],
+        batch_size: int = 50,
+        deadlines: Optional[List[Optional[float]]] = None,
+        requested_entities: Optional[List[Optional[List[str]]]] = None,
+        requested_nlp_profiles: Optional[List[Optional[str]]] = None
+    ) -> List[AnonymizedDocument]:
+        """
+        Zpracuje více dokumentů najednou.
+        
+        spaCy zpracuje všechny texty v jednom průchodu přes nlp.pipe, české
+        rozpoznávače a anonymizer pak dostanou hotové NLP artefakty.
+        Dokumenty, jejichž požadované entity NLP nepotřebují, dlouhé dokumenty
+        (analyzované po částech) a se zapnutou cache odstavců dokumenty z více
+        odstavců se do průchodu nezařazují; dokumenty, jejichž termín by
+        průchod nestihl, jdou bez NLP. Dokumenty s různými profily spaCy
+        pipeline se zpracují v samostatných průchodech.
+        
+        Args:
+            documents: Dokumenty ke zpracování
+            batch_size: Velikost dávky pro nlp.pipe
+            deadlines: Termíny jednotlivých dokumentů (time.monotonic), None = bez omezení
+            requested_entities: Požadované typy entit jednotlivých dokumentů, None = všechny
+            requested_nlp_profiles: Profily spaCy pipeline jednotlivých dokumentů, None = výchozí
+            
+        Returns:
+            Anonymizované dokumenty ve stejném pořadí jako vstup
+            
+        Raises:
+            ValueError: Pokud profil spaCy pipeline není povolen
+        """
+        logger.info(f"Processing batch of {len(documents)} documents")
+        
+        deadlines = deadlines or [None] * len(documents)
+        requested_entities = requested_entities or [None] * len(documents)
+        nlp_profiles = [self.nlp_profiles.resolve(profile) for profile in requested_nlp_profiles or [None] * len(documents)]
+        
+        # Do nlp.pipe jdou dokumenty, které NLP potřebují, dokud odhadovaná
+        # délka průchodu stihne termíny všech zařazených dokumentů
+        nlp_indices = []
+        over_budget_indices = set()
+        nlp_length = 0
+        earliest_deadline = None
+        for i, (document, deadline) in enumerate(zip(documents, deadlines)):
+            if not self.requires_nlp(requested_entities[i]):
+                continue
+            if 0 < self.chunk_size < len(document.content):
+                # Dlouhý dokument se analyzuje po částech mimo společný průchod
+                continue
+            if self.paragraph_cache is not None and len(split_into_paragraphs(document.content)) > 1:
+                # Dokument z více odstavců jde přes cache odstavců, NLP
+                # se spustí jen nad odstavci, které v ní nejsou
+                continue
+            candidate_deadline = earliest_deadline
+            if deadline is not None:
+                candidate_deadline = deadline if earliest_deadline is None else min(earliest_deadline, deadline)
+            if self._is_over_budget("nlp", nlp_length + len(document.content), candidate_deadline):
+                over_budget_indices.add(i)
+                continue
+            nlp_indices.append(i)
+            nlp_length += len(document.content)
+            earliest_deadline = candidate_deadline
+        
+        # Jeden průchod nlp.pipe pro každý použitý profil
+        nlp_artifacts_by_index = {}
+        start_time = time.perf_counter()
+        for profile in dict.fromkeys(nlp_profiles[i] for i in nlp_indices):
+            profile_indices = [i for i in nlp_indices if nlp_profiles[i] == profile]
+            texts = [documents[i].content for i in profile_indices]
+            nlp_results = self.nlp_profiles.process_batch(texts, "en", batch_size=batch_size, profile=profile)
+            nlp_artifacts_by_index.update(zip(profile_indices, nlp_results))
+        nlp_ms = (time.perf_counter() - start_time) * 1000
+        total_length = nlp_length or 1
+        
+        anonymized_documents = []
+        for i, (document, deadline, entities) in enumerate(zip(documents, deadlines, requested_entities)):
+            # Dokumenty mimo společný průchod zpracuje analyze_text samo
+            # (bez NLP, po částech), jen vynechání kvůli termínu se označí
+            nlp_artifacts = nlp_artifacts_by_index.get(i)
+            if i in over_budget_indices:
+                nlp_artifacts = self._get_degraded_nlp_artifacts("en")
+            anonymized_document = self.process_document(
+                document,
+                nlp_artifacts=nlp_artifacts,
+                deadline=deadline,
+                entities=entities,
+                nlp_profile=nlp_profiles[i]
+            )
+            
+            # Čas nlp.pipe se dokumentům přiřadí úměrně jejich délce
+            if i in nlp_artifacts_by_index:
+                document_nlp_ms = nlp_ms * len(document.content) / total_length
+                anonymized_document.statistics["stage_timings_ms"]["nlp"] = document_nlp_ms
+                anonymized_document.statistics["processing_time_ms"] += document_nlp_ms
+            anonymized_documents.append(anonymized_document)
+        
+        if nlp_indices:
+            self._update_stage_costs({"nlp": nlp_ms}, nlp_length)
+        
+        logger.info(f"Batch of {len(documents)} documents processed successfully")
+        return anonymized_documents
+    
+    def _instrument_recognizers(self) -> None:
+        """
+        Obalí analyze() rozpoznávačů předfiltrem a českých rozpoznávačů i měřením doby běhu.
+        
+        Doba se zapisuje jako fáze "recognizer:<třída>" do statistik
+        právě zpracovávaného dokumentu. Rozpoznávač, kterému v dokumentu
+        chybí některý z potřebných rysů, se nespustí a započítá se do
+        přeskočených rozpoznávačů.
+        """
+        for recognizer in self.registry.recognizers:
+            for feature, keywords in getattr(recognizer, "feature_keywords", {}).items():
+                self.prefilter.register_keywords(feature, keywords)
+        
+        for recognizer in self.registry.recognizers:
+            timed = type(recognizer).__module__.startswith("src.detection.recognizers")
+            required_features = self.prefilter.get_required_features(recognizer)
+            if not timed and required_features is None:
+                continue
+            
+            def instrumented_analyze(
+                text,
+                entities,
+                nlp_artifacts=None,
+                *args,
+                _analyze=recognizer.analyze,
+                _name=getattr(recognizer, "recognizer_id", type(recognizer).__name__),
+                _timed=timed,
+                _required=required_features,
+                **kwargs
+            ):
+                document_features = getattr(nlp_artifacts, "document_features", None)
+                if _required is not None and document_features is not None and not _required <= document_features:
+                    skipped_recognizers = getattr(self._document_state, "skipped_recognizers", None)
+                    if skipped_recognizers is not None:
+                        skipped_recognizers[_name] = skipped_recognizers.get(_name, 0) + 1
+                    return []
+                
+                start_time = time.perf_counter()
+                try:
+                    return _analyze(text, entities, nlp_artifacts, *args, **kwargs)
+                finally:
+                    if _timed:
+                        self._record_stage(f"recognizer:{_name}", start_time)
+            
+            recognizer.analyze = functools.wraps(recognizer.analyze)(instrumented_analyze)
+    
+    def _is_over_budget(self, stage: str, text_length: int, deadline: Optional[float]) -> bool:
+        """
+        Zjistí, zda se drahá fáze nevejde do zbývajícího času.
+        
+        Args:
+            stage: Název fáze (klíč DEGRADABLE_STAGES)
+            text_length: Délka zpracovávaného textu
+            deadline: Termín (time.monotonic), None = bez omezení
+            
+        Returns:
+            True, pokud má být fáze vynechána
+        """
+        if deadline is None:
+            return False
+        
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        estimated_ms = self._stage_costs.get(stage, 0.0) * text_length
+        return remaining_ms <= 0 or remaining_ms < estimated_ms * DEADLINE_SAFETY_FACTOR
+    
+    def _update_stage_costs(
+        self,
+        stage_timings: Dict[str, float],
+        text_length: int,
+        skipped_stages: Optional[List[str]] = None
+    ) -> None:
+        """
+        Aktualizuje odhad ceny drahých fází podle naměřených dob.
+        
+        Args:
+            stage_timings: Naměřené doby fází v ms
+            text_length: Délka zpracovaného textu
+            skipped_stages: Vynechané fáze (jejich doba neodpovídá plné ceně)
+        """
+        if text_length <= 0:
+            return
+        
+        for stage, timing_stage in DEGRADABLE_STAGES.items():
+            if timing_stage not in stage_timings or stage in (skipped_stages or ()):
+                continue
+            cost = stage_timings[timing_stage] / text_length
+            previous = self._stage_costs.get(stage)
+            self._stage_costs[stage] = cost if previous is None else (
+                previous + STAGE_COST_SMOOTHING * (cost - previous)
+            )
+    
+    def get_supported_entities(self, language: str = "en") -> List[str]:
+        """
+        Vrátí typy entit, které lze požadovat.
+        
+        Args:
+            language: Jazyk analýzy
+            
+        Returns:
+            Seřazený seznam typů entit
+        """
+        return sorted(self.analyzer.get_supported_entities(language=language))
+    
+    def requires_nlp(self, entities: Optional[List[str]] = None, language: str = "en") -> bool:
+        """
+        Zjistí, zda některý z rozpoznávačů požadovaných entit potřebuje NLP artefakty.
+        
+        Rozpoznávače deklarují potřebu atributem requires_nlp_artifacts;
+        rozpoznávače bez něj (např. standardní rozpoznávače Presidia, které
+        využívají lemmata pro kontext) se považují za závislé na NLP.
+        
+        Args:
+            entities: Požadované typy entit, None = všechny podporované
+            language: Jazyk analýzy
+            
+        Returns:
+            True, pokud je potřeba spustit spaCy
+        """
+        plan_key = tuple(sorted(entities)) if entities is not None else None
+        requires = self._nlp_plans.get(plan_key)
+        if requires is None:
+            recognizers = self.registry.get_recognizers(
+                language=language,
+                entities=entities,
+                all_fields=entities is None,
+            )
+            requires = any(getattr(recognizer, "requires_nlp_artifacts", True) for recognizer in recognizers)
+            self._nlp_plans[plan_key] = requires
+        return requires
+    
+    def _get_empty_nlp_artifacts(self, language: str) -> NlpArtifacts:
+        """
+        Vytvoří prázdné NLP artefakty pro analýzu bez spaCy.
+        
+        Args:
+            language: Jazyk textu
+            
+        Returns:
+            NLP artefakty bez tokenů a entit
+        """
+        from presidio_analyzer.nlp_engine import NlpArtifacts
+        
+        return NlpArtifacts(
+            entities=[],
+            tokens=None,
+            tokens_indices=[],
+            lemmas=[],
+            nlp_engine=self.nlp_engine,
+            language=language,
+        )
+    
+    def _get_degraded_nlp_artifacts(self, language: str) -> NlpArtifacts:
+        """
+        Vytvoří prázdné NLP artefakty pro analýzu, ve které bylo NLP vynecháno kvůli termínu.
+        
+        Bez tokenů a entit se přeskočí i fáze, které na výstupu NLP závisí.
+        
+        Args:
+            language: Jazyk textu
+            
+        Returns:
+            NLP artefakty bez tokenů a entit
+        """
+        nlp_artifacts = self._get_empty_nlp_artifacts(language)
+        nlp_artifacts.skipped_stages = set(DEGRADABLE_STAGES)
+        return nlp_artifacts
+    
+    def _record_stage(self, stage: str, start_time: float) -> None:
+        """
+        Přičte dobu fáze ke statistikám právě zpracovávaného dokumentu.
+        
+        Args:
+            stage: Název fáze
+            start_time: Začátek fáze (time.perf_counter)
+        """
+        stages = getattr(self._document_state, "stages", None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0.0) + (time.perf_counter() - start_time) * 1000
+    
+    def _get_engine_version(self) -> str:
+        """
+        Sestaví identifikátor verze enginu z verzí knihoven a spaCy modelu.
+        
+        Returns:
+            Identifikátor verze enginu
+        """
+        parts = ["meddocai-0.1.0"]
+        for package in ["presidio-analyzer", "presidio-anonymizer"]:
+            try:
+                parts.append(f"{package}-{version(package)}")
+            except PackageNotFoundError:
+                parts.append(f"{package}-unknown")
+        
+        for lang_code, nlp in (getattr(self.nlp_engine, "nlp", None) or {}).items():
+            parts.append(f"{lang_code}:{nlp.meta.get('name', 'unknown')}-{nlp.meta.get('version', 'unknown')}")
+        
+        # Výchozí profil mění výsledky požadavků, které profil neuvádějí
+        parts.append(f"nlp-profile:{self.nlp_profiles.default_profile}")
+        
+        # Stejně tak tabulka priorit pro řešení překryvů
+        priorities = json.dumps(self.overlap_resolver.priorities, sort_keys=True)
+        parts.append(f"priorities:{hashlib.sha256(priorities.encode('utf-8')).hexdigest()[:12]}")
+        
+        # Indexy jmen (gazetteer zařízení, adresy), tabulka kódů MKN-10 a další
+        # definice rozpoznávačů - jejich obsah mění výsledky
+        from src.detection.recognizers.declarative import DEFAULT_RECOGNIZER_DEFINITIONS
+        
+        indexes = [
+            ("facility-gazetteer", DEFAULT_FACILITY_GAZETTEER),
+            ("address-index", DEFAULT_ADDRESS_INDEX),
+            ("diagnosis-table", DEFAULT_DIAGNOSIS_TABLE),
+            ("recognizer-definitions", DEFAULT_RECOGNIZER_DEFINITIONS),
+        ]
+        for name, path in indexes:
+            identity = get_index_identity(path)
+            if identity is not None:
+                parts.append(f"{name}:{hashlib.sha256(identity.encode('utf-8')).hexdigest()[:12]}")
+        
+        return ";".join(parts)
+    
     def _get_context(self, text: str, start: int, end: int, window: int = 20) -> str:
         """
         Získá kontext kolem entity.
@@ -0,0 +1,132 @@
+import logging
+import os
+from typing import List, Sequence
+
+import numpy as np
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Od kolika kandidátů se vyplatí vektorová validace (pod tímto počtem
+# převáží režie vytvoření pole nad validací po jednom)
+VECTORIZED_VALIDATION_MIN = int(os.environ.get("ANONYMIZER_VECTORIZED_VALIDATION_MIN", "32"))
+
+# Váhy číslic prvních devíti pozic (hodnota devítimístného čísla)
+_POWERS_OF_TEN = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+
+
+def is_valid_birth_number(birth_number: str) -> bool:
+    """
+    Ověří, zda je rodné číslo validní.
+
+    Args:
+        birth_number: Rodné číslo k ověření
+
+    Returns:
+        True, pokud je rodné číslo validní, jinak False
+    """
+    # Odstranění lomítka, pokud existuje
+    birth_number = birth_number.replace("/", "")
+
+    # Kontrola délky
+    if len(birth_number) not in [9, 10]:
+        return False
+
+    # Kontrola formátu YY, MM, DD
+    try:
+        int(birth_number[0:2])  # rok (jen kontrola formátu)
+        month = int(birth_number[2:4])
+        day = int(birth_number[4:6])
+
+        # Kontrola měsíce (1-12 pro muže, 51-62 pro ženy)
+        if not ((1 <= month <= 12) or (51 <= month <= 62)):
+            return False
+
+        # Kontrola dne (1-31)
+        if not (1 <= day <= 31):
+            return False
+
+        # Kontrola modulo 11 pro rodná čísla po roce 1954
+        if len(birth_number) == 10:
+            # Kontrolní číslice je poslední číslice
+            number = int(birth_number[:9])
+            check_digit = int(birth_number[9])
+
+            # Kontrola modulo 11
+            if number % 11 != check_digit:
+                # Speciální případ pro modulo 10
+                if number % 11 == 10 and check_digit == 0:
+                    return True
+                return False
+
+        return True
+    except ValueError:
+        return False
+
+
+def validate_birth_numbers(birth_numbers: Sequence[str]) -> List[bool]:
+    """
+    Ověří najednou všechny kandidáty na rodné číslo (z dokumentu i celé dávky).
+
+    Kandidáti stejné délky se převedou na pole číslic a rozsahy měsíce
+    (včetně +50 u žen) a dne i kontrola modulo 11 se spočtou vektorově.
+    Kandidáti s jinými než ASCII číslicemi nebo neobvyklou délkou se ověří
+    po jednom, takže výsledek je vždy shodný s is_valid_birth_number.
+
+    Args:
+        birth_numbers: Kandidáti na rodné číslo
+
+    Returns:
+        Výsledek validace pro každého kandidáta ve stejném pořadí
+    """
+    valid = [False] * len(birth_numbers)
+    by_length = {9: ([], []), 10: ([], [])}
+    for i, birth_number in enumerate(birth_numbers):
+        digits = birth_number.replace("/", "")
+        if len(digits) in by_length and digits.isascii() and digits.isdigit():
+            indices, values = by_length[len(digits)]
+            indices.append(i)
+            values.append(digits)
+        else:
+            valid[i] = is_valid_birth_number(birth_number)
+
+    for length, (indices, values) in by_length.items():
+        if not indices:
+            continue
+
+        digits = (
+            np.frombuffer("".join(values).encode("ascii"), dtype=np.uint8).reshape(len(values), length).astype(np.int64)
+            - ord("0")
+        )
+        month = digits[:, 2] * 10 + digits[:, 3]
+        day = digits[:, 4] * 10 + digits[:, 5]
+        is_valid = (((month >= 1) & (month <= 12)) | ((month >= 51) & (month <= 62))) & (day >= 1) & (day <= 31)
+
+        if length == 10:
+            remainder = (digits[:, :9] @ _POWERS_OF_TEN) % 11
+            check_digit = digits[:, 9]
+            is_valid &= (remainder == check_digit) | ((remainder == 10) & (check_digit == 0))
+
+        for i, result in zip(indices, is_valid.tolist()):
+            valid[i] = result
+
+    return valid
+
+
+def validate_birth_number_candidates(birth_numbers: Sequence[str]) -> List[bool]:
+    """
+    Ověří všechny kandidáty dokumentu (při velkém počtu vektorově).
+
+    Args:
+        birth_numbers: Kandidáti na rodné číslo
+
+    Returns:
+        Výsledek validace pro každého kandidáta
+    """
+    if len(birth_numbers) >= VECTORIZED_VALIDATION_MIN:
+        return validate_birth_numbers(birth_numbers)
+    return [is_valid_birth_number(birth_number) for birth_number in birth_numbers]
@@ -0,0 +1,169 @@
+import logging
+import re
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Vzory kandidátů sdílené českými rozpoznávači (název typu -> (znaky, kterými
+# může shoda začínat, regulární výraz)); každý vzor začíná hranicí slova
+# a první skupina vzoru je hodnota kandidáta
+CANDIDATE_PATTERNS = {
+    # Rodné číslo i číslo pojištěnce mají stejný formát
+    "birth_number": (r"\d", r"\b(\d{6}/?[0-9]{3,4})\b"),
+    "diagnosis_code": (r"A-Z", r"\b([A-Z][0-9]{2}(\.[0-9]{1,2})?)\b"),
+    "zip_code": (r"0-9", r"\b([0-9]{3}\s?[0-9]{2})\b"),
+}
+
+
+class Candidate(NamedTuple):
+    """
+    Kandidát na entitu nalezený skenerem.
+    """
+    kind: str
+    start: int
+    end: int
+    value: str
+
+
+class CandidateScanner:
+    """
+    Jednoprůchodový skener kandidátů pro české rozpoznávače.
+
+    Text se prochází jednou výrazem, který hledá jen možné začátky shod
+    (znak, kterým může začínat některý vzor, na hranici slova). Díky tomu,
+    že výraz začíná třídou znaků, přeskakuje regex engine ostatní text
+    rychle. Na nalezených pozicích se ukotveně ověří jen vzory, které daným
+    znakem mohou začínat, se stejnou sémantikou jako samostatné finditer
+    (nepřekrývající se shody každého vzoru zvlášť). Výsledek posledního
+    textu se pamatuje pro každé vlákno, takže rozpoznávače analyzující
+    stejný text skenují jen jednou.
+    """
+
+    def __init__(self, patterns: Dict[str, Tuple[str, str]] = None):
+        """
+        Inicializace skeneru.
+
+        Args:
+            patterns: Vzory kandidátů (výchozí: CANDIDATE_PATTERNS)
+        """
+        self.definitions = dict(patterns or CANDIDATE_PATTERNS)
+        self._compile()
+
+    def _compile(self) -> None:
+        """Sestaví výrazy skeneru z definic vzorů."""
+        self.patterns = {kind: re.compile(pattern) for kind, (_, pattern) in self.definitions.items()}
+        self.start_chars = {kind: re.compile(f"[{start_chars}]") for kind, (start_chars, _) in self.definitions.items()}
+
+        # Možný začátek shody: povolený znak, před kterým není znak slova
+        start_class = "".join(start_chars for start_chars, _ in self.definitions.values())
+        self.start_regex = re.compile(f"[{start_class}](?<!\\w[{start_class}])")
+
+        self._kinds_by_char: Dict[str, Tuple[str, ...]] = {}
+        self._last_scan = threading.local()
+
+    def add_patterns(self, patterns: Dict[str, Tuple[str, str]]) -> None:
+        """
+        Přidá vzory kandidátů (např. z deklarativních definic rozpoznávačů).
+
+        Nové vzory se skenují ve stejném jediném průchodu textem. Volá se
+        při startu, před analýzou prvního dokumentu.
+
+        Args:
+            patterns: Vzory ve formátu CANDIDATE_PATTERNS
+
+        Raises:
+            ValueError: Pokud typ kandidáta už existuje s jiným vzorem
+        """
+        for kind, definition in patterns.items():
+            existing = self.definitions.get(kind)
+            if existing is not None and tuple(existing) != tuple(definition):
+                raise ValueError(f"Candidate kind {kind} is already defined with a different pattern")
+
+        new_patterns = {kind: tuple(definition) for kind, definition in patterns.items() if kind not in self.definitions}
+        if new_patterns:
+            self.definitions.update(new_patterns)
+            self._compile()
+
+    def __getstate__(self) -> Dict:
+        """Stav pro pickle (snapshot enginu) bez paměti posledního textu vláken."""
+        state = self.__dict__.copy()
+        del state["_last_scan"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Obnovení ze snapshotu enginu."""
+        self.__dict__.update(state)
+        self._last_scan = threading.local()
+
+    def scan(self, text: str) -> Dict[str, List[Candidate]]:
+        """
+        Najde kandidáty všech typů v textu.
+
+        Args:
+            text: Text k prohledání
+
+        Returns:
+            Slovník typ -> seznam kandidátů seřazených podle pozice
+        """
+        last_text = getattr(self._last_scan, "text", None)
+        if last_text is text or (last_text is not None and last_text == text):
+            return self._last_scan.candidates
+
+        candidates = {kind: [] for kind in self.patterns}
+        next_allowed = dict.fromkeys(self.patterns, 0)
+        patterns = self.patterns
+        get_kinds = self._get_kinds
+
+        for start_match in self.start_regex.finditer(text):
+            position = start_match.start()
+            for kind in get_kinds(text[position]):
+                if position < next_allowed[kind]:
+                    continue
+                match = patterns[kind].match(text, position)
+                if match:
+                    end = match.end()
+                    candidates[kind].append(Candidate(kind, position, end, match.group(1)))
+                    next_allowed[kind] = end
+
+        self._last_scan.text = text
+        self._last_scan.candidates = candidates
+        return candidates
+
+    def _get_kinds(self, char: str) -> Tuple[str, ...]:
+        """
+        Vrátí typy kandidátů, jejichž shoda může začínat daným znakem.
+
+        Args:
+            char: První znak možné shody
+
+        Returns:
+            Typy kandidátů
+        """
+        kinds = self._kinds_by_char.get(char)
+        if kinds is None:
+            kinds = tuple(kind for kind, start_chars in self.start_chars.items() if start_chars.match(char))
+            self._kinds_by_char[char] = kinds
+        return kinds
+
+    def get_candidates(self, text: str, kind: str) -> List[Candidate]:
+        """
+        Vrátí kandidáty jednoho typu.
+
+        Args:
+            text: Text k prohledání
+            kind: Typ kandidáta (klíč CANDIDATE_PATTERNS)
+
+        Returns:
+            Seznam kandidátů
+        """
+        return self.scan(text)[kind]
+
+
+# Sdílená instance pro všechny české rozpoznávače
+candidate_scanner = CandidateScanner()
@@ -0,0 +1,216 @@
+import bisect
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class KeywordPositions:
+    """
+    Pozice výskytů kontextových klíčových slov v jednom textu.
+
+    Výskyty jsou seřazené podle začátku, dotaz na okno je tedy bisect
+    a průchod několika výskyty uvnitř okna.
+    """
+
+    def __init__(self, starts: List[int], ends: List[int], keywords: List[str]):
+        """
+        Inicializace indexu.
+
+        Args:
+            starts: Začátky výskytů (seřazené)
+            ends: Konce výskytů
+            keywords: Nalezená klíčová slova (malými písmeny)
+        """
+        self.starts = starts
+        self.ends = ends
+        self.keywords = keywords
+
+    def contains_any(self, keywords: frozenset, start: int, end: int) -> bool:
+        """
+        Zjistí, zda některé z klíčových slov leží celé v úseku text[start:end].
+
+        Args:
+            keywords: Hledaná klíčová slova (malými písmeny)
+            start: Začátek úseku
+            end: Konec úseku
+
+        Returns:
+            True, pokud úsek obsahuje některé z klíčových slov
+        """
+        i = bisect.bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] < end:
+            if self.ends[i] <= end and self.keywords[i] in keywords:
+                return True
+            i += 1
+        return False
+
+
+class ContextKeywordIndex:
+    """
+    Sdílený index kontextových klíčových slov českých rozpoznávačů.
+
+    Rozpoznávače při vytvoření zaregistrují svá klíčová slova. Dokud je
+    shod v textu málo, porovnávají se okna kolem shod přímo. Jakmile by
+    prohledaná okna dohromady přesáhla délku textu (texty hustě plné kódů
+    či čísel), najdou se všechny výskyty všech klíčových slov jednou pro
+    celý text a skórování kontextu je dále jen vyhledání v seřazených
+    pozicích. Stav posledního textu se pamatuje pro každé vlákno.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keywords: frozenset = frozenset()
+        self.version = 0
+        self._last_text = threading.local()
+
+    def __getstate__(self) -> Dict:
+        """Stav pro pickle (snapshot enginu) bez zámku a stavu vláken."""
+        state = self.__dict__.copy()
+        del state["lock"]
+        del state["_last_text"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Obnovení ze snapshotu enginu."""
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self._last_text = threading.local()
+
+    def register(self, keywords: Iterable[str]) -> frozenset:
+        """
+        Přidá klíčová slova do indexu.
+
+        Args:
+            keywords: Kontextová klíčová slova rozpoznávače
+
+        Returns:
+            Klíčová slova malými písmeny (pro dotazy has_context)
+        """
+        lowered = frozenset(keyword.lower() for keyword in keywords if keyword)
+        with self.lock:
+            if lowered - self.keywords:
+                self.keywords = self.keywords | lowered
+                self.version += 1
+        return lowered
+
+    def get_positions(self, text: str) -> Optional[KeywordPositions]:
+        """
+        Vrátí pozice klíčových slov v textu (z paměti, pokud jde o stejný text).
+
+        Args:
+            text: Analyzovaný text
+
+        Returns:
+            Index pozic, nebo None, pokud převod na malá písmena mění pozice
+            znaků (pak je nutné porovnávat okna přímo)
+        """
+        state = self._get_state(text)
+        if not state.built:
+            state.positions = self._build_positions(text)
+            state.built = True
+        return state.positions
+
+    def has_context(
+        self, text: str, keywords: frozenset, start: int, end: int, window: int, window_after: Optional[int] = None
+    ) -> bool:
+        """
+        Zjistí, zda se v okně před nebo za shodou vyskytuje klíčové slovo.
+
+        Odpovídá testu `keyword in text[start - window:start].lower()` nebo
+        `keyword in text[end:end + window].lower()` pro všechna slova.
+
+        Args:
+            text: Celý text
+            keywords: Klíčová slova rozpoznávače (výsledek register)
+            start: Začátek shody
+            end: Konec shody
+            window: Velikost okna pro kontext
+            window_after: Velikost okna za shodou (None = window, 0 = jen před shodou)
+
+        Returns:
+            True, pokud bylo klíčové slovo nalezeno
+        """
+        if not keywords:
+            return False
+
+        window_after = window if window_after is None else window_after
+        before_start = max(0, start - window)
+        after_end = min(len(text), end + window_after)
+
+        state = self._get_state(text)
+        if not state.built and state.scanned_chars + window + window_after < len(text):
+            state.scanned_chars += window + window_after
+        else:
+            positions = self.get_positions(text)
+            if positions is not None:
+                return positions.contains_any(keywords, before_start, start) or positions.contains_any(
+                    keywords, end, after_end
+                )
+
+        before_text = text[before_start:start].lower()
+        after_text = text[end:after_end].lower()
+        return any(keyword in before_text or keyword in after_text for keyword in keywords)
+
+    def _get_state(self, text: str) -> threading.local:
+        """
+        Vrátí stav indexu pro text (pro nový text jej vynuluje).
+
+        Args:
+            text: Analyzovaný text
+
+        Returns:
+            Stav posledního textu aktuálního vlákna
+        """
+        state = self._last_text
+        last_text = getattr(state, "text", None)
+        if getattr(state, "version", None) != self.version or not (
+            last_text is text or (last_text is not None and last_text == text)
+        ):
+            state.text = text
+            state.version = self.version
+            state.scanned_chars = 0
+            state.built = False
+            state.positions = None
+        return state
+
+    def _build_positions(self, text: str) -> Optional[KeywordPositions]:
+        """
+        Najde všechny (i překrývající se) výskyty klíčových slov v textu.
+
+        Args:
+            text: Analyzovaný text
+
+        Returns:
+            Index pozic, nebo None pro text, u kterého nelze pozice převzít
+        """
+        lowered = text.lower()
+        # Malá písmena musí zachovat pozice i výsledek po znacích
+        # (neplatí pro znaky měnící délku a kontextové sigma)
+        if len(lowered) != len(text) or "Σ" in text:
+            return None
+
+        # str.find pro každé slovo je rychlejší než alternace v regulárním výrazu
+        occurrences = []
+        for keyword in self.keywords:
+            position = lowered.find(keyword)
+            while position != -1:
+                occurrences.append((position, position + len(keyword), keyword))
+                position = lowered.find(keyword, position + 1)
+        occurrences.sort()
+
+        return KeywordPositions(
+            [occurrence[0] for occurrence in occurrences],
+            [occurrence[1] for occurrence in occurrences],
+            [occurrence[2] for occurrence in occurrences],
+        )
+
+
+# Sdílená instance pro všechny české rozpoznávače
+context_index = ContextKeywordIndex()
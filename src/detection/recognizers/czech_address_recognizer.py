@@ -1,25 +1,49 @@
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from presidio_analyzer import EntityRecognizer, RecognizerResult
 from presidio_analyzer.nlp_engine import NlpArtifacts
 
+from src.detection.overlap_resolver import ANCHOR_KEY, EXACT_MATCH_KEY
+from src.detection.recognizers.candidate_scanner import candidate_scanner
+from src.detection.recognizers.context_index import context_index
+from src.detection.recognizers.name_index import NameIndex
+
+# Mezera mezi částmi adresy: mezery, čárky, pomlčky a nejvýše jedno číslo popisné/orientační
+_ADDRESS_GAP = re.compile(r"[\s,\-]*(?:(?:č\.\s?p\.\s?)?\d+[a-zA-Z]?(?:/\d+[a-zA-Z]?)?[\s,\-]*)?")
+
+# Mezera mezi PSČ a obcí, číslo městského obvodu za obcí (např. "Praha 10")
+_MUNICIPALITY_GAP = re.compile(r"[ \t,]*")
+_DISTRICT_NUMBER = re.compile(r" \d{1,2}\b")
+
 
 class CzechAddressRecognizer(EntityRecognizer):
     """
     Rozpoznávač pro české adresy.
     
     Detekuje adresy v českém formátu, včetně ulic, čísel popisných, měst a PSČ.
+    
+    S indexem ulic, obcí a PSČ (např. z výpisu RÚIAN) se adresa u PSČ
+    ohraničí nalezenými názvy místo pevného okna, pokud PSČ předchází
+    název z indexu. Jinak (i bez indexu) se použije okno kolem PSČ jako
+    dříve; PSČ nebo obec potvrzená indexem jen zvýší skóre.
     """
     
+    # Rozpoznávač prochází tokeny ze spaCy (klíčová slova ulic)
+    requires_nlp_artifacts = True
+    
+    # PSČ i číslo popisné obsahují číslici (bez ní předfiltr rozpoznávač přeskočí)
+    required_features = ("digit",)
+    
     def __init__(
         self,
         supported_language: str = "cs",
         supported_entity: str = "CZECH_ADDRESS",
         name: str = "Czech Address Recognizer",
         context: Optional[List[str]] = None,
+        address_index: Optional[NameIndex] = None,
     ):
-        self.context = context if context else [
+        context = context if context else [
             "adresa", "bydliště", "trvalé bydliště", "přechodné bydliště",
             "ulice", "náměstí", "třída", "nábřeží", "sídliště"
         ]
@@ -28,21 +52,27 @@ class CzechAddressRecognizer(EntityRecognizer):
             supported_entities=[supported_entity],
             name=name,
             supported_language=supported_language,
+            context=context,
         )
         
-        # Regulární výraz pro PSČ
-        self.zip_regex = r"\b([0-9]{3}\s?[0-9]{2})\b"
-        self.compiled_zip_regex = re.compile(self.zip_regex)
+        # Klíčová slova kontextu se vyhledávají sdíleným indexem pro celý text
+        self.context_keywords = context_index.register(self.context)
+        
+        # Kandidáty PSČ hledá sdílený skener
+        self.scanner = candidate_scanner
         
         # Regulární výraz pro číslo popisné/orientační
         self.house_number_regex = r"\b(\d+[a-zA-Z]?(/\d+[a-zA-Z]?)?)\b"
         self.compiled_house_number_regex = re.compile(self.house_number_regex)
         
-        # Klíčová slova pro detekci ulic
-        self.street_keywords = [
+        # Klíčová slova pro detekci ulic (n-tice pro jediné volání str.startswith)
+        self.street_keywords = (
             "ulice", "ul.", "náměstí", "nám.", "třída", "tř.", "nábřeží", 
             "sídliště", "sídl.", "bulvár", "alej", "park"
-        ]
+        )
+        
+        # Index ulic, obcí a PSČ namapovaný do paměti (None = pevná okna)
+        self.address_index = address_index
     
     def load(self) -> None:
         """Načtení rozpoznávače."""
@@ -71,14 +101,25 @@ class CzechAddressRecognizer(EntityRecognizer):
             return results
         
         # Detekce PSČ jako kotvy pro adresy
-        zip_matches = self.compiled_zip_regex.finditer(text)
-        for zip_match in zip_matches:
-            zip_code = zip_match.group(1)
-            zip_start, zip_end = zip_match.span()
+        for zip_candidate in self.scanner.get_candidates(text, "zip_code"):
+            zip_code = zip_candidate.value
+            zip_start, zip_end = zip_candidate.start, zip_candidate.end
             
-            # Hledání adresy v okolí PSČ
-            address_start = max(0, zip_start - 100)  # Hledáme až 100 znaků před PSČ
-            address_end = min(len(text), zip_end + 30)  # A až 30 znaků za PSČ
+            # Adresa, u které index našel názvy před PSČ, má přesné hranice
+            bounds = self._bound_by_index(text, zip_start, zip_end, zip_code) if self.address_index else None
+            exact = bounds is not None and bounds[0] < zip_start
+            if exact:
+                address_start, address_end = bounds
+                base_score = 0.8
+            else:
+                # Hledání adresy v okolí PSČ
+                address_start = max(0, zip_start - 100)  # Hledáme až 100 znaků před PSČ
+                address_end = min(len(text), zip_end + 30)  # A až 30 znaků za PSČ
+                base_score = 0.7
+                if bounds is not None:
+                    # PSČ nebo obec potvrzená indexem (okno před PSČ zůstává)
+                    address_end = max(address_end, bounds[1])
+                    base_score = 0.8
             
             # Extrakce potenciální adresy
             address_text = text[address_start:address_end]
@@ -87,28 +128,43 @@ class CzechAddressRecognizer(EntityRecognizer):
             context_score = self._get_context_score(text, address_start, address_end)
             
             # Vytvoření výsledku
+            recognition_metadata = {
+                RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY: True,
+                "zip_code": zip_code,
+                "address_text": address_text
+            }
+            if exact:
+                recognition_metadata[EXACT_MATCH_KEY] = True
+            else:
+                recognition_metadata[ANCHOR_KEY] = (zip_start, zip_end)
             result = RecognizerResult(
                 entity_type="CZECH_ADDRESS",
                 start=address_start,
                 end=address_end,
-                score=0.7 + context_score,  # Základní skóre + kontext
+                score=base_score + context_score,  # Základní skóre + kontext
                 analysis_explanation=None,
-                recognition_metadata={
-                    "zip_code": zip_code,
-                    "address_text": address_text
-                },
+                recognition_metadata=recognition_metadata,
             )
             results.append(result)
         
         # Detekce adres podle klíčových slov pro ulice
-        if nlp_artifacts and nlp_artifacts.tokens:
+        # (prohledávání tokenů lze vynechat při vyčerpaném časovém rozpočtu)
+        if (
+            nlp_artifacts
+            and nlp_artifacts.tokens
+            and "address_scan" not in getattr(nlp_artifacts, "skipped_stages", ())
+        ):
             for i, token in enumerate(nlp_artifacts.tokens):
                 token_text = token.text.lower()
                 
                 # Kontrola, zda token je klíčové slovo pro ulici
-                if token_text in self.street_keywords or any(token_text.startswith(kw) for kw in self.street_keywords):
-                    # Hledání čísla popisného v okolí
-                    surrounding_text_start = max(0, token.idx - 10)
+                if token_text.startswith(self.street_keywords):
+                    # Hledání čísla popisného v okolí (s indexem od klíčového slova
+                    # nebo od názvu ulice těsně před ním)
+                    if self.address_index:
+                        surrounding_text_start = self._extend_to_street_name(text, token.idx)
+                    else:
+                        surrounding_text_start = max(0, token.idx - 10)
                     surrounding_text_end = min(len(text), token.idx + 100)
                     surrounding_text = text[surrounding_text_start:surrounding_text_end]
                     
@@ -130,14 +186,78 @@ class CzechAddressRecognizer(EntityRecognizer):
                             score=0.65 + context_score,  # Nižší základní skóre než u PSČ
                             analysis_explanation=None,
                             recognition_metadata={
+                                RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY: True,
                                 "street_keyword": token_text,
-                                "address_text": address_text
+                                "address_text": address_text,
+                                ANCHOR_KEY: (token.idx, token.idx + len(token.text)),
                             },
                         )
                         results.append(result)
         
         return results
     
+    def _bound_by_index(self, text: str, zip_start: int, zip_end: int, zip_code: str) -> Optional[Tuple[int, int]]:
+        """
+        Ohraničí adresu u PSČ názvy ulic a obcí z indexu.
+        
+        Před PSČ se od něj zpět přidávají názvy z indexu oddělené jen
+        interpunkcí a číslem domu, za PSČ se přidá obec (případně s číslem
+        obvodu). Cena je lineární v délce prohledaných oken.
+        
+        Args:
+            text: Celý text
+            zip_start: Začátek PSČ
+            zip_end: Konec PSČ
+            zip_code: Nalezené PSČ
+            
+        Returns:
+            Hranice adresy, nebo None, pokud index adresu nepotvrdil
+        """
+        # Názvy před PSČ (nejvýše 100 znaků jako u okna)
+        window_start = max(0, zip_start - 100)
+        address_start = zip_start
+        for match in reversed(self.address_index.find_all(text[window_start:zip_start])):
+            match_start, match_end = window_start + match.start, window_start + match.end
+            if match_start == window_start and window_start > 0 and text[window_start - 1].isalnum():
+                break  # Okno začíná uprostřed slova
+            if not _ADDRESS_GAP.fullmatch(text, match_end, address_start):
+                break
+            address_start = match_start
+        
+        # Obec za PSČ
+        address_end = zip_end
+        tail = self.address_index.find_all(text[zip_end:zip_end + 40])
+        if tail and _MUNICIPALITY_GAP.fullmatch(text, zip_end, zip_end + tail[0].start):
+            address_end = zip_end + tail[0].end
+            district = _DISTRICT_NUMBER.match(text, address_end)
+            if district:
+                address_end = district.end()
+        
+        confirmed = (
+            address_start < zip_start
+            or address_end > zip_end
+            or self.address_index.contains(zip_code.replace(" ", ""))
+        )
+        return (address_start, address_end) if confirmed else None
+    
+    def _extend_to_street_name(self, text: str, keyword_start: int, window: int = 40) -> int:
+        """
+        Najde začátek názvu ulice z indexu, který těsně předchází klíčovému slovu.
+        
+        Args:
+            text: Celý text
+            keyword_start: Začátek klíčového slova (např. "ulice")
+            window: Prohledávané okno před klíčovým slovem
+            
+        Returns:
+            Začátek adresy (název ulice, jinak klíčové slovo)
+        """
+        window_start = max(0, keyword_start - window)
+        matches = self.address_index.find_all(text[window_start:keyword_start])
+        if matches and not text[window_start + matches[-1].end:keyword_start].strip():
+            return window_start + matches[-1].start
+        return keyword_start
+    
     def _get_context_score(self, text: str, start: int, end: int, window: int = 50) -> float:
         """
         Získá skóre na základě kontextu kolem detekované adresy.
@@ -151,13 +271,9 @@ class CzechAddressRecognizer(EntityRecognizer):
         Returns:
             Skóre kontextu (0.0 - 0.2)
         """
-        # Získání kontextu před a za adresou
-        before_text = text[max(0, start - window):start].lower()
-        after_text = text[end:min(len(text), end + window)].lower()
-        
-        # Kontrola, zda se v kontextu vyskytují klíčová slova
-        for keyword in self.context:
-            if keyword.lower() in before_text or keyword.lower() in after_text:
-                return 0.2  # Zvýšení skóre při nalezení kontextu
+        # Kontrola, zda se v okně před nebo za shodou vyskytují klíčová slova
+        # (pozice klíčových slov se hledají jen jednou pro celý text)
+        if context_index.has_context(text, self.context_keywords, start, end, window):
+            return 0.2
         
         return 0.0  # Žádný kontext nenalezen
@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from src.detection.overlap_resolver import EXACT_MATCH_KEY
+from src.detection.recognizers.name_index import NameIndex
+
+
+class CzechFacilityGazetteerRecognizer(EntityRecognizer):
+    """
+    Rozpoznávač názvů zdravotnických zařízení podle gazetteeru poskytovatelů.
+
+    Na rozdíl od CzechMedicalFacilityRecognizer (okno kolem klíčového slova)
+    vrací přesný rozsah názvu z indexu sestaveného ze seznamu poskytovatelů
+    (např. export NRPZS). Index je soubor namapovaný do paměti, který sdílejí
+    všechny pracovní procesy.
+    """
+
+    # Rozpoznávač pracuje jen s textem
+    requires_nlp_artifacts = False
+
+    def __init__(
+        self,
+        index: NameIndex,
+        supported_language: str = "cs",
+        supported_entity: str = "CZECH_MEDICAL_FACILITY",
+        name: str = "Czech Facility Gazetteer Recognizer",
+    ):
+        self.index = index
+
+        super().__init__(
+            supported_entities=[supported_entity],
+            name=name,
+            supported_language=supported_language,
+        )
+
+    def load(self) -> None:
+        """Načtení rozpoznávače."""
+        pass
+
+    def analyze(
+        self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None
+    ) -> List[RecognizerResult]:
+        """
+        Analyzuje text a detekuje názvy zařízení z gazetteeru.
+
+        Args:
+            text: Text k analýze
+            entities: Seznam entit k detekci
+            nlp_artifacts: NLP artefakty (nepoužívají se)
+
+        Returns:
+            Seznam detekovaných entit
+        """
+        if not entities or not any(entity in self.supported_entities for entity in entities):
+            return []
+
+        return [
+            RecognizerResult(
+                entity_type=self.supported_entities[0],
+                start=match.start,
+                end=match.end,
+                score=0.9,  # Vysoké skóre, název odpovídá registru poskytovatelů
+                analysis_explanation=None,
+                recognition_metadata={
+                    EXACT_MATCH_KEY: True,
+                    "facility_text": match.name,
+                },
+            )
+            for match in self.index.find_all(text)
+        ]
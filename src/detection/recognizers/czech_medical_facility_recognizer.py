@@ -1,9 +1,12 @@
-import re
+import bisect
 from typing import List, Optional
 
 from presidio_analyzer import EntityRecognizer, RecognizerResult
 from presidio_analyzer.nlp_engine import NlpArtifacts
 
+from src.detection.overlap_resolver import ANCHOR_KEY
+from src.detection.recognizers.keyword_matcher import KeywordMatcher
+
 
 class CzechMedicalFacilityRecognizer(EntityRecognizer):
     """
@@ -12,6 +15,12 @@ class CzechMedicalFacilityRecognizer(EntityRecognizer):
     Detekuje názvy nemocnic, klinik, zdravotních středisek a dalších zdravotnických zařízení.
     """
     
+    # Rozpoznávač prochází věty a entity ze spaCy
+    requires_nlp_artifacts = True
+    
+    # Bez klíčového slova zařízení v dokumentu předfiltr rozpoznávač přeskočí
+    required_features = ("facility_keyword",)
+    
     def __init__(
         self,
         supported_language: str = "cs",
@@ -29,6 +38,12 @@ class CzechMedicalFacilityRecognizer(EntityRecognizer):
             "lékařské centrum", "zdravotní centrum", "rehabilitační ústav", "hospic"
         ]
         
+        # Klíčová slova rysů pro předfiltr dokumentu
+        self.feature_keywords = {"facility_keyword": self.facility_keywords}
+        
+        # Všechna klíčová slova se hledají jedním průchodem celého textu
+        self.keyword_matcher = KeywordMatcher(self.facility_keywords)
+        
         super().__init__(
             supported_entities=[supported_entity],
             name=name,
@@ -65,40 +80,48 @@ class CzechMedicalFacilityRecognizer(EntityRecognizer):
         if not nlp_artifacts or not nlp_artifacts.entities:
             return results
         
-        # Procházení vět v textu
-        doc = nlp_artifacts.doc
-        for sent in doc.sents:
-            sent_text = sent.text.strip()
+        # Prohledávání vět lze vynechat při vyčerpaném časovém rozpočtu
+        if "facility_scan" in getattr(nlp_artifacts, "skipped_stages", ()):
+            return results
+        
+        # Klíčová slova se hledají jednou v celém textu, výskyty se přiřadí větám
+        # (tokens je spaCy Doc); každý výskyt je samostatný výsledek
+        hits = self.keyword_matcher.find_all(text)
+        if not hits:
+            return results
+        
+        sentences = [(sent.start_char, sent.end_char) for sent in nlp_artifacts.tokens.sents]
+        sentence_starts = [start for start, _ in sentences]
+        for hit in hits:
+            sentence_index = bisect.bisect_right(sentence_starts, hit.start) - 1
+            if sentence_index < 0:
+                continue
+            sent_start, sent_end = sentences[sentence_index]
+            if hit.end > sent_end:
+                continue  # Klíčové slovo přes hranici věty
+            
+            # Okraje věty bez bílých znaků
+            sent_text = text[sent_start:sent_end]
+            content_start = sent_start + len(sent_text) - len(sent_text.lstrip())
+            content_end = sent_start + len(sent_text.rstrip())
+            
+            # Hledání názvu zařízení v okolí klíčového slova (v rámci věty)
+            abs_start = max(content_start, hit.start - 30)
+            abs_end = min(content_end, hit.end + 50)
             
-            # Kontrola, zda věta obsahuje klíčová slova pro zdravotnická zařízení
-            for keyword in self.facility_keywords:
-                keyword_lower = keyword.lower()
-                if keyword_lower in sent_text.lower():
-                    # Hledání názvu zařízení v okolí klíčového slova
-                    keyword_index = sent_text.lower().find(keyword_lower)
-                    start_index = max(0, keyword_index - 30)
-                    end_index = min(len(sent_text), keyword_index + len(keyword) + 50)
-                    
-                    # Extrakce potenciálního názvu zařízení
-                    facility_text = sent_text[start_index:end_index]
-                    
-                    # Výpočet absolutní pozice v textu
-                    abs_start = sent.start_char + start_index
-                    abs_end = sent.start_char + end_index
-                    
-                    # Vytvoření výsledku
-                    result = RecognizerResult(
-                        entity_type="CZECH_MEDICAL_FACILITY",
-                        start=abs_start,
-                        end=abs_end,
-                        score=0.65,  # Střední skóre, protože detekce je založena na klíčových slovech
-                        analysis_explanation=None,
-                        recognition_metadata={
-                            "keyword": keyword,
-                            "facility_text": facility_text
-                        },
-                    )
-                    results.append(result)
-                    break  # Přeskočení dalších klíčových slov pro tuto větu
+            # Vytvoření výsledku
+            result = RecognizerResult(
+                entity_type="CZECH_MEDICAL_FACILITY",
+                start=abs_start,
+                end=abs_end,
+                score=0.65,  # Střední skóre, protože detekce je založena na klíčových slovech
+                analysis_explanation=None,
+                recognition_metadata={
+                    "keyword": hit.keyword,
+                    "facility_text": text[abs_start:abs_end],
+                    ANCHOR_KEY: (hit.start, hit.end),
+                },
+            )
+            results.append(result)
         
         return results
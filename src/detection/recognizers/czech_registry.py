@@ -6,6 +6,11 @@ from src.detection.recognizers.czech_birth_number_recognizer import CzechBirthNu
 from src.detection.recognizers.czech_health_insurance_recognizer import CzechHealthInsuranceNumberRecognizer
 from src.detection.recognizers.czech_diagnosis_code_recognizer import CzechMedicalDiagnosisCodeRecognizer
 from src.detection.recognizers.czech_medical_facility_recognizer import CzechMedicalFacilityRecognizer
+from src.detection.recognizers.czech_address_recognizer import CzechAddressRecognizer
+from src.detection.recognizers.declarative import DEFAULT_RECOGNIZER_DEFINITIONS, DeclarativeRecognizer, load_definitions
+from src.detection.recognizers.czech_facility_gazetteer_recognizer import CzechFacilityGazetteerRecognizer
+from src.detection.recognizers.diagnosis_codes import DEFAULT_DIAGNOSIS_TABLE, load_diagnosis_table
+from src.detection.recognizers.name_index import DEFAULT_ADDRESS_INDEX, DEFAULT_FACILITY_GAZETTEER, load_name_index
 
 # Nastavení loggeru
 logging.basicConfig(
@@ -20,36 +25,84 @@ class CzechRecognizerRegistry:
     """
     
     @staticmethod
-    def register_czech_recognizers(registry: RecognizerRegistry) -> None:
+    def register_czech_recognizers(
+        registry: RecognizerRegistry,
+        supported_language: str = "cs",
+        facility_gazetteer: Optional[str] = DEFAULT_FACILITY_GAZETTEER,
+        address_index: Optional[str] = DEFAULT_ADDRESS_INDEX,
+        diagnosis_table: Optional[str] = DEFAULT_DIAGNOSIS_TABLE,
+        recognizer_definitions: Optional[str] = DEFAULT_RECOGNIZER_DEFINITIONS,
+    ) -> None:
         """
         Registruje specializované české rozpoznávače do Presidio registru.
         
         Args:
             registry: Presidio registr rozpoznávačů
+            supported_language: Jazyk, pod kterým budou rozpoznávače registrovány
+                (musí odpovídat jazyku, se kterým se volá analyzer)
+            facility_gazetteer: Index názvů zdravotnických zařízení (None = bez gazetteeru)
+            address_index: Index ulic, obcí a PSČ pro ohraničení adres (None = pevná okna)
+            diagnosis_table: Tabulka platných kódů MKN-10 (None = vestavěná tabulka kategorií)
+            recognizer_definitions: Soubor s dalšími deklarativními definicemi (None = jen vestavěné)
         """
         logger.info("Registering specialized Czech recognizers")
         
+        # Vestavěné definice a nasazený soubor (stejné id v souboru nahradí vestavěnou definici)
+        definitions = load_definitions(recognizer_definitions)
+        
         # Vytvoření a registrace rozpoznávače českých rodných čísel
-        birth_number_recognizer = CzechBirthNumberRecognizer()
+        birth_number_recognizer = CzechBirthNumberRecognizer(
+            supported_language=supported_language, definition=definitions["CzechBirthNumberRecognizer"]
+        )
         registry.add_recognizer(birth_number_recognizer)
         logger.info(f"Registered: {birth_number_recognizer.name}")
         
         # Vytvoření a registrace rozpoznávače českých čísel pojištěnce
-        health_insurance_recognizer = CzechHealthInsuranceNumberRecognizer()
+        health_insurance_recognizer = CzechHealthInsuranceNumberRecognizer(
+            supported_language=supported_language, definition=definitions["CzechHealthInsuranceNumberRecognizer"]
+        )
         registry.add_recognizer(health_insurance_recognizer)
         logger.info(f"Registered: {health_insurance_recognizer.name}")
         
         # Vytvoření a registrace rozpoznávače českých kódů diagnóz
-        diagnosis_code_recognizer = CzechMedicalDiagnosisCodeRecognizer()
+        diagnosis_code_recognizer = CzechMedicalDiagnosisCodeRecognizer(
+            supported_language=supported_language,
+            code_table=load_diagnosis_table(diagnosis_table),
+            definition=definitions["CzechMedicalDiagnosisCodeRecognizer"],
+        )
         registry.add_recognizer(diagnosis_code_recognizer)
         logger.info(f"Registered: {diagnosis_code_recognizer.name}")
         
         # Vytvoření a registrace rozpoznávače českých zdravotnických zařízení
-        medical_facility_recognizer = CzechMedicalFacilityRecognizer()
+        medical_facility_recognizer = CzechMedicalFacilityRecognizer(supported_language=supported_language)
         registry.add_recognizer(medical_facility_recognizer)
         logger.info(f"Registered: {medical_facility_recognizer.name}")
         
-        # Zde budou přidány další specializované české rozpoznávače
+        # Registrace gazetteeru zdravotnických zařízení (jen s nakonfigurovaným indexem)
+        facility_index = load_name_index(facility_gazetteer)
+        if facility_index is not None:
+            facility_gazetteer_recognizer = CzechFacilityGazetteerRecognizer(
+                facility_index, supported_language=supported_language
+            )
+            registry.add_recognizer(facility_gazetteer_recognizer)
+            logger.info(f"Registered: {facility_gazetteer_recognizer.name} ({len(facility_index)} names)")
+        
+        # Vytvoření a registrace rozpoznávače českých adres
+        address_recognizer = CzechAddressRecognizer(
+            supported_language=supported_language, address_index=load_name_index(address_index)
+        )
+        registry.add_recognizer(address_recognizer)
+        logger.info(f"Registered: {address_recognizer.name}")
+        
+        # Rozpoznávače jen z deklarativních definic (např. IČO, IČP); jejich vzory
+        # skenuje stejný jediný průchod textem jako vzory rozpoznávačů výše
+        registered = {type(recognizer).__name__ for recognizer in registry.recognizers}
+        for definition in definitions.values():
+            if definition.id in registered:
+                continue
+            declarative_recognizer = DeclarativeRecognizer(definition, supported_language=supported_language)
+            registry.add_recognizer(declarative_recognizer)
+            logger.info(f"Registered: {declarative_recognizer.name}")
         
         logger.info("All Czech recognizers registered successfully")
     
@@ -66,5 +119,7 @@ class CzechRecognizerRegistry:
             "CZECH_HEALTH_INSURANCE_NUMBER",
             "CZECH_DIAGNOSIS_CODE",
             "CZECH_MEDICAL_FACILITY",
-            # Zde budou přidány další entity
+            "CZECH_ADDRESS",
+            "CZECH_ICO",
+            "CZECH_ICP",
         ]
@@ -0,0 +1,287 @@
+import functools
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from src.detection.recognizers.birth_number_validation import validate_birth_number_candidates
+from src.detection.recognizers.candidate_scanner import CandidateScanner, candidate_scanner
+from src.detection.recognizers.context_index import context_index
+from src.detection.recognizers.diagnosis_codes import validate_diagnosis_codes
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Vestavěné definice rozpoznávačů
+BUILTIN_DEFINITIONS = Path(__file__).parent / "recognizer_definitions.json"
+
+# Další definice pro nasazení (JSON ve stejném formátu; definice se stejným id nahradí vestavěnou)
+DEFAULT_RECOGNIZER_DEFINITIONS = os.environ.get("ANONYMIZER_RECOGNIZER_DEFINITIONS") or None
+
+
+def validate_ico(values: Sequence[str]) -> List[bool]:
+    """
+    Ověří kontrolní číslici IČO (váhy 8 až 2, modulo 11).
+
+    Args:
+        values: Osmimístní kandidáti
+
+    Returns:
+        Výsledek validace pro každého kandidáta
+    """
+    valid = []
+    for value in values:
+        if len(value) != 8 or not value.isascii() or not value.isdigit():
+            valid.append(False)
+            continue
+        remainder = sum(int(digit) * weight for digit, weight in zip(value[:7], range(8, 1, -1))) % 11
+        check_digit = 11 - remainder if remainder > 1 else 1 - remainder
+        valid.append(int(value[7]) == check_digit)
+    return valid
+
+
+# Validátory podle názvu v definici: funkce (hodnoty kandidátů, volby rozpoznávače) -> platnost
+VALIDATORS: Dict[str, Callable[..., List[bool]]] = {
+    "birth_number": validate_birth_number_candidates,
+    "mkn10": validate_diagnosis_codes,
+    "ico": validate_ico,
+}
+
+
+class RecognizerDefinition(NamedTuple):
+    """
+    Deklarativní definice rozpoznávače.
+    """
+    id: str
+    name: str
+    entity: str
+    candidate: str
+    base_score: float
+    validator: Optional[str] = None
+    context: Tuple[str, ...] = ()
+    context_score: float = 0.0
+    context_window: int = 50
+    context_window_after: Optional[int] = None
+    context_required: bool = False
+    required_features: Tuple[str, ...] = ()
+
+
+def parse_definitions(content: Dict) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, RecognizerDefinition]]:
+    """
+    Převede obsah souboru definic na vzory kandidátů a definice rozpoznávačů.
+
+    Args:
+        content: Obsah JSON souboru ({"candidates": {...}, "recognizers": [...]})
+
+    Returns:
+        Dvojice (vzory kandidátů ve formátu CANDIDATE_PATTERNS, definice podle id)
+
+    Raises:
+        ValueError: Pokud definice neuvádí povinné pole nebo zná neznámý validátor
+    """
+    patterns = {
+        kind: (candidate["start_chars"], candidate["pattern"])
+        for kind, candidate in content.get("candidates", {}).items()
+    }
+
+    definitions = {}
+    for item in content.get("recognizers", []):
+        try:
+            definition = RecognizerDefinition(
+                id=item["id"],
+                name=item.get("name", item["id"]),
+                entity=item["entity"],
+                candidate=item["candidate"],
+                base_score=float(item["base_score"]),
+                validator=item.get("validator"),
+                context=tuple(item.get("context", ())),
+                context_score=float(item.get("context_score", 0.0)),
+                context_window=int(item.get("context_window", 50)),
+                context_window_after=item.get("context_window_after"),
+                context_required=bool(item.get("context_required", False)),
+                required_features=tuple(item.get("required_features", ())),
+            )
+        except KeyError as e:
+            raise ValueError(f"Recognizer definition {item.get('id', '?')} is missing field {e}")
+        if definition.validator is not None and definition.validator not in VALIDATORS:
+            raise ValueError(f"Recognizer definition {definition.id} uses unknown validator {definition.validator}")
+        definitions[definition.id] = definition
+    return patterns, definitions
+
+
+@functools.lru_cache(maxsize=None)
+def load_definitions(path: Optional[str] = DEFAULT_RECOGNIZER_DEFINITIONS) -> Dict[str, RecognizerDefinition]:
+    """
+    Načte vestavěné a nasazené definice a zkompiluje jejich vzory do sdíleného skeneru.
+
+    Vzory všech definic se přidají do jediného skeneru kandidátů, takže
+    nový identifikátor nepřidává další průchod textem.
+
+    Args:
+        path: Soubor s dalšími definicemi, None = jen vestavěné
+
+    Returns:
+        Definice rozpoznávačů podle id (v pořadí souborů)
+
+    Raises:
+        ValueError: Pokud definice odkazuje na neznámý typ kandidáta
+    """
+    paths = [BUILTIN_DEFINITIONS] + ([Path(path)] if path else [])
+
+    definitions: Dict[str, RecognizerDefinition] = {}
+    for definitions_path in paths:
+        with open(definitions_path, "r", encoding="utf-8") as f:
+            patterns, file_definitions = parse_definitions(json.load(f))
+        candidate_scanner.add_patterns(patterns)
+        definitions.update(file_definitions)
+
+    for definition in definitions.values():
+        if definition.candidate not in candidate_scanner.patterns:
+            raise ValueError(f"Recognizer definition {definition.id} uses unknown candidate kind {definition.candidate}")
+
+    logger.info(f"Loaded {len(definitions)} recognizer definitions")
+    return definitions
+
+
+class DeclarativeRecognizer(EntityRecognizer):
+    """
+    Rozpoznávač řízený deklarativní definicí.
+
+    Kandidáty hledá sdílený skener (jeden průchod textem pro všechny
+    definice), všichni kandidáti dokumentu se ověří validátorem najednou
+    a skóre se zvýší podle kontextových klíčových slov ze sdíleného indexu.
+    """
+
+    # Rozpoznávač pracuje jen s textem, NLP artefakty nepotřebuje
+    requires_nlp_artifacts = False
+
+    def __init__(
+        self,
+        definition: RecognizerDefinition,
+        supported_language: str = "cs",
+        supported_entity: Optional[str] = None,
+        name: Optional[str] = None,
+        context: Optional[List[str]] = None,
+        validator_options: Optional[Dict] = None,
+        scanner: CandidateScanner = candidate_scanner,
+    ):
+        """
+        Inicializace rozpoznávače.
+
+        Args:
+            definition: Definice rozpoznávače
+            supported_language: Jazyk, pod kterým bude rozpoznávač registrován
+            supported_entity: Typ entity (výchozí: z definice)
+            name: Název rozpoznávače (výchozí: z definice)
+            context: Kontextová klíčová slova (výchozí: z definice)
+            validator_options: Volby předávané validátoru
+            scanner: Skener kandidátů
+        """
+        self.definition = definition
+        self.recognizer_id = definition.id
+
+        # Bez těchto rysů dokumentu nemůže rozpoznávač nic najít (předfiltr ho přeskočí)
+        self.required_features = definition.required_features or None
+
+        self.validator = VALIDATORS[definition.validator] if definition.validator else None
+        self.validator_options = validator_options or {}
+
+        super().__init__(
+            supported_entities=[supported_entity or definition.entity],
+            name=name or definition.name,
+            supported_language=supported_language,
+            context=list(context) if context else list(definition.context),
+        )
+
+        # Klíčová slova kontextu se vyhledávají sdíleným indexem pro celý text
+        self.context_keywords = context_index.register(self.context)
+
+        self.scanner = scanner
+
+    def load(self) -> None:
+        """Načtení rozpoznávače."""
+        pass
+
+    def analyze(
+        self, text: str, entities: List[str], nlp_artifacts: Optional[NlpArtifacts] = None
+    ) -> List[RecognizerResult]:
+        """
+        Analyzuje text podle definice.
+
+        Args:
+            text: Text k analýze
+            entities: Seznam entit k detekci
+            nlp_artifacts: NLP artefakty (nepoužívají se)
+
+        Returns:
+            Seznam detekovaných entit
+        """
+        results = []
+
+        if not self.supported_entities or not entities:
+            return results
+
+        if not any(entity in self.supported_entities for entity in entities):
+            return results
+
+        # Validace všech kandidátů dokumentu najednou
+        candidates = self.scanner.get_candidates(text, self.definition.candidate)
+        if not candidates:
+            return results
+        if self.validator is not None:
+            validity = self.validator([candidate.value for candidate in candidates], **self.validator_options)
+        else:
+            validity = [True] * len(candidates)
+
+        for candidate, is_valid in zip(candidates, validity):
+            if not is_valid:
+                continue
+
+            # Kontrola kontextu pro zvýšení přesnosti
+            context_score = self._get_context_score(text, candidate.start, candidate.end)
+            if self.definition.context_required and not context_score:
+                continue
+
+            result = RecognizerResult(
+                entity_type=self.supported_entities[0],
+                start=candidate.start,
+                end=candidate.end,
+                score=self.definition.base_score + context_score,
+                analysis_explanation=None,
+                recognition_metadata={
+                    RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY: True,
+                    "match": candidate.value,
+                },
+            )
+            results.append(result)
+
+        return results
+
+    def _get_context_score(self, text: str, start: int, end: int) -> float:
+        """
+        Získá skóre na základě kontextu kolem shody.
+
+        Args:
+            text: Celý text
+            start: Počáteční pozice shody
+            end: Koncová pozice shody
+
+        Returns:
+            Skóre kontextu (0.0 nebo context_score z definice)
+        """
+        # Kontrola, zda se v okně před nebo za shodou vyskytují klíčová slova
+        # (pozice klíčových slov se hledají jen jednou pro celý text)
+        if self.context_keywords and context_index.has_context(
+            text, self.context_keywords, start, end, self.definition.context_window, self.definition.context_window_after
+        ):
+            return self.definition.context_score
+
+        return 0.0  # Žádný kontext nenalezen
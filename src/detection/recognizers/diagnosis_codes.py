@@ -0,0 +1,252 @@
+import functools
+import logging
+import mmap
+import os
+import re
+import struct
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Tabulka platných kódů MKN-10 z build_diagnosis_table (prázdná = vestavěná tabulka kategorií)
+DEFAULT_DIAGNOSIS_TABLE = os.environ.get("ANONYMIZER_DIAGNOSIS_TABLE") or None
+
+# Vestavěná tabulka: rozsahy třímístných kategorií podle bloků MKN-10. Jde
+# o přiblížení - vynechány jsou jen nepoužité rozsahy mezi bloky, uvnitř
+# bloků se platnost kategorií ani podkódů neověřuje. Přesnou validaci
+# včetně podkódů dává tabulka sestavená z číselníku ÚZIS.
+DEFAULT_CATEGORY_RANGES = (
+    "A00-A09", "A15-A28", "A30-A99", "B00-B10", "B15-B83", "B85-B99",
+    "C00-C97", "D00-D48", "D50-D53", "D55-D77", "D80-D89",
+    "E00-E07", "E10-E16", "E20-E35", "E40-E46", "E50-E68", "E70-E90",
+    "F00-F99",
+    "G00-G14", "G20-G26", "G30-G32", "G35-G37", "G40-G47", "G50-G64", "G70-G73", "G80-G83", "G90-G99",
+    "H00-H06", "H10-H13", "H15-H22", "H25-H28", "H30-H36", "H40-H62", "H65-H75", "H80-H83", "H90-H95",
+    "I00-I02", "I05-I15", "I20-I28", "I30-I52", "I60-I89", "I95-I99",
+    "J00-J06", "J09-J18", "J20-J22", "J30-J47", "J60-J70", "J80-J86", "J90-J99",
+    "K00-K14", "K20-K31", "K35-K38", "K40-K46", "K50-K52", "K55-K67", "K70-K77", "K80-K87", "K90-K93",
+    "L00-L08", "L10-L14", "L20-L30", "L40-L45", "L50-L75", "L80-L99",
+    "M00-M25", "M30-M36", "M40-M43", "M45-M54", "M60-M63", "M65-M68", "M70-M99",
+    "N00-N08", "N10-N23", "N25-N51", "N60-N64", "N70-N77", "N80-N99",
+    "O00-O48", "O60-O92", "O94-O99",
+    "P00-P08", "P10-P15", "P20-P29", "P35-P39", "P50-P61", "P70-P78", "P80-P83", "P90-P96",
+    "Q00-Q07", "Q10-Q18", "Q20-Q28", "Q30-Q45", "Q50-Q56", "Q60-Q99",
+    "R00-R23", "R25-R99",
+    "S00-S99", "T00-T98",
+    "U00-U99",
+    "V01-V99", "W00-W99", "X00-X99", "Y00-Y98",
+    "Z00-Z99",
+)
+
+# Formát souboru tabulky (little endian):
+#   hlavička: magic (8 B), příznaky (u32; bit 0 = ověřují se podkódy)
+#   bitmapa kategorií: bit na kategorii (písmeno × 100 + dvojčíslí)
+#   bitmapa podkódů: _SUBCODE_SLOTS bitů na kategorii (bez podkódu, .0-.9, .00-.99)
+_MAGIC = b"MDMKN001"
+_HEADER = struct.Struct("<8sI")
+_CHECK_SUBCODES = 1
+
+_CATEGORIES = 26 * 100
+_SUBCODE_SLOTS = 1 + 10 + 100
+_CATEGORY_BYTES = (_CATEGORIES + 7) // 8
+_SUBCODE_BYTES = (_CATEGORIES * _SUBCODE_SLOTS + 7) // 8
+
+# Kód diagnózy (s tečkou i bez ní, případně s hvězdičkou či křížkem z číselníku)
+_CODE = re.compile(r"([A-Z])(\d{2})\.?(\d{0,2})[*†+]?")
+
+
+def _parse_code(code: str) -> Optional[Tuple[int, int]]:
+    """
+    Převede kód na pozici kategorie a podkódu v bitmapách.
+
+    Args:
+        code: Kód MKN-10 (např. "J45", "J45.0", "J450")
+
+    Returns:
+        Dvojice (kategorie, podkód), nebo None pro kód v jiném formátu
+    """
+    match = _CODE.fullmatch(code.strip().upper())
+    if not match:
+        return None
+    letter, digits, subcode = match.groups()
+    category = (ord(letter) - ord("A")) * 100 + int(digits)
+    if not subcode:
+        return category, 0
+    if len(subcode) == 1:
+        return category, 1 + int(subcode)
+    return category, 11 + int(subcode)
+
+
+class DiagnosisCodeTable:
+    """
+    Tabulka platných kódů MKN-10 jako bitmapa.
+
+    Ověření kódu je jeden přístup k bitu (O(1)). Tabulka sestavená
+    z číselníku se mapuje ze souboru do paměti jen pro čtení, takže ji
+    pracovní procesy sdílejí přes stránkovou cache systému; vestavěná
+    tabulka kategorií má jen stovky bajtů.
+    """
+
+    def __init__(self, buffer, check_subcodes: bool, path: Optional[str] = None):
+        """
+        Inicializace tabulky.
+
+        Args:
+            buffer: Bitmapa kategorií následovaná bitmapou podkódů
+            check_subcodes: Zda se ověřují i podkódy (jinak stačí platná kategorie)
+            path: Soubor, ze kterého tabulka pochází (None = vestavěná)
+        """
+        self.buffer = buffer
+        self.check_subcodes = check_subcodes
+        self.path = path
+
+    @classmethod
+    def from_category_ranges(cls, ranges: Iterable[str] = DEFAULT_CATEGORY_RANGES) -> "DiagnosisCodeTable":
+        """
+        Sestaví tabulku z rozsahů kategorií (podkódy se neověřují).
+
+        Args:
+            ranges: Rozsahy ve tvaru "A00-A09"
+
+        Returns:
+            Tabulka
+        """
+        buffer = bytearray(_CATEGORY_BYTES)
+        for category_range in ranges:
+            first, last = (_parse_code(code)[0] for code in category_range.split("-"))
+            for category in range(first, last + 1):
+                buffer[category >> 3] |= 1 << (category & 7)
+        return cls(bytes(buffer), check_subcodes=False)
+
+    @classmethod
+    def load(cls, path: str) -> "DiagnosisCodeTable":
+        """
+        Namapuje tabulku ze souboru z build_diagnosis_table.
+
+        Args:
+            path: Cesta k souboru
+
+        Returns:
+            Tabulka
+
+        Raises:
+            ValueError: Pokud soubor není tabulka kódů MKN-10
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, flags = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or len(mapped) != _HEADER.size + _CATEGORY_BYTES + _SUBCODE_BYTES:
+            mapped.close()
+            raise ValueError(f"{path} is not a diagnosis code table")
+        return cls(memoryview(mapped)[_HEADER.size:], check_subcodes=bool(flags & _CHECK_SUBCODES), path=path)
+
+    def __getstate__(self) -> dict:
+        """Stav pro pickle (snapshot enginu) - soubor se po načtení znovu namapuje."""
+        if self.path is None:
+            return {"buffer": bytes(self.buffer), "check_subcodes": self.check_subcodes, "path": None}
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        """Obnovení ze snapshotu enginu."""
+        if state["path"] is None:
+            self.__init__(state["buffer"], state["check_subcodes"])
+        else:
+            self.__dict__.update(DiagnosisCodeTable.load(state["path"]).__dict__)
+
+    def contains(self, code: str) -> bool:
+        """
+        Zjistí, zda je kód platný.
+
+        Args:
+            code: Kód MKN-10 (např. "J45.0")
+
+        Returns:
+            True pro platný kód
+        """
+        parsed = _parse_code(code)
+        if parsed is None:
+            return False
+        category, subcode = parsed
+        if not self.buffer[category >> 3] & (1 << (category & 7)):
+            return False
+        if not self.check_subcodes:
+            return True
+        bit = category * _SUBCODE_SLOTS + subcode
+        return bool(self.buffer[_CATEGORY_BYTES + (bit >> 3)] & (1 << (bit & 7)))
+
+
+def build_diagnosis_table(codes: Iterable[str], output_path: str) -> int:
+    """
+    Sestaví soubor tabulky z číselníku kódů (offline krok).
+
+    Platný pětimístný kód zplatní i svůj čtyřmístný a třímístný prefix.
+
+    Args:
+        codes: Kódy MKN-10 (kódy v jiném formátu se vynechají)
+        output_path: Cesta k výstupnímu souboru
+
+    Returns:
+        Počet platných kódů v číselníku
+    """
+    buffer = bytearray(_CATEGORY_BYTES + _SUBCODE_BYTES)
+    count = 0
+    for code in codes:
+        parsed = _parse_code(code)
+        if parsed is None:
+            continue
+        count += 1
+        category, subcode = parsed
+        prefixes = {0, subcode}
+        if subcode >= 11:
+            prefixes.add(1 + (subcode - 11) // 10)
+        buffer[category >> 3] |= 1 << (category & 7)
+        for slot in prefixes:
+            bit = category * _SUBCODE_SLOTS + slot
+            buffer[_CATEGORY_BYTES + (bit >> 3)] |= 1 << (bit & 7)
+
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _CHECK_SUBCODES))
+        f.write(buffer)
+    os.replace(temp_path, output_path)
+
+    logger.info(f"Built diagnosis code table {output_path} from {count} codes")
+    return count
+
+
+@functools.lru_cache(maxsize=None)
+def load_diagnosis_table(path: Optional[str] = DEFAULT_DIAGNOSIS_TABLE) -> DiagnosisCodeTable:
+    """
+    Vrátí tabulku kódů (jednou na proces a cestu).
+
+    Args:
+        path: Soubor z build_diagnosis_table, None = vestavěná tabulka kategorií
+
+    Returns:
+        Tabulka
+    """
+    if path:
+        if os.path.exists(path):
+            return DiagnosisCodeTable.load(path)
+        logger.warning(f"Diagnosis code table {path} not found, using built-in category table")
+    return DiagnosisCodeTable.from_category_ranges()
+
+
+def validate_diagnosis_codes(codes: Sequence[str], code_table: Optional[DiagnosisCodeTable] = None) -> List[bool]:
+    """
+    Ověří kandidáty na kód diagnózy.
+
+    Args:
+        codes: Kandidáti ve formátu kódu MKN-10
+        code_table: Tabulka kódů (výchozí: load_diagnosis_table())
+
+    Returns:
+        Výsledek validace pro každého kandidáta
+    """
+    table = code_table if code_table is not None else load_diagnosis_table()
+    return [table.contains(code) for code in codes]
@@ -0,0 +1,84 @@
+import logging
+import re
+from typing import Iterable, List, NamedTuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+class KeywordHit(NamedTuple):
+    """
+    Výskyt klíčového slova v textu.
+    """
+    start: int
+    end: int
+    keyword: str
+
+
+class KeywordMatcher:
+    """
+    Předkompilované vyhledávání více klíčových slov jedním průchodem textu.
+
+    Klíčová slova tvoří jeden regulární výraz (alternativy od nejdelší, aby
+    "fakultní nemocnice" měla přednost před "nemocnice" na stejné pozici),
+    který se pouští nad textem převedeným na malá písmena. Nalezené jsou
+    všechny nepřekrývající se výskyty; cena je lineární v délce textu.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Inicializace vyhledávání.
+
+        Args:
+            keywords: Klíčová slova (porovnávají se bez ohledu na velikost písmen)
+        """
+        # Klíčové slovo malými písmeny -> původní zápis (první výskyt)
+        self.keywords = {}
+        for keyword in keywords:
+            self.keywords.setdefault(keyword.lower(), keyword)
+
+        alternatives = sorted(self.keywords, key=lambda keyword: (-len(keyword), keyword))
+        self.pattern = re.compile("|".join(re.escape(keyword) for keyword in alternatives))
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """
+        Najde všechny výskyty klíčových slov.
+
+        Args:
+            text: Prohledávaný text
+
+        Returns:
+            Výskyty seřazené podle pozice (pozice v původním textu)
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Malá písmena mění délku textu (např. "İ"), pozice by neodpovídaly
+            return self._find_all_by_char(text)
+
+        return [
+            KeywordHit(match.start(), match.end(), self.keywords[match.group()])
+            for match in self.pattern.finditer(lowered)
+        ]
+
+    def _find_all_by_char(self, text: str) -> List[KeywordHit]:
+        """
+        Najde výskyty v textu, u kterého převod na malá písmena mění délku.
+
+        Každý znak se převede zvlášť; znaky, které by délku změnily, se
+        ponechají, takže pozice zůstávají zachovány.
+
+        Args:
+            text: Prohledávaný text
+
+        Returns:
+            Výskyty seřazené podle pozice
+        """
+        lowered = "".join(char if len(char.lower()) != 1 else char.lower() for char in text)
+        return [
+            KeywordHit(match.start(), match.end(), self.keywords[match.group()])
+            for match in self.pattern.finditer(lowered)
+        ]
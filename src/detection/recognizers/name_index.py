@@ -0,0 +1,291 @@
+import logging
+import mmap
+import os
+import re
+import struct
+import unicodedata
+import zlib
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Index názvů zdravotnických zařízení z build_name_index (prázdný = bez gazetteeru)
+DEFAULT_FACILITY_GAZETTEER = os.environ.get("ANONYMIZER_FACILITY_GAZETTEER") or None
+
+# Index ulic, obcí a PSČ z build_name_index (prázdný = adresy podle pevných oken)
+DEFAULT_ADDRESS_INDEX = os.environ.get("ANONYMIZER_ADDRESS_INDEX") or None
+
+# Formát souboru (little endian):
+#   hlavička: magic (8 B), počet jmen (u32), log2 počtu bitů filtru prvních slov (u32)
+#   filtr začátků: bitmapa podle crc32 prvního slova jednoslovných jmen
+#     a prvních dvou slov víceslovných jmen
+#   posuny: u32 * (počet + 1), začátky jmen v bloku dat
+#   data: jména v UTF-8 seřazená podle bajtů
+_MAGIC = b"MDNIDX02"
+_HEADER = struct.Struct("<8sII")
+
+# Velikost filtru začátků jmen (2^20 bitů = 128 KiB)
+DEFAULT_FILTER_BITS_LOG2 = 20
+
+# Slovo pro normalizaci jmen i textu
+_WORD = re.compile(r"\w+")
+
+
+def _strip_diacritics(value: str) -> str:
+    """Odstraní diakritiku (v klinických textech se často píše bez ní)."""
+    return "".join(char for char in unicodedata.normalize("NFD", value) if not unicodedata.combining(char))
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizuje jméno pro index (malá písmena bez diakritiky, jen slova oddělená mezerou).
+
+    Args:
+        name: Jméno (např. název zdravotnického zařízení)
+
+    Returns:
+        Normalizované jméno
+    """
+    return " ".join(_WORD.findall(_strip_diacritics(name.lower())))
+
+
+class NameMatch(NamedTuple):
+    """
+    Výskyt jména z indexu v textu.
+    """
+    start: int
+    end: int
+    name: str
+
+
+def build_name_index(names: Iterable[str], output_path: str, filter_bits_log2: int = DEFAULT_FILTER_BITS_LOG2) -> int:
+    """
+    Sestaví soubor indexu jmen (offline krok).
+
+    Args:
+        names: Jména (normalizují se, duplicity a prázdná jména se vynechají)
+        output_path: Cesta k výstupnímu souboru
+        filter_bits_log2: log2 počtu bitů filtru začátků jmen
+
+    Returns:
+        Počet jmen v indexu
+    """
+    encoded = sorted({normalize_name(name).encode("utf-8") for name in names} - {b""})
+
+    bloom = bytearray((1 << filter_bits_log2) // 8)
+    mask = (1 << filter_bits_log2) - 1
+    for name in encoded:
+        bit = zlib.crc32(_filter_key(name.split(b" ", 2)[:2])) & mask
+        bloom[bit >> 3] |= 1 << (bit & 7)
+
+    offsets = [0]
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    if offsets[-1] >= 2 ** 32:
+        raise ValueError("Name index data exceeds 4 GiB")
+
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(encoded), filter_bits_log2))
+        f.write(bloom)
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        for name in encoded:
+            f.write(name)
+    os.replace(temp_path, output_path)
+
+    logger.info(f"Built name index {output_path} with {len(encoded)} names")
+    return len(encoded)
+
+
+class NameIndex:
+    """
+    Seřazený index jmen namapovaný do paměti.
+
+    Soubor se mapuje jen pro čtení, takže jej pracovní procesy sdílejí přes
+    stránkovou cache operačního systému a žádný nedrží vlastní kopii. Jména
+    se v textu hledají od začátku každého slova: filtr začátků jmen (první
+    slovo, u víceslovných jmen první dvě) vyřadí většinu pozic bez binárního
+    vyhledávání, na ostatních se rozsah jmen se shodným prefixem zužuje slovo
+    po slově a vrací se nejdelší shoda.
+    """
+
+    def __init__(self, path: str, max_words: int = 12):
+        """
+        Otevře soubor indexu.
+
+        Args:
+            path: Cesta k souboru z build_name_index
+            max_words: Nejvyšší počet slov jména
+
+        Raises:
+            ValueError: Pokud soubor není index jmen
+        """
+        self.path = path
+        self.max_words = max_words
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, filter_bits_log2 = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a name index")
+
+        self._filter_offset = _HEADER.size
+        self._filter_mask = (1 << filter_bits_log2) - 1
+        self._offsets_offset = self._filter_offset + (1 << filter_bits_log2) // 8
+        self._data_offset = self._offsets_offset + 4 * (self.count + 1)
+
+    def __getstate__(self) -> dict:
+        """Stav pro pickle (snapshot enginu) - soubor se po načtení znovu namapuje."""
+        return {"path": self.path, "max_words": self.max_words}
+
+    def __setstate__(self, state: dict) -> None:
+        """Obnovení ze snapshotu enginu."""
+        self.__init__(state["path"], state["max_words"])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _name_at(self, i: int) -> bytes:
+        """Vrátí i-té jméno indexu (UTF-8)."""
+        start, end = struct.unpack_from("<II", self._mmap, self._offsets_offset + 4 * i)
+        return self._mmap[self._data_offset + start:self._data_offset + end]
+
+    def _lower_bound(self, key: bytes, low: int = 0, high: Optional[int] = None) -> int:
+        """Vrátí první pozici, jejíž jméno není menší než key."""
+        high = self.count if high is None else high
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _may_start_with(self, words: List[bytes]) -> bool:
+        """Zjistí z filtru, zda může některé jméno začínat danými slovy (jedno či dvě)."""
+        bit = zlib.crc32(_filter_key(words)) & self._filter_mask
+        return bool(self._mmap[self._filter_offset + (bit >> 3)] & (1 << (bit & 7)))
+
+    def contains(self, name: str) -> bool:
+        """
+        Zjistí, zda index obsahuje jméno.
+
+        Args:
+            name: Jméno (normalizuje se)
+
+        Returns:
+            True, pokud je jméno v indexu
+        """
+        key = normalize_name(name).encode("utf-8")
+        i = self._lower_bound(key)
+        return i < self.count and self._name_at(i) == key
+
+    def find_all(self, text: str) -> List[NameMatch]:
+        """
+        Najde v textu nejdelší nepřekrývající se výskyty jmen z indexu.
+
+        Args:
+            text: Prohledávaný text
+
+        Returns:
+            Výskyty seřazené podle pozice
+        """
+        if not self.count:
+            return []
+
+        words: List[Tuple[int, int, bytes]] = [
+            (match.start(), match.end(), _strip_diacritics(match.group().lower()).encode("utf-8"))
+            for match in _WORD.finditer(text)
+        ]
+
+        matches = []
+        i = 0
+        while i < len(words):
+            match_end = self._match_at(words, i)
+            if match_end is None:
+                i += 1
+                continue
+            start, end = words[i][0], words[match_end][1]
+            matches.append(NameMatch(start, end, text[start:end]))
+            i = match_end + 1
+        return matches
+
+    def _match_at(self, words: List[Tuple[int, int, bytes]], first: int) -> Optional[int]:
+        """
+        Najde nejdelší jméno začínající slovem first.
+
+        Args:
+            words: Slova textu (začátek, konec, normalizované slovo)
+            first: Index prvního slova
+
+        Returns:
+            Index posledního slova nejdelší shody, nebo None
+        """
+        first_word = words[first][2]
+        if not self._may_start_with([first_word]) and not (
+            first + 1 < len(words) and self._may_start_with([first_word, words[first + 1][2]])
+        ):
+            return None
+
+        low, high = 0, self.count
+        prefix = b""
+        longest = None
+        for i in range(first, min(len(words), first + self.max_words)):
+            prefix = words[i][2] if i == first else prefix + b" " + words[i][2]
+
+            # Jméno rovné prefixu
+            low = self._lower_bound(prefix, low, high)
+            if low < high and self._name_at(low) == prefix:
+                longest = i
+
+            # Jména pokračující dalším slovem leží v rozsahu [prefix + " ", prefix + "!")
+            low = self._lower_bound(prefix + b" ", low, high)
+            high = self._lower_bound(prefix + b"!", low, high)
+            if low >= high:
+                break
+        return longest
+
+
+def _filter_key(words: List[bytes]) -> bytes:
+    """Klíč filtru začátků jmen pro jedno (celé jméno) nebo dvě první slova."""
+    return bytes([len(words)]) + b" ".join(words)
+
+
+def get_index_identity(path: Optional[str]) -> Optional[str]:
+    """
+    Vrátí identitu souboru indexu (pro verzi enginu a otisk snapshotu).
+
+    Args:
+        path: Cesta k souboru indexu
+
+    Returns:
+        Řetězec z cesty, velikosti a času změny, nebo None bez indexu
+    """
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def load_name_index(path: Optional[str]) -> Optional[NameIndex]:
+    """
+    Otevře index jmen, pokud je nakonfigurován a existuje.
+
+    Args:
+        path: Cesta k souboru indexu, None = bez indexu
+
+    Returns:
+        Index, nebo None
+    """
+    if not path:
+        return None
+    if not os.path.exists(path):
+        logger.warning(f"Name index {path} not found")
+        return None
+    return NameIndex(path)
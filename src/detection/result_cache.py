@@ -0,0 +1,184 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from src.common.models import Document, AnonymizedDocument
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Options, které nemění výsledek anonymizace (tvar odpovědi, časový rozpočet -
+# výsledky zkrácené kvůli rozpočtu se do cache neukládají)
+_KEY_EXCLUDED_OPTIONS = {"response_mode", "deadline_ms"}
+
+
+class ResultCache:
+    """
+    LRU cache výsledků anonymizace adresovaná obsahem dokumentu.
+
+    Klíčem je hash obsahu, efektivní konfigurace a verze enginu. Cache je
+    omezena celkovou velikostí uložených výsledků a dobou platnosti (TTL).
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 3600, engine_version: str = ""):
+        """
+        Inicializace cache.
+
+        Args:
+            max_bytes: Maximální odhadovaná velikost uložených výsledků v bajtech
+            ttl_seconds: Doba platnosti záznamu v sekundách
+            engine_version: Verze enginu (součást klíče, změna verze cache zneplatní)
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.engine_version = engine_version
+        self.entries: "OrderedDict[str, Tuple[AnonymizedDocument, int, float]]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def make_key(self, document: Document, configuration_id: Optional[str] = None, options: Optional[Dict] = None) -> str:
+        """
+        Vytvoří klíč z obsahu dokumentu a efektivní konfigurace.
+
+        Args:
+            document: Dokument ke zpracování
+            configuration_id: ID konfigurace
+            options: Options požadavku
+
+        Returns:
+            Hex SHA-256 klíč
+        """
+        effective_options = {
+            key: value for key, value in (options or {}).items()
+            if key not in _KEY_EXCLUDED_OPTIONS
+        }
+        # Pořadí požadovaných entit výsledek nemění
+        if isinstance(effective_options.get("entities"), list):
+            effective_options["entities"] = sorted(effective_options["entities"])
+        config = json.dumps(
+            {
+                "configuration_id": configuration_id,
+                "options": effective_options,
+                "content_type": document.content_type,
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+        digest = hashlib.sha256()
+        digest.update(self.engine_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(config.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(document.content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str, document: Document) -> Optional[AnonymizedDocument]:
+        """
+        Vrátí uložený výsledek přizpůsobený danému dokumentu.
+
+        Identifikátor a metadata dokumentu nejsou součástí klíče, proto se
+        do výsledku doplní z aktuálního požadavku.
+
+        Args:
+            key: Klíč z make_key
+            document: Aktuální dokument
+
+        Returns:
+            Anonymizovaný dokument, nebo None při chybějícím či prošlém záznamu
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, size, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return result.model_copy(update={
+            "original_document_id": document.id,
+            "metadata": document.metadata,
+        })
+
+    def put(self, key: str, result: AnonymizedDocument) -> None:
+        """
+        Uloží výsledek do cache a podle potřeby vyřadí nejstarší záznamy.
+
+        Args:
+            key: Klíč z make_key
+            result: Anonymizovaný dokument
+        """
+        size = self._estimate_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+
+            self.entries[key] = (result, size, time.monotonic() + self.ttl_seconds)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Vrátí statistiky cache.
+
+        Returns:
+            Slovník s počty zásahů, výpadků, vyřazení a velikostí cache
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Odstraní záznam (volající drží zámek)."""
+        _, size, _ = self.entries.pop(key)
+        self.current_bytes -= size
+
+    @staticmethod
+    def _estimate_size(result: AnonymizedDocument) -> int:
+        """
+        Odhadne paměťovou náročnost výsledku.
+
+        Args:
+            result: Anonymizovaný dokument
+
+        Returns:
+            Odhadovaná velikost v bajtech
+        """
+        size = 256 + 2 * len(result.content)
+        for entity in result.entities:
+            original = entity.original_entity
+            size += 256 + 2 * (len(original.text) + len(original.context or "") + len(entity.anonymized_text))
+        return size
@@ -270,6 +270,8 @@ def main():
         - `CZECH_DIAGNOSIS_CODE` - Kód diagnózy (MKN-10)
         - `CZECH_MEDICAL_FACILITY` - Zdravotnické zařízení
         - `CZECH_ADDRESS` - Česká adresa
+        - `CZECH_ICO` - IČO
+        - `CZECH_ICP` - Identifikační číslo pracoviště (IČP)
         
         ### Kontakt a podpora
         
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 import requests
 from fastapi.testclient import TestClient
@@ -5,10 +7,13 @@ from fastapi.testclient import TestClient
 from src.api.main import app
 from src.common.models import Document, DocumentType
 
-# Vytvoření test klienta
-client = TestClient(app)
+# Vytvoření test klienta (kontextový manažer spouští lifespan a zahřátí služby)
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpointu."""
     response = client.get("/health")
     assert response.status_code == 200
@@ -18,8 +23,10 @@ def test_health_check():
     assert "components" in data
     assert data["components"]["api"] == "ok"
     assert data["components"]["presidio"] == "ok"
+    assert data["presidio_warmup_ms"] is not None
+    assert data["pid"] is not None
 
-def test_anonymize_endpoint():
+def test_anonymize_endpoint(client):
     """Test anonymizačního endpointu s jednoduchým dokumentem."""
     # Vytvoření testovacího dokumentu
     document = Document(
@@ -57,8 +64,160 @@ def test_anonymize_endpoint():
     # (Presidio by mělo detekovat jméno, datum narození, rodné číslo a adresu)
     assert data["statistics"]["total_entities_detected"] > 0
 
+def test_anonymize_text_mode(client):
+    """Režim odpovědi "text" vrací pouze anonymizovaný text."""
+    request_data = {
+        "document": Document(content="Pacient Jan Novák, rodné číslo 800615/1234.").dict(),
+        "options": {"response_mode": "text"}
+    }
+    
+    response = client.post("/api/v1/anonymize", json=request_data)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "content" in data
+    assert "entities" not in data
+    assert int(response.headers["X-Payload-Bytes"]) == len(response.content)
+
+def test_anonymize_batch_endpoint(client):
+    """Test dávkového anonymizačního endpointu."""
+    documents = [
+        Document(content="Pacient Jan Novák, rodné číslo 800615/1234, diagnóza J45.0."),
+        Document(content="Pacientka Marie Svobodová, bytem náměstí Míru 45, Brno, 602 00."),
+    ]
+    
+    request_data = {
+        "documents": [document.dict() for document in documents],
+        "configuration_id": None,
+        "options": None
+    }
+    
+    response = client.post("/api/v1/anonymize/batch", json=request_data)
+    
+    assert response.status_code == 200
+    data = response.json()
+    
+    # Výsledky jsou ve stejném pořadí jako vstupní dokumenty
+    assert len(data["documents"]) == len(documents)
+    for anonymized, original in zip(data["documents"], documents):
+        assert anonymized["content"] != original.content
+    assert data["statistics"]["total_documents"] == len(documents)
+
+def test_metrics_endpoint(client):
+    """Metriky obsahují doby fází zpracování a počty dokumentů."""
+    request_data = {"document": Document(content="Rodné číslo 760506/1234, diagnóza C50.1.").dict()}
+    response = client.post("/api/v1/anonymize", json=request_data)
+    assert response.status_code == 200
+    statistics = response.json()["statistics"]
+    assert statistics["processing_time_ms"] > 0
+    assert "analysis" in statistics["stage_timings_ms"]
+    assert "recognizer:CzechBirthNumberRecognizer" in statistics["stage_timings_ms"]
+    
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'anonymizer_stage_duration_seconds_count{stage="nlp"}' in response.text
+    assert 'anonymizer_stage_duration_seconds_count{stage="serialization"}' in response.text
+    assert "anonymizer_documents_processed_total" in response.text
+    assert "anonymizer_queue_depth 0" in response.text
+    assert "# TYPE anonymizer_cache_misses_total counter" in response.text
+
+def test_anonymize_deadline(client):
+    """Při vyčerpaném rozpočtu se drahé fáze vynechají, vzorové rozpoznávače běží."""
+    request_data = {
+        "document": Document(content="Pacient Karel Dvořák, rodné číslo 790512/4431.").dict(),
+        "options": {"deadline_ms": 0.001}
+    }
+    
+    response = client.post("/api/v1/anonymize", json=request_data)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["statistics"]["degraded_stages"] == ["address_scan", "facility_scan", "nlp"]
+    assert response.headers["X-Degraded-Stages"] == "address_scan,facility_scan,nlp"
+    assert "790512/4431" not in data["content"]
+
+def test_anonymize_prefilter_skips_recognizers(client):
+    """Rozpoznávače bez potřebných rysů dokumentu se nespouští."""
+    request_data = {"document": Document(content="Pacient udává bolesti hlavy trvající několik dní.").dict()}
+    
+    response = client.post("/api/v1/anonymize", json=request_data)
+    
+    assert response.status_code == 200
+    skipped_recognizers = response.json()["statistics"]["skipped_recognizers"]
+    assert skipped_recognizers["CzechBirthNumberRecognizer"] == 1
+    assert skipped_recognizers["CzechMedicalFacilityRecognizer"] == 1
+    assert skipped_recognizers["EmailRecognizer"] == 1
+
+def test_anonymize_invalid_deadline(client):
+    """Neplatný časový rozpočet vrací 400."""
+    request_data = {"document": Document(content="Text").dict(), "options": {"deadline_ms": -5}}
+    response = client.post("/api/v1/anonymize", json=request_data)
+    assert response.status_code == 400
+
+def test_anonymize_pattern_entities_skip_nlp(client):
+    """Při požadavku jen na vzorové entity se spaCy nespouští."""
+    text = "Pacient Jan Novák, rodné číslo 800615/1230, pojištěnec 7605061234, diagnóza J45.0."
+    request_data = {
+        "document": Document(content=text).dict(),
+        "options": {"entities": ["CZECH_BIRTH_NUMBER", "CZECH_DIAGNOSIS_CODE"]}
+    }
+    
+    response = client.post("/api/v1/anonymize", json=request_data)
+    
+    assert response.status_code == 200
+    statistics = response.json()["statistics"]
+    assert "nlp" not in statistics["stage_timings_ms"]
+    assert set(statistics["entities_by_type"]) <= {"CZECH_BIRTH_NUMBER", "CZECH_DIAGNOSIS_CODE"}
+    assert statistics["entities_by_type"]["CZECH_BIRTH_NUMBER"] == 1
+    
+    presidio_service = client.app.state.presidio_service
+    assert not presidio_service.requires_nlp(["CZECH_BIRTH_NUMBER", "CZECH_HEALTH_INSURANCE_NUMBER"])
+    assert presidio_service.requires_nlp(["CZECH_BIRTH_NUMBER", "PERSON"])
+    assert presidio_service.requires_nlp(None)
+
+def test_anonymize_unknown_entity(client):
+    """Nepodporovaný typ entity vrací 400."""
+    request_data = {"document": Document(content="Text").dict(), "options": {"entities": ["UNKNOWN_ENTITY"]}}
+    response = client.post("/api/v1/anonymize", json=request_data)
+    assert response.status_code == 400
+
+def test_inline_job(client):
+    """Test asynchronní úlohy s dokumenty předanými v požadavku."""
+    documents = [
+        Document(id=f"doc-{i}", content="Pacient Jan Novák, rodné číslo 800615/1234, diagnóza J45.0.")
+        for i in range(3)
+    ]
+    
+    response = client.post("/api/v1/jobs", json={"documents": [document.dict() for document in documents]})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    
+    # Čekání na dokončení úlohy
+    for _ in range(100):
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.1)
+    
+    assert job["status"] == "completed"
+    assert job["processed"] == len(documents)
+    
+    # Stránkování výsledků
+    page = client.get(f"/api/v1/jobs/{job_id}/results", params={"offset": 1, "limit": 1}).json()
+    assert page["total"] == len(documents)
+    assert len(page["results"]) == 1
+    assert page["results"][0]["document_id"] == "doc-1"
+    assert page["results"][0]["success"] is True
+
+def test_job_requires_single_source(client):
+    """Úloha musí mít právě jeden zdroj dokumentů."""
+    response = client.post("/api/v1/jobs", json={})
+    assert response.status_code == 400
+
 if __name__ == "__main__":
     # Spuštění testů manuálně
-    test_health_check()
-    test_anonymize_endpoint()
+    with TestClient(app) as test_client:
+        test_health_check(test_client)
+        test_anonymize_endpoint(test_client)
+        test_anonymize_batch_endpoint(test_client)
     print("Všechny testy prošly úspěšně!")
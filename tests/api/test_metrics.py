@@ -0,0 +1,21 @@
+from src.common.metrics import MetricsRegistry
+
+
+def test_worker_metrics_are_merged(tmp_path):
+    """Každý pracovník serveru vrátí v /metrics řady všech pracovníků, HELP a TYPE jen jednou."""
+    workers = []
+    for worker in ("0", "1"):
+        registry = MetricsRegistry()
+        registry.enable_multiprocess(str(tmp_path), worker)
+        registry.observe_document("Rodné číslo 760506/1234", {"entities_by_type": {"CZECH_BIRTH_NUMBER": 1}})
+        registry.set_gauge("anonymizer_queue_depth", int(worker), "Requests currently queued")
+        workers.append(registry)
+
+    workers[0].render()
+    text = workers[1].render()
+
+    assert 'anonymizer_documents_processed_total{worker="0"} 1' in text
+    assert 'anonymizer_documents_processed_total{worker="1"} 1' in text
+    assert 'anonymizer_entities_detected_total{worker="1",entity_type="CZECH_BIRTH_NUMBER"} 1' in text
+    assert 'anonymizer_queue_depth{worker="0"} 0' in text
+    assert text.count("# TYPE anonymizer_documents_processed_total counter") == 1
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from src.api.micro_batcher import MicroBatcher
+from src.api.worker_pool import QueueFullError
+from src.common.models import Document, AnonymizedDocument
+
+
+class RecordingPool:
+    """Pool, který zaznamenává velikosti dávek a vrací obsah v pořadí vstupu."""
+
+    def __init__(self, max_queue_depth=32):
+        self.batch_sizes = []
+        self.max_queue_depth = max_queue_depth
+        self.queue_depth = 0
+
+    def reserve(self, count=1):
+        if self.queue_depth + count > self.max_queue_depth:
+            raise QueueFullError("full")
+        self.queue_depth += count
+
+    def release(self, count=1):
+        self.queue_depth -= count
+
+    async def process_documents(
+        self, documents, deadlines=None, requested_entities=None, requested_nlp_profiles=None, reserved=False
+    ):
+        self.batch_sizes.append(len(documents))
+        if any(document.content == "chybný" for document in documents):
+            raise ValueError("chybný dokument")
+        return [
+            AnonymizedDocument(original_document_id=document.id, content=document.content.upper())
+            for document in documents
+        ]
+
+
+def test_concurrent_requests_are_coalesced():
+    """Souběžné požadavky se zpracují v jedné dávce a výsledky se vrátí správným volajícím."""
+    pool = RecordingPool()
+
+    async def run():
+        batcher = MicroBatcher(pool, max_batch_size=8, max_wait_ms=20)
+        documents = [Document(id=str(i), content=f"dokument {i}") for i in range(5)]
+        return documents, await asyncio.gather(*(batcher.submit(document) for document in documents))
+
+    documents, results = asyncio.run(run())
+
+    assert pool.batch_sizes == [5]
+    for document, result in zip(documents, results):
+        assert result.original_document_id == document.id
+        assert result.content == document.content.upper()
+
+
+def test_batch_size_limit():
+    """Dávka nepřekročí maximální velikost."""
+    pool = RecordingPool()
+
+    async def run():
+        batcher = MicroBatcher(pool, max_batch_size=2, max_wait_ms=20)
+        documents = [Document(id=str(i), content=f"dokument {i}") for i in range(5)]
+        return await asyncio.gather(*(batcher.submit(document) for document in documents))
+
+    results = asyncio.run(run())
+
+    assert len(results) == 5
+    assert sorted(pool.batch_sizes) == [1, 2, 2]
+
+
+def test_failing_document_does_not_fail_other_requests():
+    """Po selhání dávky se dokumenty zpracují jednotlivě, chybu dostane jen vadný požadavek."""
+    pool = RecordingPool()
+
+    async def run():
+        batcher = MicroBatcher(pool, max_batch_size=8, max_wait_ms=20)
+        documents = [Document(id=str(i), content=content) for i, content in enumerate(["a", "chybný", "b"])]
+        return await asyncio.gather(*(batcher.submit(document) for document in documents), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert [result.content for result in (results[0], results[2])] == ["A", "B"]
+    assert isinstance(results[1], ValueError)
+    assert pool.queue_depth == 0
+
+
+def test_pending_requests_count_against_queue_depth():
+    """Čekající požadavky zabírají místa ve frontě, nad limit se odmítnou."""
+    pool = RecordingPool(max_queue_depth=2)
+
+    async def run():
+        batcher = MicroBatcher(pool, max_batch_size=8, max_wait_ms=20)
+        submitted = [asyncio.ensure_future(batcher.submit(Document(id=str(i), content="x"))) for i in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await batcher.submit(Document(id="2", content="x"))
+        return await asyncio.gather(*submitted)
+
+    assert len(asyncio.run(run())) == 2
+    assert pool.queue_depth == 0
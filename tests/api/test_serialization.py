@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from src.api.serialization import get_response_mode, serialize_document
+from src.common.models import AnonymizedDocument, AnonymizedEntity, DetectedEntity
+
+
+def _document():
+    entity = DetectedEntity(
+        entity_type="CZECH_BIRTH_NUMBER",
+        start=14,
+        end=25,
+        score=1.0,
+        text="800615/1234",
+        context="rodné číslo 800615/1234, diagnóza",
+    )
+    return AnonymizedDocument(
+        original_document_id="doc-1",
+        content="rodné číslo <CZECH_BIRTH_NUMBER>",
+        entities=[AnonymizedEntity(original_entity=entity, anonymized_text="<CZECH_BIRTH_NUMBER>", operator_name="replace")],
+        statistics={"total_entities_detected": 1},
+    )
+
+
+def test_response_modes():
+    """Režimy text a spans vynechávají kontext a zmenšují odpověď."""
+    document = _document()
+    sizes = {}
+    for mode in ("text", "spans", "full"):
+        payload = serialize_document(document, mode)
+        sizes[mode] = len(payload)
+        data = json.loads(payload)
+        assert data["content"] == document.content
+        assert data["original_document_id"] == "doc-1"
+
+        if mode == "text":
+            assert "entities" not in data
+        elif mode == "spans":
+            assert data["entities"][0]["start"] == 14
+            assert "context" not in data["entities"][0]
+        else:
+            assert data["entities"][0]["original_entity"]["context"] == document.entities[0].original_entity.context
+
+    assert sizes["text"] < sizes["spans"] < sizes["full"]
+
+
+def test_invalid_response_mode():
+    """Neznámý režim je odmítnut."""
+    assert get_response_mode(None) == "full"
+    with pytest.raises(ValueError):
+        get_response_mode({"response_mode": "compact"})
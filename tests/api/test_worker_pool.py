@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from src.api.worker_pool import AnonymizationPool, QueueFullError, PoolUnavailableError
+from src.common.models import Document
+
+
+def test_pool_not_started():
+    """Nespuštěný pool odmítá požadavky jako nedostupný."""
+    pool = AnonymizationPool(max_workers=0, max_queue_depth=4)
+    with pytest.raises(PoolUnavailableError):
+        asyncio.run(pool.process_document(Document(content="test")))
+
+
+def test_pool_queue_full():
+    """Po dosažení hloubky fronty pool odmítá další požadavky."""
+    pool = AnonymizationPool(max_workers=0, max_queue_depth=0, presidio_service=object())
+    pool.start()
+    try:
+        with pytest.raises(QueueFullError):
+            asyncio.run(pool.process_document(Document(content="test")))
+        assert pool.queue_depth == 0
+    finally:
+        pool.shutdown()
+
+
+def test_job_service_waits_for_queue_slot():
+    """Úloha na pozadí při plné frontě poolu počká na volné místo místo selhání."""
+    import threading
+
+    from src.batch.job_runner import PooledAnonymizationService
+    from src.common.models import AnonymizedDocument
+
+    class Service:
+        is_ready = True
+
+        def process_documents(self, documents, deadlines=None, requested_entities=None, requested_nlp_profiles=None):
+            return [AnonymizedDocument(original_document_id=document.id, content="[X]") for document in documents]
+
+    pool = AnonymizationPool(max_workers=0, max_queue_depth=1, presidio_service=Service())
+    pool.start()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        service = PooledAnonymizationService(pool, loop, threading.Event(), retry_interval_seconds=0.01)
+        pool.reserve()  # Frontu zabírá souběžný požadavek API
+        job = loop.run_in_executor(None, service.process_document, Document(id="1", content="text"))
+        await asyncio.sleep(0.05)
+        pool.release()
+        return await job
+
+    try:
+        assert asyncio.run(run()).original_document_id == "1"
+        assert pool.queue_depth == 0
+    finally:
+        pool.shutdown()
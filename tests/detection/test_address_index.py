@@ -0,0 +1,62 @@
+from src.detection.build_name_index import read_names
+from src.detection.overlap_resolver import EXACT_MATCH_KEY
+from src.detection.recognizers.czech_address_recognizer import CzechAddressRecognizer
+from src.detection.recognizers.name_index import NameIndex, build_name_index
+
+
+def _build_address_index(tmp_path):
+    csv_path = tmp_path / "ruian.csv"
+    csv_path.write_text(
+        "Kód ADM;Název obce;Název ulice;PSČ\n"
+        "1;Praha;Dlouhá;11000\n"
+        "2;Praha;Vinohradská;12000\n"
+        "3;Brno;Husova;60200\n",
+        encoding="utf-8",
+    )
+    index_path = tmp_path / "addresses.idx"
+    build_name_index(read_names(str(csv_path), ["Název obce", "Název ulice", "PSČ"]), str(index_path))
+    return NameIndex(str(index_path))
+
+
+def test_address_is_bounded_by_index(tmp_path):
+    """Adresa potvrzená indexem zahrnuje jen ulici, číslo, PSČ a obec."""
+    recognizer = CzechAddressRecognizer(supported_language="en", address_index=_build_address_index(tmp_path))
+    text = "Pacient Jan Novák, narozen 1970, bytem Dlouhá 12, 110 00 Praha 1, tel. 777 888 999."
+
+    results = recognizer.analyze(text, ["CZECH_ADDRESS"], None)
+
+    assert [text[r.start:r.end] for r in results] == ["Dlouhá 12, 110 00 Praha 1"]
+    assert results[0].recognition_metadata[EXACT_MATCH_KEY]
+
+
+def test_unconfirmed_zip_keeps_window(tmp_path):
+    """PSČ, které index nepotvrdí, se hledá v pevném okně jako bez indexu."""
+    text = "Výsledek vyšetření: hodnota 123 45 mimo rozsah."
+    with_index = CzechAddressRecognizer(supported_language="en", address_index=_build_address_index(tmp_path))
+
+    results = with_index.analyze(text, ["CZECH_ADDRESS"], None)
+    expected = CzechAddressRecognizer(supported_language="en").analyze(text, ["CZECH_ADDRESS"], None)
+
+    assert [(r.start, r.end, r.score) for r in results] == [(r.start, r.end, r.score) for r in expected]
+    assert EXACT_MATCH_KEY not in results[0].recognition_metadata
+
+
+def test_street_without_diacritics_is_chained(tmp_path):
+    """Název ulice napsaný bez diakritiky se v indexu najde a zůstane v adrese."""
+    recognizer = CzechAddressRecognizer(supported_language="en", address_index=_build_address_index(tmp_path))
+    text = "bytem Vinohradska 12, 120 00 Praha 2"
+
+    results = recognizer.analyze(text, ["CZECH_ADDRESS"], None)
+
+    assert [text[r.start:r.end] for r in results] == ["Vinohradska 12, 120 00 Praha 2"]
+
+
+def test_zip_confirmed_without_street_keeps_window_start(tmp_path):
+    """Bez názvu z indexu před PSČ okno před PSČ zůstává, potvrzení jen zvýší skóre."""
+    recognizer = CzechAddressRecognizer(supported_language="en", address_index=_build_address_index(tmp_path))
+    text = "bytem Lipová 12, 120 00 Praha 2"
+
+    results = recognizer.analyze(text, ["CZECH_ADDRESS"], None)
+
+    assert [(text[r.start:r.end], r.score) for r in results] == [(text, 0.8)]
+    assert EXACT_MATCH_KEY not in results[0].recognition_metadata
@@ -0,0 +1,20 @@
+import random
+
+from src.detection.recognizers.birth_number_validation import is_valid_birth_number, validate_birth_numbers
+
+
+def test_vectorized_validation_matches_scalar():
+    """Vektorová validace dává stejné výsledky jako validace po jednom."""
+    random.seed(11)
+    candidates = []
+    for _ in range(5000):
+        digits = "".join(random.choice("0123456789") for _ in range(random.choice([9, 10])))
+        month = random.choice([None, "01", "12", "13", "51", "62", "63", "00"])
+        if month:
+            digits = digits[:2] + month + digits[4:]
+        candidates.append(digits[:6] + "/" + digits[6:] if random.random() < 0.5 else digits)
+    # Kontrolní číslice 0 při zbytku 10, jiné než ASCII číslice, neobvyklá délka
+    candidates += ["0001010010", "٨٠٠٦١٥١٢٣٠", "800615/12", "8006151230"]
+
+    assert validate_birth_numbers(candidates) == [is_valid_birth_number(candidate) for candidate in candidates]
+    assert any(validate_birth_numbers(candidates))
@@ -0,0 +1,39 @@
+import random
+import re
+
+from src.detection.recognizers.candidate_scanner import CANDIDATE_PATTERNS, CandidateScanner
+
+
+def _finditer_candidates(text):
+    return {
+        kind: [(m.start(), m.end(), m.group(1)) for m in re.finditer(pattern, text)]
+        for kind, (_, pattern) in CANDIDATE_PATTERNS.items()
+    }
+
+
+def test_scan_matches_separate_patterns():
+    """Jeden průchod najde stejné kandidáty jako samostatné regulární výrazy."""
+    random.seed(7)
+    alphabet = "0123456789 /.JCX\nab"
+    texts = ["".join(random.choice(alphabet) for _ in range(300)) for _ in range(50)]
+    texts.append("Pacient, r.č. 800615/1230, Dg. J45.0, bytem Dlouhá 12, 110 00 Praha 1")
+
+    scanner = CandidateScanner()
+    for text in texts:
+        candidates = scanner.scan(text)
+        found = {
+            kind: [(c.start, c.end, c.value) for c in candidates[kind]]
+            for kind in CANDIDATE_PATTERNS
+        }
+        assert found == _finditer_candidates(text)
+
+
+def test_scan_is_memoized_per_text():
+    """Opakovaný dotaz na stejný text skenuje jen jednou."""
+    scanner = CandidateScanner()
+    text = "r.č. 800615/1230, PSČ 110 00"
+
+    first = scanner.scan(text)
+    assert scanner.get_candidates(text, "birth_number") is first["birth_number"]
+    assert [c.value for c in first["zip_code"]] == ["110 00"]
+    assert scanner.scan("jiný text") is not first
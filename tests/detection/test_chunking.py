@@ -0,0 +1,52 @@
+import re
+
+from presidio_analyzer import RecognizerResult
+
+from src.detection.chunking import merge_chunk_results, split_into_chunks
+
+BIRTH_NUMBER = re.compile(r"\b\d{6}/\d{4}\b")
+
+
+def _find_birth_numbers(text):
+    return [RecognizerResult("CZECH_BIRTH_NUMBER", m.start(), m.end(), 0.85) for m in BIRTH_NUMBER.finditer(text)]
+
+
+def _make_text(paragraphs=200):
+    return "\n\n".join(
+        f"Záznam {i}: pacient s rodným číslem 7605{i % 28 + 1:02d}/{1000 + i} byl vyšetřen a propuštěn domů."
+        for i in range(paragraphs)
+    )
+
+
+def test_chunks_cover_text_within_size():
+    """Části pokrývají celý text, nepřekročí limit a končí na hranici odstavce."""
+    text = _make_text()
+    chunks = split_into_chunks(text, chunk_size=1000, overlap=200)
+
+    assert len(chunks) > 1
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start < previous.end  # překryv
+        assert previous.owned_end == chunk.owned_start
+    for chunk in chunks[:-1]:
+        assert chunk.end - chunk.start <= 1000
+        assert text[chunk.end - 2:chunk.end] == "\n\n"
+
+
+def test_merged_results_match_whole_text_analysis():
+    """Sloučené výsledky odpovídají analýze celého textu bez duplicit."""
+    text = _make_text()
+    chunks = split_into_chunks(text, chunk_size=1000, overlap=200)
+
+    merged = merge_chunk_results([(chunk, _find_birth_numbers(text[chunk.start:chunk.end])) for chunk in chunks])
+
+    expected = [(r.start, r.end) for r in _find_birth_numbers(text)]
+    assert sorted((r.start, r.end) for r in merged) == expected
+    for result in merged:
+        assert BIRTH_NUMBER.fullmatch(text[result.start:result.end])
+
+
+def test_short_text_is_single_chunk():
+    """Krátký text se nedělí."""
+    chunks = split_into_chunks("Krátký text", chunk_size=1000, overlap=200)
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0, 11)]
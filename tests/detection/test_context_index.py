@@ -0,0 +1,40 @@
+import random
+
+from src.detection.recognizers.context_index import ContextKeywordIndex
+
+KEYWORDS = ["diagnóza", "diagnóza:", "dg.", "MKN-10", "rč", "r.č.", "rodné číslo"]
+
+
+def _naive_has_context(text, keywords, start, end, window):
+    before_text = text[max(0, start - window):start].lower()
+    after_text = text[end:min(len(text), end + window)].lower()
+    return any(keyword.lower() in before_text or keyword.lower() in after_text for keyword in keywords)
+
+
+def test_has_context_matches_window_search():
+    """Vyhledání v indexu odpovídá hledání klíčových slov v oknech."""
+    random.seed(11)
+    index = ContextKeywordIndex()
+    keywords = index.register(KEYWORDS)
+    words = ["Diagnóza:", "DG.", "mkn-10", "rč", "R.Č.", "rodné", "číslo", "J45.0", "pacient", "\n"]
+
+    for _ in range(30):
+        text = " ".join(random.choice(words) for _ in range(80))
+        for _ in range(40):
+            start = random.randrange(len(text))
+            end = min(len(text), start + random.randint(1, 10))
+            window = random.choice([5, 35, 50])
+            assert index.has_context(text, keywords, start, end, window) == _naive_has_context(
+                text, KEYWORDS, start, end, window
+            )
+
+
+def test_has_context_falls_back_for_length_changing_lowercase():
+    """Text, u kterého malá písmena mění pozice, se porovnává přímo v oknech."""
+    index = ContextKeywordIndex()
+    keywords = index.register(KEYWORDS)
+    text = "İİİ dg. J45.0"
+
+    assert index.get_positions(text) is None
+    assert index.has_context(text, keywords, 8, 13, 10)
+    assert not index.has_context(text, keywords, 8, 13, 2)
@@ -0,0 +1,76 @@
+from src.detection.recognizers.candidate_scanner import CandidateScanner
+from src.detection.recognizers.czech_registry import CzechRecognizerRegistry
+from src.detection.recognizers.declarative import DeclarativeRecognizer, parse_definitions, validate_ico
+
+
+def test_new_identifier_is_added_to_the_shared_scan():
+    """Nová definice přidá vzor do stejného skeneru, bez kontextu se nehlásí."""
+    patterns, definitions = parse_definitions({
+        "candidates": {"prescription_id": {"start_chars": "E", "pattern": r"\b(ERP-\d{6})\b"}},
+        "recognizers": [{
+            "id": "PrescriptionIdRecognizer",
+            "entity": "PRESCRIPTION_ID",
+            "candidate": "prescription_id",
+            "base_score": 0.6,
+            "context": ["eRecept"],
+            "context_score": 0.3,
+            "context_required": True,
+        }],
+    })
+    scanner = CandidateScanner()
+    scanner.add_patterns(patterns)
+    recognizer = DeclarativeRecognizer(definitions["PrescriptionIdRecognizer"], supported_language="en", scanner=scanner)
+    text = "eRecept ERP-123456 vystaven, r.č. 800615/1230, archivní číslo ERP-654321."
+
+    results = recognizer.analyze(text, ["PRESCRIPTION_ID"])
+
+    assert [(text[r.start:r.end], round(r.score, 2)) for r in results] == [("ERP-123456", 0.9)]
+    assert [c.value for c in scanner.scan(text)["birth_number"]] == ["800615/1230"]
+
+
+def test_builtin_definitions_register_ico_and_icp():
+    """Vestavěné definice přidají IČO a IČP, IČO se ověřuje kontrolní číslicí."""
+    from presidio_analyzer import RecognizerRegistry
+
+    registry = RecognizerRegistry(supported_languages=["en"])
+    CzechRecognizerRegistry.register_czech_recognizers(registry, supported_language="en")
+    text = "Poskytovatel IČO: 00216208, IČP 12345678; chybné IČO 00216207."
+
+    results = [
+        (result.entity_type, text[result.start:result.end])
+        for recognizer in registry.recognizers
+        if isinstance(recognizer, DeclarativeRecognizer)
+        for result in recognizer.analyze(text, ["CZECH_ICO", "CZECH_ICP"])
+    ]
+
+    assert sorted(results) == [("CZECH_ICO", "00216208"), ("CZECH_ICP", "12345678")]
+    assert validate_ico(["00216208", "00216207", "2559664"]) == [True, False, False]
+
+
+def test_definitions_file_overrides_builtin_recognizer(tmp_path):
+    """Definice se stejným id v souboru registru nahradí vestavěnou definici tenké třídy."""
+    import json
+
+    from presidio_analyzer import RecognizerRegistry
+
+    from src.detection.recognizers.czech_birth_number_recognizer import CzechBirthNumberRecognizer
+
+    definitions_file = tmp_path / "definitions.json"
+    definitions_file.write_text(json.dumps({
+        "recognizers": [{
+            "id": "CzechBirthNumberRecognizer",
+            "entity": "CZECH_BIRTH_NUMBER",
+            "candidate": "birth_number",
+            "validator": "birth_number",
+            "base_score": 0.5,
+        }],
+    }), encoding="utf-8")
+
+    registry = RecognizerRegistry(supported_languages=["en"])
+    CzechRecognizerRegistry.register_czech_recognizers(
+        registry, supported_language="en", recognizer_definitions=str(definitions_file)
+    )
+    recognizer = next(r for r in registry.recognizers if isinstance(r, CzechBirthNumberRecognizer))
+
+    assert recognizer.definition.base_score == 0.5
+    assert [round(r.score, 2) for r in recognizer.analyze("pacient 800615/1230", ["CZECH_BIRTH_NUMBER"])] == [0.5]
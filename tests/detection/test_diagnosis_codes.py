@@ -0,0 +1,31 @@
+import pickle
+
+from src.detection.build_name_index import read_names
+from src.detection.recognizers.czech_diagnosis_code_recognizer import CzechMedicalDiagnosisCodeRecognizer
+from src.detection.recognizers.diagnosis_codes import DiagnosisCodeTable, build_diagnosis_table
+
+
+def test_builtin_table_rejects_codes_outside_mkn10_blocks():
+    """Vestavěná tabulka odmítne kategorie mimo bloky MKN-10, lab. hodnoty se nehlásí."""
+    text = "Dg. J45.0, E10.5. Vitamin B12 a K10 v normě, přístroj X11 typ D54."
+
+    results = CzechMedicalDiagnosisCodeRecognizer(supported_language="en").analyze(
+        text, ["CZECH_DIAGNOSIS_CODE"], None
+    )
+
+    assert [text[r.start:r.end] for r in results] == ["J45.0", "E10.5", "K10", "X11"]
+    assert not DiagnosisCodeTable.from_category_ranges().contains("B12")
+
+
+def test_compiled_table_checks_subcodes(tmp_path):
+    """Tabulka z číselníku ověřuje i podkódy a po pickle se znovu namapuje."""
+    csv_path = tmp_path / "mkn10.csv"
+    csv_path.write_text("KOD;NAZEV\nJ450;Astma\nS7200;Zlomenina\nA09;Průjem\n", encoding="utf-8")
+    table_path = tmp_path / "mkn10.bin"
+    build_diagnosis_table(read_names(str(csv_path), ["KOD"]), str(table_path))
+
+    table = pickle.loads(pickle.dumps(DiagnosisCodeTable.load(str(table_path))))
+
+    assert [table.contains(code) for code in ["J45", "J45.0", "J45.1", "S72", "S72.0", "S72.00", "A09", "A09.0"]] == [
+        True, True, False, True, True, True, True, False
+    ]
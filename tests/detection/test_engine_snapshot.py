@@ -0,0 +1,55 @@
+import spacy
+from presidio_analyzer import RecognizerRegistry
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+from src.detection.engine_snapshot import EngineSnapshot
+from src.detection.recognizers.czech_registry import CzechRecognizerRegistry
+
+
+def _make_engine():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    engine = SpacyNlpEngine()
+    engine.nlp = {"en": nlp}
+    return engine
+
+
+def test_snapshot_roundtrip(tmp_path):
+    """Uložený snapshot se načte se spaCy modelem i funkčními českými rozpoznávači."""
+    snapshot = EngineSnapshot(str(tmp_path))
+    models = [{"lang_code": "en", "model_name": "en_core_web_sm"}]
+    fingerprint = snapshot.get_fingerprint(models, ["en"])
+    assert snapshot.load(fingerprint) is None
+
+    registry = RecognizerRegistry(supported_languages=["en"])
+    CzechRecognizerRegistry.register_czech_recognizers(registry, supported_language="en")
+    snapshot_dir = snapshot.save(fingerprint, _make_engine(), registry)
+    assert snapshot.save(fingerprint, _make_engine(), registry) == snapshot_dir
+
+    loaded_models, loaded_registry = snapshot.load(fingerprint)
+    assert spacy.load(loaded_models[0]["model_name"]).pipe_names == ["sentencizer"]
+
+    text = "Pacient, r.č. 800615/1230"
+    results = [
+        result
+        for recognizer in loaded_registry.recognizers
+        for result in recognizer.analyze(text, ["CZECH_BIRTH_NUMBER"], None)
+    ]
+    assert [(r.entity_type, r.start, r.end) for r in results] == [("CZECH_BIRTH_NUMBER", 14, 25)]
+
+    # Jiná konfigurace modelů snapshot nepoužije
+    assert snapshot.load(snapshot.get_fingerprint([{"lang_code": "en", "model_name": "en_core_web_lg"}], ["en"])) is None
+
+
+def test_model_version_changes_fingerprint(tmp_path):
+    """Nová verze modelu se stejným názvem vytvoří jiný otisk."""
+    snapshot = EngineSnapshot(str(tmp_path / "cache"))
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    models = [{"lang_code": "en", "model_name": str(model_dir)}]
+
+    (model_dir / "meta.json").write_text('{"version": "3.7.0"}', encoding="utf-8")
+    old_fingerprint = snapshot.get_fingerprint(models, ["en"])
+    (model_dir / "meta.json").write_text('{"version": "3.7.1"}', encoding="utf-8")
+
+    assert snapshot.get_fingerprint(models, ["en"]) != old_fingerprint
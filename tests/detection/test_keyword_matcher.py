@@ -0,0 +1,39 @@
+import spacy
+from presidio_analyzer.nlp_engine import NlpArtifacts
+
+from src.detection.recognizers.czech_medical_facility_recognizer import CzechMedicalFacilityRecognizer
+from src.detection.recognizers.keyword_matcher import KeywordMatcher
+
+
+def test_longest_keyword_wins_and_all_mentions_are_found():
+    """Delší klíčové slovo má přednost, nalezeny jsou všechny výskyty."""
+    matcher = KeywordMatcher(["nemocnice", "Fakultní nemocnice", "klinika"])
+    text = "Převezen z Fakultní nemocnice na kliniku, pak Klinika ARO a nemocnice Kladno."
+
+    hits = matcher.find_all(text)
+
+    assert [(text[h.start:h.end], h.keyword) for h in hits] == [
+        ("Fakultní nemocnice", "Fakultní nemocnice"),
+        ("Klinika", "klinika"),
+        ("nemocnice", "nemocnice"),
+    ]
+    assert [h.start for h in matcher.find_all("İİ " + text)] == [h.start + 3 for h in hits]
+
+
+def test_facility_recognizer_reports_every_mention_in_sentence():
+    """Všechna zařízení ve větě jsou nalezena a rozsahy nepřesahují větu."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    text = "  Pacient přeložen z Nemocnice Na Bulovce do Fakultní nemocnice v Motole. Kontrola za týden."
+    doc = nlp(text)
+    nlp_artifacts = NlpArtifacts(
+        entities=[doc[1:2]], tokens=doc, tokens_indices=[], lemmas=[], nlp_engine=None, language="en"
+    )
+
+    results = CzechMedicalFacilityRecognizer().analyze(text, ["CZECH_MEDICAL_FACILITY"], nlp_artifacts)
+
+    assert [r.recognition_metadata["keyword"] for r in results] == ["nemocnice", "fakultní nemocnice"]
+    first_sentence_end = text.index("Motole.") + len("Motole.")
+    for result in results:
+        assert 2 <= result.start and result.end <= first_sentence_end
+    assert text[results[0].start:].startswith("Pacient")
@@ -0,0 +1,81 @@
+import pickle
+
+from presidio_analyzer import RecognizerResult
+
+from src.detection.build_name_index import read_names
+from src.detection.overlap_resolver import ANCHOR_KEY, EXACT_MATCH_KEY, OverlapResolver
+from src.detection.recognizers.czech_facility_gazetteer_recognizer import CzechFacilityGazetteerRecognizer
+from src.detection.recognizers.name_index import NameIndex, build_name_index
+
+
+def _build_gazetteer(tmp_path):
+    csv_path = tmp_path / "nrpzs.csv"
+    csv_path.write_text(
+        "ZdravotnickeZarizeniId;NazevCely\n"
+        "1;Fakultní nemocnice v Motole\n"
+        "2;Nemocnice Na Bulovce\n"
+        "3;Fakultní nemocnice\n"
+        "4;Thomayerova nemocnice\n",
+        encoding="utf-8",
+    )
+    index_path = tmp_path / "facilities.idx"
+    build_name_index(read_names(str(csv_path), ["NazevCely"]), str(index_path), filter_bits_log2=10)
+    return NameIndex(str(index_path))
+
+
+def test_gazetteer_finds_longest_exact_names(tmp_path):
+    """Nalezeny jsou přesné rozsahy názvů, delší název má přednost."""
+    index = _build_gazetteer(tmp_path)
+    text = "Přeložen z NEMOCNICE  na Bulovce do Fakultní nemocnice v Motole, pak Thomayerova nemocnice."
+
+    matches = index.find_all(text)
+
+    assert [text[m.start:m.end] for m in matches] == [
+        "NEMOCNICE  na Bulovce",
+        "Fakultní nemocnice v Motole",
+        "Thomayerova nemocnice",
+    ]
+    assert index.find_all("Fakultní nemocnice Brno")[0].name == "Fakultní nemocnice"
+    assert index.find_all("Nemocnice Na Bulovkách") == []
+
+    # Po pickle (snapshot enginu) se soubor namapuje znovu
+    restored = pickle.loads(pickle.dumps(index))
+    assert restored.find_all(text) == matches
+
+
+def test_gazetteer_span_supersedes_keyword_window(tmp_path):
+    """Přesný rozsah z gazetteeru nahradí okno kolem klíčového slova."""
+    recognizer = CzechFacilityGazetteerRecognizer(_build_gazetteer(tmp_path), supported_language="en")
+    text = "Pacient převezen do Thomayerova nemocnice k další léčbě."
+    keyword_start = text.index("nemocnice")
+    window = RecognizerResult(
+        "CZECH_MEDICAL_FACILITY", 0, len(text) - 1, 0.65,
+        recognition_metadata={ANCHOR_KEY: (keyword_start, keyword_start + len("nemocnice"))},
+    )
+
+    exact = recognizer.analyze(text, ["CZECH_MEDICAL_FACILITY"])
+    resolved = OverlapResolver().resolve([window] + exact, text)
+
+    assert [text[r.start:r.end] for r in resolved] == ["Thomayerova nemocnice"]
+    assert resolved[0].recognition_metadata[EXACT_MATCH_KEY]
+
+
+def test_window_with_keyword_outside_gazetteer_span_is_kept(tmp_path):
+    """Okno kolem jiného zařízení se nezahodí, přesný rozsah z něj jen vykrojí svou část."""
+    recognizer = CzechFacilityGazetteerRecognizer(_build_gazetteer(tmp_path), supported_language="en")
+    text = "Převezen z Fakultní nemocnice v Motole do Nemocnice Slaný k další léčbě."
+    windows = []
+    for keyword in ("Fakultní nemocnice", "Nemocnice Slaný"):
+        keyword_start = text.index(keyword)
+        windows.append(RecognizerResult(
+            "CZECH_MEDICAL_FACILITY", max(0, keyword_start - 30), min(len(text), keyword_start + 59), 0.65,
+            recognition_metadata={ANCHOR_KEY: (keyword_start, keyword_start + len("nemocnice"))},
+        ))
+
+    exact = recognizer.analyze(text, ["CZECH_MEDICAL_FACILITY"])
+    resolved = OverlapResolver().resolve(windows + exact, text)
+
+    assert [text[r.start:r.end] for r in resolved] == [
+        "Fakultní nemocnice v Motole",
+        "do Nemocnice Slaný k další léčbě",
+    ]
@@ -0,0 +1,40 @@
+import pytest
+import spacy
+from presidio_analyzer.nlp_engine import SpacyNlpEngine
+
+from src.detection.nlp_profiles import NlpProfiles
+
+
+def _make_engine(components):
+    nlp = spacy.blank("en")
+    for name in components:
+        nlp.add_pipe(name)
+    engine = SpacyNlpEngine()
+    engine.nlp = {"en": nlp}
+    return engine
+
+
+def test_profiles_disable_unused_components():
+    """Profily vypínají komponenty mimo profil, plný profil nespouští doplněný sentencizer."""
+    engine = _make_engine(["tok2vec", "tagger", "parser", "lemmatizer", "ner"])
+    profiles = NlpProfiles(engine, ["full", "ner", "tokens", "blank"], "full")
+
+    disabled = profiles._disabled["en"]
+    assert disabled["full"] == ["sentencizer"]
+    assert disabled["ner"] == ["tok2vec", "tagger", "parser", "lemmatizer"]
+    assert "ner" in disabled["tokens"] and "sentencizer" not in disabled["tokens"]
+    assert "sentencizer" in disabled["blank"]
+
+    nlp_artifacts = profiles.process_text("Pacient byl přijat. Kontrola za týden.", "en", "tokens")
+    assert [sent.text for sent in nlp_artifacts.tokens.sents] == ["Pacient byl přijat.", "Kontrola za týden."]
+
+
+def test_unused_components_are_removed_for_deployment():
+    """Komponenty, které žádný povolený profil nepotřebuje, se z pipeline odstraní."""
+    engine = _make_engine(["tok2vec", "tagger", "ner"])
+    profiles = NlpProfiles(engine, ["tokens", "blank"], "tokens")
+
+    assert engine.nlp["en"].pipe_names == ["sentencizer"]
+    assert profiles.resolve(None) == "tokens"
+    with pytest.raises(ValueError):
+        profiles.resolve("full")
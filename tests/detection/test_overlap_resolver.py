@@ -0,0 +1,76 @@
+import random
+import time
+
+from presidio_analyzer import RecognizerResult
+
+from src.detection.overlap_resolver import OverlapResolver
+
+
+def _spans(results):
+    return [(r.entity_type, r.start, r.end) for r in results]
+
+
+def test_birth_number_preferred_over_insurance_number():
+    """Stejná číslice jako rodné číslo i číslo pojištěnce zůstane jen jako rodné číslo."""
+    text = "r.č. 800615/1230"
+    results = [
+        RecognizerResult("CZECH_HEALTH_INSURANCE_NUMBER", 5, 16, 0.95),
+        RecognizerResult("CZECH_BIRTH_NUMBER", 5, 16, 1.0),
+    ]
+
+    assert _spans(OverlapResolver().resolve(results, text)) == [("CZECH_BIRTH_NUMBER", 5, 16)]
+
+
+def test_same_type_windows_are_merged_and_lower_priority_is_trimmed():
+    """Překrývající se okna adres se sloučí, přesnější entita z nich vykrojí svůj rozsah."""
+    text = "Jan Novák, Dlouhá 12, 110 00 Praha 1, tel. 777 888 999"
+    results = [
+        RecognizerResult("CZECH_ADDRESS", 0, 30, 0.7),
+        RecognizerResult("CZECH_ADDRESS", 11, 36, 0.9),
+        RecognizerResult("PERSON", 0, 9, 0.85),
+    ]
+
+    resolved = OverlapResolver().resolve(results, text)
+
+    assert _spans(resolved) == [("PERSON", 0, 9), ("CZECH_ADDRESS", 11, 36)]
+    assert resolved[1].score == 0.9
+
+
+def test_resolution_keeps_covered_text():
+    """Výsledky se nepřekrývají a pokrývají stejné znaky jako vstup."""
+    random.seed(5)
+    types = ["CZECH_ADDRESS", "PERSON", "CZECH_BIRTH_NUMBER", "DATE_TIME"]
+    resolver = OverlapResolver()
+
+    for _ in range(200):
+        results = []
+        for _ in range(random.randint(2, 12)):
+            start = random.randrange(200)
+            results.append(
+                RecognizerResult(random.choice(types), start, start + random.randint(1, 40), random.random())
+            )
+
+        resolved = resolver.resolve(results)
+
+        covered = {i for r in results for i in range(r.start, r.end)}
+        assert {i for r in resolved for i in range(r.start, r.end)} == covered
+        for previous, current in zip(resolved, resolved[1:]):
+            assert previous.end <= current.start
+
+
+def test_resolution_scales_subquadratically():
+    """Osmkrát víc výsledků nesmí trvat řádově víc než osmkrát déle."""
+
+    def best_time(count):
+        # Vyšší skóre dostanou výsledky dál v textu, každý nový úsek tak leží před všemi přidělenými
+        results = [RecognizerResult("PERSON", 3 * i, 3 * i + 2, 0.5 + i / (4 * count)) for i in range(count)]
+        resolver = OverlapResolver()
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            resolved = resolver.resolve(results)
+            timings.append(time.perf_counter() - started)
+        assert len(resolved) == count
+        return min(timings)
+
+    assert best_time(80000) / best_time(10000) < 16
@@ -0,0 +1,42 @@
+from presidio_analyzer import RecognizerResult
+
+from src.detection.paragraph_cache import ParagraphCache, split_into_paragraphs
+
+
+def test_split_into_paragraphs():
+    """Odstavce oddělují prázdné řádky, bílé znaky mezi nimi se vynechají."""
+    text = "Fakultní nemocnice Motol\nV Úvalu 84\n\n  \nPacient Jan Novák\n\n"
+
+    paragraphs = split_into_paragraphs(text)
+
+    assert [text[p.start:p.end] for p in paragraphs] == ["Fakultní nemocnice Motol\nV Úvalu 84", "Pacient Jan Novák"]
+
+
+def test_hit_is_rebased_to_new_offset():
+    """Uložené výsledky se při zásahu posunou na pozici odstavce v novém dokumentu."""
+    cache = ParagraphCache()
+    key = cache.make_key("Pacient Jan Novák", "en", None, "full")
+    results = [RecognizerResult("PERSON", 108, 117, 0.85)]
+
+    assert cache.get(key, 100) is None
+    cache.put(key, results, 100)
+    results[0].start = 0
+
+    rebased = cache.get(key, 7)
+    assert [(r.entity_type, r.start, r.end) for r in rebased] == [("PERSON", 15, 24)]
+    assert cache.make_key("Pacient Jan Novák", "en", ["PERSON"], "full") != key
+    assert cache.get_stats()["hit_rate"] == 0.5
+
+
+def test_memory_cap_evicts_least_recently_used():
+    """Po překročení limitu se vyřadí nejdéle nepoužitý odstavec."""
+    cache = ParagraphCache(max_bytes=1500)
+    keys = [cache.make_key(f"odstavec {i}", "en", None, "full") for i in range(3)]
+    for key in keys[:2]:
+        cache.put(key, [RecognizerResult("PERSON", 0, 5, 0.85)], 0)
+    cache.get(keys[0], 0)
+    cache.put(keys[2], [RecognizerResult("PERSON", 0, 5, 0.85)], 0)
+
+    assert cache.get(keys[1], 0) is None
+    assert cache.get(keys[0], 0) is not None
+    assert cache.get_stats()["evictions"] == 1
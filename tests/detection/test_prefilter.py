@@ -0,0 +1,25 @@
+from src.detection.prefilter import DocumentPrefilter
+from src.detection.recognizers.czech_medical_facility_recognizer import CzechMedicalFacilityRecognizer
+
+
+def test_features_of_free_text_and_identifiers():
+    """Volný text anamnézy nemá číselné rysy, identifikátory je mají."""
+    prefilter = DocumentPrefilter()
+    prefilter.register_keywords("facility_keyword", ["nemocnice", "FN "])
+
+    assert prefilter.compute_features("Pacient udává bolesti hlavy trvající několik dní.") == frozenset()
+    assert prefilter.compute_features("Dg. J45.0, r.č. 800615/1230, přijat do FN Motol") == {
+        "upper_digit", "digit_run", "digit", "facility_keyword"
+    }
+    assert prefilter.compute_features("kontakt: novak@email.cz, tel. 777") == {"at_sign", "digit"}
+
+
+def test_required_features_of_recognizers():
+    """Rozpoznávače deklarují rysy, neznámé rysy předfiltr vypnou."""
+    prefilter = DocumentPrefilter()
+    facility_recognizer = CzechMedicalFacilityRecognizer()
+
+    assert prefilter.get_required_features(facility_recognizer) is None
+
+    prefilter.register_keywords("facility_keyword", facility_recognizer.feature_keywords["facility_keyword"])
+    assert prefilter.get_required_features(facility_recognizer) == {"facility_keyword"}
@@ -0,0 +1,61 @@
+import time
+
+from src.common.models import Document, AnonymizedDocument
+from src.detection.result_cache import ResultCache
+
+
+def test_cache_hit_rebinds_document_identity():
+    """Zásah v cache vrací výsledek s ID a metadaty aktuálního dokumentu."""
+    cache = ResultCache(engine_version="test")
+    first = Document(id="a", content="Rodné číslo 800615/1234", metadata={"source": "a"})
+    retry = Document(id="b", content="Rodné číslo 800615/1234", metadata={"source": "b"})
+
+    key = cache.make_key(first)
+    assert cache.get(key, first) is None
+    cache.put(key, AnonymizedDocument(original_document_id="a", content="Rodné číslo [RČ]", metadata={"source": "a"}))
+
+    # Stejný obsah dává stejný klíč, režim odpovědi klíč nemění
+    retry_key = cache.make_key(retry, options={"response_mode": "text"})
+    assert retry_key == key
+
+    result = cache.get(retry_key, retry)
+    assert result.content == "Rodné číslo [RČ]"
+    assert result.original_document_id == "b"
+    assert result.metadata == {"source": "b"}
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_cache_key_depends_on_configuration_and_engine():
+    """Klíč zahrnuje konfiguraci i verzi enginu."""
+    document = Document(content="Text")
+    cache = ResultCache(engine_version="v1")
+    assert cache.make_key(document) != cache.make_key(document, configuration_id="strict")
+    assert cache.make_key(document) != ResultCache(engine_version="v2").make_key(document)
+
+
+def test_cache_key_ignores_entity_order():
+    """Stejná sada entit v jiném pořadí vede na stejný záznam."""
+    document = Document(content="Text")
+    cache = ResultCache(engine_version="v1")
+    assert cache.make_key(document, options={"entities": ["PERSON", "CZECH_ICO"]}) == cache.make_key(
+        document, options={"entities": ["CZECH_ICO", "PERSON"]}
+    )
+
+
+def test_cache_is_byte_bounded_and_expires():
+    """Cache vyřazuje nejstarší záznamy nad limit velikosti a záznamy po TTL."""
+    cache = ResultCache(max_bytes=2000, ttl_seconds=0.05)
+    for i in range(10):
+        document = Document(content=f"Text {i}")
+        cache.put(cache.make_key(document), AnonymizedDocument(content="x" * 300))
+
+    stats = cache.get_stats()
+    assert stats["bytes"] <= 2000
+    assert stats["evictions"] > 0
+
+    document = Document(content="Text 9")
+    assert cache.get(cache.make_key(document), document) is not None
+    time.sleep(0.1)
+    assert cache.get(cache.make_key(document), document) is None
+
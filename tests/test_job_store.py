@@ -0,0 +1,44 @@
+from src.batch.job_store import JobStore
+from src.common.models import Document, AnonymizedDocument, ProcessingStatus
+
+
+def test_inline_job_lifecycle(tmp_path):
+    """Úloha s dokumenty z požadavku - založení, průběh a stránkování výsledků."""
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    documents = [Document(id=f"doc-{i}", content=f"Text {i}") for i in range(3)]
+
+    job_id = store.create_job(documents=documents)
+    job = store.get_job(job_id)
+    assert job["status"] == ProcessingStatus.PENDING.value
+    assert job["source"] == "inline"
+    assert job["total"] == 3
+
+    store.add_result(job_id, 0, "doc-0", AnonymizedDocument(content="[A]"))
+    store.add_result(job_id, 1, "doc-1", error="failure")
+
+    # Zbývá pouze dokument bez výsledku
+    pending = store.get_pending_documents(job_id)
+    assert [(seq, document.id) for seq, document in pending] == [(2, "doc-2")]
+
+    job = store.get_job(job_id)
+    assert job["processed"] == 2
+    assert job["failed"] == 1
+
+    page = store.get_results(job_id, offset=1, limit=10)
+    assert len(page) == 1
+    assert page[0]["document_id"] == "doc-1"
+    assert page[0]["success"] is False
+    assert page[0]["document"] is None
+
+
+def test_unfinished_jobs_survive_restart(tmp_path):
+    """Nedokončené úlohy jsou po novém otevření úložiště k dispozici."""
+    db_path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(db_path)
+    running = store.create_job(documents=[Document(content="Text")])
+    finished = store.create_job(documents=[Document(content="Text")])
+    store.update_job(running, status=ProcessingStatus.PROCESSING)
+    store.update_job(finished, status=ProcessingStatus.COMPLETED)
+
+    reopened = JobStore(db_path)
+    assert reopened.get_unfinished_jobs() == [running]
@@ -0,0 +1,36 @@
+from src.batch.parallel_batch_processor import ParallelBatchProcessor
+from src.common.models import AnonymizedDocument
+
+
+class _WorkerService:
+    """Služba, jejíž cache odstavců žije v pracovním procesu - hlásí ji jen statistika dokumentu."""
+
+    def process_document(self, document, entities=None):
+        hits = 2 if "opakovaná hlavička" in document.content else 0
+        return AnonymizedDocument(
+            content=document.content,
+            original_document_id=document.id,
+            statistics={"entities_by_type": {}, "paragraph_cache": {"hits": hits, "misses": 1}},
+        )
+
+
+def test_paragraph_cache_stats_are_summed_from_documents(tmp_path):
+    """Souhrnná úspěšnost cache odstavců se sčítá ze statistik jednotlivých dokumentů."""
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "a.txt").write_text("opakovaná hlavička\n\nnález A", encoding="utf-8")
+    (input_dir / "b.txt").write_text("opakovaná hlavička\n\nnález B", encoding="utf-8")
+    (input_dir / "c.txt").write_text("jiný text", encoding="utf-8")
+
+    processor = ParallelBatchProcessor(
+        _WorkerService(),
+        str(input_dir),
+        str(tmp_path / "output"),
+        str(tmp_path / "error"),
+        str(tmp_path / "audit"),
+        max_workers=2,
+    )
+    stats = processor.process_batch()
+
+    assert stats["successful_files"] == 3
+    assert stats["paragraph_cache"] == {"hits": 4, "misses": 3, "hit_rate": 4 / 7}